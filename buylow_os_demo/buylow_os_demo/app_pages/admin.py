@@ -3,7 +3,8 @@ import pandas as pd
 from datetime import datetime
 
 # 안전한 데이터 접근을 위한 유틸리티
-from utils.data_utils import load_json, save_json, get_next_id
+from utils.data_utils import load_json, save_json, get_next_id, load_log_window, thaw
+from utils.ticket_clusters import group_tickets
 
 
 def render():
@@ -59,12 +60,12 @@ def render():
     </div>
     """, unsafe_allow_html=True)
 
-    logs = load_json("logs.json", default=[])
-    tickets = load_json("tickets.json", default=[])
-    announcements = load_json("announcements.json", default=[])
+    logs = load_json("logs.json", default=[], readonly=True)
+    tickets = load_json("tickets.json", default=[], readonly=True)
+    announcements = load_json("announcements.json", default=[], readonly=True)
 
     today = datetime.now().strftime("%Y-%m-%d")
-    today_logs = [l for l in logs if l.get('timestamp', '').startswith(today)]
+    today_logs = load_log_window("logs.json", today, today)
     open_tickets = [t for t in tickets if t.get('status') == 'open']
     cs_logs = [l for l in logs if l.get('type') == 'cs_query']
     homework_logs = [l for l in logs if l.get('type') == 'homework_submission']
@@ -129,6 +130,7 @@ def render():
             if st.button("💾 공지로 저장", use_container_width=True, key="admin_save"):
                 if title:
                     new_id = get_next_id("announcements.json")
+                    announcements = thaw(announcements)
                     announcements.append({"id": new_id, "title": title, "tag": tag, "content": template, "pinned": pinned, "created_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S"), "related_faq": [], "next_actions": []})
                     save_json("announcements.json", announcements)
                     st.success(f"✅ 공지 #{new_id} 저장 완료!")
@@ -147,24 +149,36 @@ def render():
             filtered_tickets = tickets
         
         if filtered_tickets:
-            for ticket in filtered_tickets[:15]:
-                status_class = "status-open" if ticket.get('status') == 'open' else "status-closed"
-                status_text = "미처리" if ticket.get('status') == 'open' else "완료"
+            # 비슷한 질문의 티켓은 한 클러스터로 묶어 한 번에 처리
+            for cluster in group_tickets(filtered_tickets)[:15]:
+                first = cluster.tickets[0]
+                count = len(cluster.tickets)
+                status_class = "status-open" if cluster.open_count else "status-closed"
+                status_text = f"미처리 {cluster.open_count}" if cluster.open_count else "완료"
+                more = f" 외 {count - 1}건" if count > 1 else ""
                 st.markdown(f"""
                 <div class="ticket-card">
                     <div class="ticket-header">
-                        <span class="ticket-id">#{ticket.get('id', 0):04d}</span>
+                        <span class="ticket-id">#{first.get('id', 0):04d}{more}</span>
                         <span class="ticket-status {status_class}">{status_text}</span>
                     </div>
-                    <p class="ticket-query">{ticket.get('query', '내용 없음')[:60]}...</p>
-                    <p class="ticket-meta">{ticket.get('timestamp', '')}</p>
+                    <p class="ticket-query">{cluster.query[:60]}...</p>
+                    <p class="ticket-meta">{cluster.latest}</p>
                 </div>
                 """, unsafe_allow_html=True)
-                
-                if ticket.get('status') == 'open':
-                    if st.button("✓ 처리 완료", key=f"close_{ticket.get('id')}"):
+
+                if count > 1:
+                    with st.expander(f"티켓 {count}건 보기"):
+                        for t in cluster.tickets:
+                            st.markdown(f"`#{t.get('id', 0):04d}` {t.get('timestamp', '')} · {t.get('query', '')}")
+
+                if cluster.open_count:
+                    label = "✓ 처리 완료" if count == 1 else f"✓ {cluster.open_count}건 모두 처리 완료"
+                    if st.button(label, key=f"close_{first.get('id')}"):
+                        cluster_ids = {t.get('id') for t in cluster.tickets}
+                        tickets = thaw(tickets)
                         for t in tickets:
-                            if t.get('id') == ticket.get('id'):
+                            if t.get('id') in cluster_ids and t.get('status') == 'open':
                                 t['status'] = 'closed'
                                 t['closed_at'] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
                         save_json("tickets.json", tickets)
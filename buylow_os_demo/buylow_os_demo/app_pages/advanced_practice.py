@@ -1,7 +1,7 @@
 import streamlit as st
 
 # 안전한 데이터 접근을 위한 유틸리티
-from utils.data_utils import load_json
+from utils.data_utils import load_member
 
 
 def render():
@@ -61,8 +61,8 @@ def render():
     </style>
     """, unsafe_allow_html=True)
 
-    def load_unlocks():
-        return load_json("unlocks.json", default={})
+    def load_unlocks(nickname):
+        return load_member("unlocks.json", nickname, default={}, readonly=True)
 
     ADVANCED_PROBLEMS = {
         "divergence_advanced": {
@@ -171,12 +171,7 @@ def render():
 
     if nickname:
         st.session_state.nickname = nickname
-        unlocks = load_unlocks()
-        
-        if nickname not in unlocks:
-            unlocks[nickname] = {key: False for key in ADVANCED_PROBLEMS.keys()}
-        
-        user_unlocks = unlocks.get(nickname, {})
+        user_unlocks = load_unlocks(nickname)
         
         st.markdown("""<div class="disclaimer">⚠️ 본 심화 문제는 교육 및 학습 목적입니다. 매매 추천, 가격 예측, 종목 추천이 아니며 투자 권유가 아닙니다.</div>""", unsafe_allow_html=True)
         
@@ -51,7 +51,7 @@ def render():
     """, unsafe_allow_html=True)
 
     def load_announcements():
-        return load_json("announcements.json", default=[])
+        return load_json("announcements.json", default=[], readonly=True)
 
     # 텔레그램 링크
     st.markdown("""
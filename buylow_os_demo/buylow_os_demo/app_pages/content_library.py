@@ -58,7 +58,7 @@ def render():
     """, unsafe_allow_html=True)
 
     def load_contents():
-        return load_json("content_versions.json", default=[])
+        return load_json("content_versions.json", default=[], readonly=True)
 
     # 헤더
     st.markdown("""
@@ -1,9 +1,17 @@
 import streamlit as st
-import re
 from datetime import datetime
+from html import escape
 
 # 안전한 데이터 접근을 위한 유틸리티
-from utils.data_utils import load_json, save_json, append_to_json_list, get_next_id
+from utils.data_utils import save_json, append_to_json_list, get_next_id, log_event, get_event_counts
+from utils.event_counters import count, outcome_key
+from utils.autocomplete import suggest
+from utils.kb_index import CLOSE_GAP, get_kb_index, normalize_text, search_kb
+from utils.ticket_clusters import assign_cluster
+from utils.trending import trending_terms
+
+# 질문 기록이 적을 때 인기 검색어를 채울 키워드
+DEFAULT_TAGS = ["RSI", "손절", "레버리지", "다이버전스", "지지저항", "멤버십", "리스크"]
 
 
 def render():
@@ -235,12 +243,8 @@ def render():
     </style>
     """, unsafe_allow_html=True)
 
-    @st.cache_data
-    def load_kb():
-        return load_json("kb.json")
-
     def save_log(query, matched_doc, score):
-        append_to_json_list("logs.json", {
+        log_event("logs.json", {
             "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
             "type": "cs_query",
             "query": query,
@@ -256,34 +260,46 @@ def render():
             "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
             "query": query,
             "reason": reason,
-            "status": "open"
+            "status": "open",
+            "cluster_id": assign_cluster(ticket_id, query)
         })
         return ticket_id if success else None
 
-    def normalize_text(text):
-        text = text.lower().strip()
-        text = re.sub(r'[^\w\s가-힣]', ' ', text)
-        return re.sub(r'\s+', ' ', text)
+    def search_for(text):
+        # 위젯이 만들어지기 전(콜백)에만 검색어를 바꿀 수 있음
+        st.session_state.cs_query = text
+        st.session_state.cs_auto_search = True
 
-    def match_query(query, kb):
-        query_norm = normalize_text(query)
-        query_words = set(query_norm.split())
-        best_match, best_score = None, 0
-        
-        for doc in kb:
-            score = 0
-            for kw in [normalize_text(k) for k in doc['keywords']]:
-                if kw in query_norm: score += 10
-                else: score += len(query_words & set(kw.split())) * 3
-            
-            title_norm = normalize_text(doc['title'])
-            if title_norm in query_norm: score += 15
-            else: score += len(query_words & set(title_norm.split())) * 5
-            
-            if score > best_score:
-                best_score, best_match = score, doc
-        
-        return best_match, best_score
+    def render_runners_up(hits, label):
+        hits = [hit for hit in hits if hit.score > 0 or hit.relevance > 0]
+        if not hits:
+            return
+        st.markdown(f"**{label}**")
+        cols = st.columns(len(hits))
+        for col, hit in zip(cols, hits):
+            with col:
+                st.button(f"🔎 {hit.doc['title']}", key=f"cs_alt_{hit.doc['id']}",
+                          on_click=search_for, args=(hit.doc['title'],), use_container_width=True)
+
+    def render_related(docs):
+        st.markdown("**📚 관련 질문:**")
+        cols = st.columns(len(docs))
+        for col, doc in zip(cols, docs):
+            with col:
+                st.button(f"→ {doc['title']}", key=f"cs_related_{doc['id']}",
+                          on_click=search_for, args=(doc['title'],), use_container_width=True)
+
+    def render_suggestions(query):
+        typed = normalize_text(query).strip()
+        texts = [text for text in suggest(query) if normalize_text(text).strip() != typed]
+        if not texts:
+            return
+        st.markdown("**💡 추천 검색어**")
+        cols = st.columns(len(texts))
+        for i, (col, text) in enumerate(zip(cols, texts)):
+            with col:
+                st.button(text, key=f"cs_suggest_{i}", on_click=search_for, args=(text,),
+                          use_container_width=True)
 
     # 헤더
     st.markdown("""
@@ -301,11 +317,19 @@ def render():
     with col2:
         search_btn = st.button("검색하기", type="primary", use_container_width=True, key="cs_search")
 
-    # 검색 처리
-    if search_btn and query:
-        kb = load_kb()
-        matched_doc, score = match_query(query, kb)
+    # 검색 처리 (다른 결과/추천 검색어 버튼을 누르면 그 문자열로 다시 검색)
+    auto_search = st.session_state.pop("cs_auto_search", False)
+    if query and not (search_btn or auto_search):
+        render_suggestions(query)
+
+    if (search_btn or auto_search) and query:
+        result = search_kb(query)
+        matched_doc, score = result.best
         save_log(query, matched_doc, score)
+
+        if result.corrected:
+            st.button(f"🔤 혹시 '{result.corrected}'을(를) 찾으셨나요?", key="cs_corrected",
+                      on_click=search_for, args=(result.corrected,))
         
         if score >= 10 and matched_doc:
             st.markdown('<div class="status-badge status-success">✓ 관련 정보를 찾았습니다</div>', unsafe_allow_html=True)
@@ -325,10 +349,16 @@ def render():
             with st.expander("📖 상세 내용 보기", expanded=True):
                 st.markdown(f'<div class="detail-text">{matched_doc["detailed_answer"]}</div>', unsafe_allow_html=True)
             
-            if matched_doc.get('next_actions'):
+            related_docs = get_kb_index().related(matched_doc)
+            if related_docs:
+                render_related(related_docs)
+            elif matched_doc.get('next_actions'):
                 st.markdown("**🔗 관련 검색어:**")
                 for action in matched_doc['next_actions']:
                     st.markdown(f"→ {action}")
+
+            if result.gap < CLOSE_GAP:
+                render_runners_up(result.runners_up, "🔀 비슷한 답변도 확인해보세요")
         
         elif score >= 5 and matched_doc:
             st.markdown('<div class="status-badge status-warning">⚠️ 부분 일치하는 정보를 찾았습니다</div>', unsafe_allow_html=True)
@@ -349,6 +379,7 @@ def render():
                 st.markdown(f'<div class="detail-text">{matched_doc["detailed_answer"]}</div>', unsafe_allow_html=True)
             
             st.info("💡 더 구체적인 키워드로 검색해보세요")
+            render_runners_up(result.runners_up, "🔀 혹시 이 내용을 찾으셨나요?")
             
             if st.button("🎫 상담 티켓 생성", key="ticket_low"):
                 if tid := create_ticket(query, "부분 매칭"):
@@ -356,13 +387,13 @@ def render():
         
         else:
             st.markdown('<div class="status-badge status-error">✗ 관련 정보를 찾을 수 없습니다</div>', unsafe_allow_html=True)
+            render_runners_up(result.hits, "🔀 혹시 이 내용을 찾으셨나요?")
             
             st.markdown("**💡 이런 키워드로 검색해보세요:**")
-            col1, col2, col3, col4 = st.columns(4)
-            with col1: st.button("RSI", key="s1")
-            with col2: st.button("손절", key="s2")
-            with col3: st.button("레버리지", key="s3")
-            with col4: st.button("다이버전스", key="s4")
+            cols = st.columns(4)
+            for i, (col, term) in enumerate(zip(cols, trending_terms(4, DEFAULT_TAGS))):
+                with col:
+                    st.button(term, key=f"s{i + 1}", on_click=search_for, args=(term,))
             
             if st.button("🎫 상담 티켓 생성하기", type="primary", key="ticket_none"):
                 if tid := create_ticket(query, "매칭 실패"):
@@ -374,31 +405,20 @@ def render():
     # 빠른 태그
     st.markdown("---")
     st.markdown("**인기 검색어**")
-    st.markdown("""
-    <div class="tag-container">
-        <span class="tag">RSI</span>
-        <span class="tag">손절</span>
-        <span class="tag">레버리지</span>
-        <span class="tag">다이버전스</span>
-        <span class="tag">지지저항</span>
-        <span class="tag">멤버십</span>
-        <span class="tag">리스크</span>
-    </div>
-    """, unsafe_allow_html=True)
+    tags = "".join(f'<span class="tag">{escape(term)}</span>' for term in trending_terms(7, DEFAULT_TAGS))
+    st.markdown(f'<div class="tag-container">{tags}</div>', unsafe_allow_html=True)
 
     # 통계
     st.markdown("---")
     try:
-        logs = load_json("logs.json", default=[])
-        cs_logs = [l for l in logs if l.get('type') == 'cs_query']
+        counts = get_event_counts("logs.json")
         today = datetime.now().strftime("%Y-%m-%d")
-        today_logs = [l for l in cs_logs if l.get('timestamp', '').startswith(today)]
         
         st.markdown(f"""
         <div class="stats-row">
-            <div class="stat-item"><div class="stat-value">{len(cs_logs)}</div><div class="stat-label">전체 질문</div></div>
-            <div class="stat-item"><div class="stat-value">{len(today_logs)}</div><div class="stat-label">오늘 질문</div></div>
-            <div class="stat-item"><div class="stat-value">{len([l for l in today_logs if l.get('score', 0) >= 10])}</div><div class="stat-label">해결됨</div></div>
+            <div class="stat-item"><div class="stat-value">{count(counts, "cs_query")}</div><div class="stat-label">전체 질문</div></div>
+            <div class="stat-item"><div class="stat-value">{count(counts, "cs_query", today)}</div><div class="stat-label">오늘 질문</div></div>
+            <div class="stat-item"><div class="stat-value">{count(counts, outcome_key("cs_query", "resolved"), today)}</div><div class="stat-label">해결됨</div></div>
         </div>
         """, unsafe_allow_html=True)
     except: pass
@@ -2,7 +2,7 @@ import streamlit as st
 from datetime import datetime
 
 # 안전한 데이터 접근을 위한 유틸리티
-from utils.data_utils import load_json, save_json
+from utils.data_utils import load_json, save_json, thaw
 
 
 def render():
@@ -55,8 +55,8 @@ def render():
     </div>
     """, unsafe_allow_html=True)
 
-    submissions = load_json("homework_submissions.json", default=[])
-    reviews = load_json("homework_reviews.json", default=[])
+    submissions = load_json("homework_submissions.json", default=[], readonly=True)
+    reviews = load_json("homework_reviews.json", default=[], readonly=True)
 
     # 필터
     col1, col2 = st.columns(2)
@@ -127,9 +127,11 @@ def render():
                         "total_count": 5,
                         "feedback": feedback
                     }
+                    reviews = thaw(reviews)
                     reviews.append(review)
                     save_json("homework_reviews.json", reviews)
                     
+                    submissions = thaw(submissions)
                     for s in submissions:
                         if s.get('id') == sub.get('id'):
                             s['reviewed'] = True
@@ -2,7 +2,8 @@ import streamlit as st
 from datetime import datetime
 
 # 안전한 데이터 접근을 위한 유틸리티
-from utils.data_utils import load_json, save_json, get_next_id
+from utils.data_utils import SUBMISSION_COUNTS_FILE, get_submission_counts, thaw, transaction
+from utils.aho_corasick import compile_keywords
 
 
 def render():
@@ -70,27 +71,37 @@ def render():
 
     FORBIDDEN = ["추천", "매수하세요", "매도하세요", "사세요", "파세요", "무조건", "100%", "확실", "수익 보장"]
     REQUIRED = {"risk": ["손절", "리스크", "위험", "관리", "스탑"], "position": ["포지션", "비중", "사이징", "%"], "reason": ["근거", "이유", "분석", "판단", "확인"]}
+    TOPIC_KEYWORDS = {"다이버전스": ["다이버전스", "rsi", "macd", "괴리"], "지지저항": ["지지", "저항", "구간", "레벨"], "SRL": ["srl", "지표", "구간"], "아래꼬리": ["꼬리", "캔들", "망치", "윅"]}
+
+    # 모든 검사 키워드를 오토마톤 하나로 (제출물을 한 번만 읽음, 대소문자 무시)
+    # 금지 표현/필수 표현에는 대소문자가 있는 글자가 없어 결과는 예전과 같음
+    checker = compile_keywords({
+        "forbidden": FORBIDDEN,
+        "risk": REQUIRED["risk"],
+        "reason": REQUIRED["reason"],
+        **{f"topic:{name}": keywords for name, keywords in TOPIC_KEYWORDS.items()},
+    })
 
     def evaluate(content, topic):
         results = []
-        forbidden_found = [kw for kw in FORBIDDEN if kw in content]
+        found = checker.find(content)
+        forbidden_found = found.get("forbidden", [])
         if forbidden_found:
             results.append({"status": "fail", "text": f"금지 표현 발견: {', '.join(forbidden_found[:2])}"})
         else:
             results.append({"status": "pass", "text": "투자 권유 표현 없음"})
         
-        topic_kw = {"다이버전스": ["다이버전스", "rsi", "macd", "괴리"], "지지저항": ["지지", "저항", "구간", "레벨"], "SRL": ["srl", "지표", "구간"], "아래꼬리": ["꼬리", "캔들", "망치", "윅"]}
-        if any(kw in content.lower() for kw in topic_kw.get(topic, [])):
+        if f"topic:{topic}" in found:
             results.append({"status": "pass", "text": f"{topic} 관련 내용 포함"})
         else:
             results.append({"status": "warn", "text": f"{topic} 관련 키워드 부족"})
         
-        if any(kw in content for kw in REQUIRED['risk']):
+        if "risk" in found:
             results.append({"status": "pass", "text": "리스크 관리 언급"})
         else:
             results.append({"status": "warn", "text": "리스크 관리 언급 부족"})
         
-        if any(kw in content for kw in REQUIRED['reason']) and len(content) >= 100:
+        if "reason" in found and len(content) >= 100:
             results.append({"status": "pass", "text": "충분한 근거 제시"})
         else:
             results.append({"status": "warn", "text": "근거 보강 필요"})
@@ -154,36 +165,44 @@ def render():
                     st.error("최소 50자 이상 작성해주세요")
                 else:
                     results = evaluate(content, selected_topic)
-                    submissions = load_json(SUBMISSIONS_FILE, default=[])
-                    new_id = get_next_id(SUBMISSIONS_FILE)
-                    submissions.append({"id": new_id, "nickname": nickname, "topic": selected_topic, "content": content, "submitted_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S"), "reviewed": False, "review_result": None})
-                    save_json(SUBMISSIONS_FILE, submissions)
+                    # 주제별 제출 수 인덱스 (없던 회원은 여기서 한 번 채움)
+                    submission_counts = get_submission_counts(nickname)
+                    # 이번 제출을 포함한 같은 주제 제출 수 (커밋할 때 잠금 안에서 정해짐)
+                    counted = {}
+                    
+                    def count_submission(topic_counts):
+                        topic_counts[selected_topic] = topic_counts.get(selected_topic, 0) + 1
+                        counted['topic_count'] = topic_counts[selected_topic]
                     
-                    profiles = load_json(PROFILES_FILE, default={})
-                    if nickname not in profiles:
-                        profiles[nickname] = {"nickname": nickname, "homework_count": 0, "homework_streak": 0}
-                    profiles[nickname]['homework_count'] = profiles[nickname].get('homework_count', 0) + 1
-                    profiles[nickname]['last_homework_date'] = datetime.now().strftime("%Y-%m-%d")
-                    save_json(PROFILES_FILE, profiles)
+                    def count_homework(profile):
+                        profile['homework_count'] = profile.get('homework_count', 0) + 1
+                        profile['last_homework_date'] = datetime.now().strftime("%Y-%m-%d")
                     
-                    unlocks = load_json(UNLOCKS_FILE, default={})
-                    if nickname not in unlocks:
-                        unlocks[nickname] = {}
-                    topic_submissions = [s for s in submissions if s.get('nickname') == nickname and s.get('topic') == selected_topic]
-                    topic_map = {'다이버전스': ('divergence_lesson', 'divergence_advanced'), '지지저항': ('support_resistance_lesson', 'support_resistance_advanced'), 'SRL': ('srl_lesson', 'srl_advanced'), '아래꼬리': ('tail_candle_lesson', 'tail_candle_advanced')}
-                    if selected_topic in topic_map:
-                        lesson_key, advanced_key = topic_map[selected_topic]
-                        if len(topic_submissions) >= 1:
-                            unlocks[nickname][lesson_key] = True
-                        if len(topic_submissions) >= 2:
-                            unlocks[nickname][advanced_key] = True
-                        save_json(UNLOCKS_FILE, unlocks)
+                    # 제출 기록, 프로필, 언락을 한 번에 커밋 (일부만 저장되는 일이 없도록)
+                    with transaction() as tx:
+                        new_id = tx.next_id(SUBMISSIONS_FILE)
+                        tx.append(SUBMISSIONS_FILE, {"id": new_id, "nickname": nickname, "topic": selected_topic, "content": content, "submitted_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S"), "reviewed": False, "review_result": None})
+                        tx.update_member(SUBMISSION_COUNTS_FILE, nickname, count_submission, default=thaw(submission_counts))
+                        tx.update_member(PROFILES_FILE, nickname, count_homework, default={"nickname": nickname, "homework_count": 0, "homework_streak": 0})
+                        
+                        topic_map = {'다이버전스': ('divergence_lesson', 'divergence_advanced'), '지지저항': ('support_resistance_lesson', 'support_resistance_advanced'), 'SRL': ('srl_lesson', 'srl_advanced'), '아래꼬리': ('tail_candle_lesson', 'tail_candle_advanced')}
+                        if selected_topic in topic_map:
+                            lesson_key, advanced_key = topic_map[selected_topic]
+                            def unlock_lessons(user_unlocks):
+                                if counted['topic_count'] >= 1:
+                                    user_unlocks[lesson_key] = True
+                                if counted['topic_count'] >= 2:
+                                    user_unlocks[advanced_key] = True
+                            tx.update_member(UNLOCKS_FILE, nickname, unlock_lessons, default={})
                     
-                    st.session_state.hw_submitted = True
-                    st.session_state.hw_results = results
-                    st.session_state.hw_topic = selected_topic
-                    st.session_state.topic_count = len(topic_submissions)
-                    st.rerun()
+                    if not tx.committed:
+                        st.error("제출을 저장하지 못했습니다. 잠시 후 다시 시도해주세요")
+                    else:
+                        st.session_state.hw_submitted = True
+                        st.session_state.hw_results = results
+                        st.session_state.hw_topic = selected_topic
+                        st.session_state.topic_count = counted['topic_count']
+                        st.rerun()
 
     else:
         results = st.session_state.hw_results
@@ -2,7 +2,7 @@ import streamlit as st
 from datetime import datetime
 
 # 안전한 데이터 접근을 위한 유틸리티
-from utils.data_utils import load_json, save_json
+from utils.data_utils import load_member, save_member, update_member
 
 
 def render():
@@ -48,11 +48,11 @@ def render():
     </style>
     """, unsafe_allow_html=True)
 
-    def load_profiles():
-        return load_json("member_profiles.json", default={})
+    def load_profile(nickname):
+        return load_member("member_profiles.json", nickname)
 
-    def save_profiles(profiles):
-        save_json("member_profiles.json", profiles)
+    def save_profile(nickname, profile):
+        save_member("member_profiles.json", nickname, profile)
 
     # 헤더
     st.markdown("""
@@ -69,19 +69,18 @@ def render():
 
     if nickname:
         st.session_state.nickname = nickname
-        profiles = load_profiles()
+        profile = load_profile(nickname)
         
-        if nickname not in profiles:
-            profiles[nickname] = {
+        if profile is None:
+            profile = {
                 "nickname": nickname,
                 "created_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
                 "onboarding_completed": False,
                 "onboarding_checklist": {"membership_confirmed": False, "education_order_checked": False, "homework_method_checked": False, "nickname_rule_checked": False, "faq_checked": False, "cs_rule_checked": False},
                 "grade": "브론즈", "points": 0, "homework_count": 0, "homework_streak": 0
             }
-            save_profiles(profiles)
+            save_profile(nickname, profile)
         
-        profile = profiles[nickname]
         checklist = profile.get('onboarding_checklist', {})
         
         total_items = 6
@@ -151,10 +150,13 @@ def render():
             checklist['nickname_rule_checked'] = c4
             checklist['faq_checked'] = c5
             checklist['cs_rule_checked'] = c6
-            profile['onboarding_checklist'] = checklist
-            profile['onboarding_completed'] = all(checklist.values())
-            profiles[nickname] = profile
-            save_profiles(profiles)
+            
+            def apply_checklist(current):
+                # 다른 페이지에서 바뀐 항목(과제 수 등)은 유지하고 체크리스트만 반영
+                current['onboarding_checklist'] = checklist
+                current['onboarding_completed'] = all(checklist.values())
+            
+            update_member("member_profiles.json", nickname, apply_checklist, default=profile)
             st.success("✅ 저장되었습니다!")
             st.rerun()
         
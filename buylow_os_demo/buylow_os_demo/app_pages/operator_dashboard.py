@@ -1,9 +1,13 @@
 import streamlit as st
 from datetime import datetime, timedelta
 from collections import Counter
+from collections.abc import Mapping
 
 # 안전한 데이터 접근을 위한 유틸리티
-from utils.data_utils import load_json
+from utils.data_utils import load_json, load_log_window
+from utils.aho_corasick import compile_keywords
+from utils.ticket_clusters import group_tickets
+from utils.trending import trending_terms
 
 
 def render():
@@ -55,22 +59,20 @@ def render():
     """, unsafe_allow_html=True)
 
     def count_keywords(texts, keywords):
+        # 키워드마다 글을 다시 읽지 않도록 오토마톤 하나로 한 번에 찾음 (대소문자 무시)
+        matcher = compile_keywords({kw: [kw] for kw in keywords})
         counts = Counter()
         for text in texts:
-            text_lower = text.lower()
-            for kw in keywords:
-                if kw in text_lower:
-                    counts[kw] += 1
+            counts.update(matcher.find(text).keys())
         return counts
 
     KEYWORDS = ["다이버전스", "지지", "저항", "srl", "아래꼬리", "손절", "레버리지", "익절", "비중", "포지션", "rsi", "캔들"]
 
-    logs = load_json("logs.json", default=[])
-    tickets = load_json("tickets.json", default=[])
-    submissions = load_json("homework_submissions.json", default=[])
-    reviews = load_json("homework_reviews.json", default=[])
-    risk_history = load_json("risk_history.json", default={})
-    profiles = load_json("member_profiles.json", default={})
+    tickets = load_json("tickets.json", default=[], readonly=True)
+    submissions = load_json("homework_submissions.json", default=[], readonly=True)
+    reviews = load_json("homework_reviews.json", default=[], readonly=True)
+    risk_history = load_json("risk_history.json", default={}, readonly=True)
+    profiles = load_json("member_profiles.json", default={}, readonly=True)
 
     today = datetime.now().strftime("%Y-%m-%d")
     week_ago = (datetime.now() - timedelta(days=7)).strftime("%Y-%m-%d")
@@ -82,7 +84,7 @@ def render():
 
     high_risk_today = 0
     for user_data in risk_history.values():
-        if isinstance(user_data, dict):
+        if isinstance(user_data, Mapping):
             high_risk_today += user_data.get('high_risk_count', 0)
 
     # 헤더
@@ -92,14 +94,9 @@ def render():
     </div>
     """, unsafe_allow_html=True)
 
-    cs_logs = [l for l in logs if l.get('type') == 'cs_query']
-    week_cs = [l for l in cs_logs if l.get('timestamp', '') >= week_ago]
-    top_topic = "없음"
-    if week_cs:
-        texts = [l.get('query', '') for l in week_cs]
-        keyword_counts = count_keywords(texts, KEYWORDS)
-        if keyword_counts:
-            top_topic = keyword_counts.most_common(1)[0][0]
+    # 7일 창 집계가 아니라 최근 질문일수록 무게가 큰 인기 검색어 (반감기 3일, utils/trending.py)
+    trending = trending_terms(1)
+    top_topic = trending[0] if trending else "없음"
 
     st.markdown(f"""
     <div class="summary-grid">
@@ -107,7 +104,7 @@ def render():
         <div class="summary-card"><p class="summary-value" style="color: #f59e0b;">{len(open_tickets)}</p><p class="summary-label">미해결 티켓</p></div>
         <div class="summary-card"><p class="summary-value" style="color: #22c55e;">{len(today_submissions)}</p><p class="summary-label">오늘 과제</p></div>
         <div class="summary-card"><p class="summary-value" style="color: #ef4444;">{high_risk_today}</p><p class="summary-label">고위험 누적</p></div>
-        <div class="summary-card"><p class="summary-value" style="color: #6366f1;">{top_topic}</p><p class="summary-label">이번주 핫토픽</p></div>
+        <div class="summary-card"><p class="summary-value" style="color: #6366f1;">{top_topic}</p><p class="summary-label">최근 인기 검색어</p></div>
     </div>
     """, unsafe_allow_html=True)
 
@@ -116,6 +113,7 @@ def render():
     with tab1:
         st.markdown("""<div class="section-card"><div class="section-title">🔥 이번 주 가장 많이 막힌 주제 Top 5</div></div>""", unsafe_allow_html=True)
         
+        week_cs = load_log_window("logs.json", week_ago, event_type="cs_query")
         all_texts = [l.get('query', '') for l in week_cs]
         all_texts += [s.get('content', '') for s in week_submissions]
         all_texts += [t.get('query', '') for t in tickets if t.get('timestamp', '') >= week_ago]
@@ -163,7 +161,7 @@ def render():
         st.markdown("**스트릭 분포**")
         streaks = {'0일': 0, '1-2일': 0, '3-6일': 0, '7일+': 0}
         for profile in profiles.values():
-            if isinstance(profile, dict):
+            if isinstance(profile, Mapping):
                 streak = profile.get('homework_streak', 0)
                 if streak == 0: streaks['0일'] += 1
                 elif streak <= 2: streaks['1-2일'] += 1
@@ -190,18 +188,26 @@ def render():
         else:
             filtered_tickets = tickets
         
-        for ticket in filtered_tickets[:10]:
-            status_color = "#ef4444" if ticket.get('status') == 'open' else "#22c55e"
+        # 비슷한 질문의 티켓은 한 클러스터로 묶어 표시
+        for cluster in group_tickets(filtered_tickets)[:10]:
+            first = cluster.tickets[0]
+            count = len(cluster.tickets)
+            status_color = "#ef4444" if cluster.open_count else "#22c55e"
+            status_text = f"open {cluster.open_count}/{count}" if cluster.open_count else f"closed {count}"
             st.markdown(f"""
             <div class="topic-item">
-                <span class="topic-name">#{ticket.get('id', 0)} - {ticket.get('query', '내용 없음')[:40]}...</span>
-                <span class="topic-count" style="background: {status_color}20; color: {status_color};">{ticket.get('status', 'open')}</span>
+                <span class="topic-name">#{first.get('id', 0)} - {cluster.query[:40]}...</span>
+                <span class="topic-count" style="background: {status_color}20; color: {status_color};">{status_text}</span>
             </div>
             """, unsafe_allow_html=True)
             
-            if ticket.get('status') == 'open':
-                if st.button(f"📋 알림 문구 생성", key=f"op_notify_{ticket.get('id')}"):
-                    notify_text = f"🎫 새 티켓 #{ticket.get('id')}\n질문: {ticket.get('query', '')}\n시간: {ticket.get('timestamp', '')}"
+            if cluster.open_count:
+                if st.button(f"📋 알림 문구 생성", key=f"op_notify_{first.get('id')}"):
+                    if count == 1:
+                        notify_text = f"🎫 새 티켓 #{first.get('id')}\n질문: {first.get('query', '')}\n시간: {first.get('timestamp', '')}"
+                    else:
+                        ids = ", ".join(f"#{t.get('id')}" for t in cluster.tickets if t.get('status') == 'open')
+                        notify_text = f"🎫 비슷한 티켓 {cluster.open_count}건 ({ids})\n대표 질문: {cluster.query}\n최근: {cluster.latest}"
                     st.code(notify_text, language=None)
         
         if not filtered_tickets:
@@ -2,7 +2,7 @@ import streamlit as st
 from datetime import datetime
 
 # 안전한 데이터 접근을 위한 유틸리티
-from utils.data_utils import load_json, save_json, append_to_json_list
+from utils.data_utils import load_json, save_json, log_event
 
 
 def render():
@@ -73,7 +73,7 @@ def render():
     """, unsafe_allow_html=True)
 
     def save_quiz_log(score, total, recommendations):
-        append_to_json_list("logs.json", {
+        log_event("logs.json", {
             "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
             "type": "quiz_result",
             "score": score,
@@ -2,7 +2,7 @@ import streamlit as st
 from datetime import datetime
 
 # 안전한 데이터 접근을 위한 유틸리티
-from utils.data_utils import load_json, save_json, append_to_json_list
+from utils.data_utils import log_event, update_member
 
 
 def render():
@@ -111,8 +111,6 @@ def render():
     nickname = st.text_input("닉네임", value=st.session_state.nickname, placeholder="온보딩에서 사용한 닉네임", key="risk_nickname")
     st.session_state.nickname = nickname
 
-    risk_history = load_json("risk_history.json", default={})
-
     if not st.session_state.risk_checked:
         st.markdown('<div class="form-card"><div class="form-label">📈 기본 정보</div></div>', unsafe_allow_html=True)
         
@@ -150,24 +148,23 @@ def render():
             score = min(sum(v['points'] for v in violations), 100)
             
             if nickname:
-                if nickname not in risk_history:
-                    risk_history[nickname] = {"warnings": [], "mini_course_completed": False, "total_checks": 0, "high_risk_count": 0}
-                for v in violations:
-                    found = False
-                    for w in risk_history[nickname].get('warnings', []):
-                        if w['type'] == v['type']:
-                            w['count'] = w.get('count', 0) + 1
-                            w['last_occurred'] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-                            found = True
-                            break
-                    if not found:
-                        risk_history[nickname]['warnings'].append({"type": v['type'], "count": 1, "last_occurred": datetime.now().strftime("%Y-%m-%d %H:%M:%S")})
-                risk_history[nickname]['total_checks'] = risk_history[nickname].get('total_checks', 0) + 1
-                if score >= 50:
-                    risk_history[nickname]['high_risk_count'] = risk_history[nickname].get('high_risk_count', 0) + 1
-                save_json("risk_history.json", risk_history)
+                def record_check(history):
+                    for v in violations:
+                        found = False
+                        for w in history.setdefault('warnings', []):
+                            if w['type'] == v['type']:
+                                w['count'] = w.get('count', 0) + 1
+                                w['last_occurred'] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+                                found = True
+                                break
+                        if not found:
+                            history['warnings'].append({"type": v['type'], "count": 1, "last_occurred": datetime.now().strftime("%Y-%m-%d %H:%M:%S")})
+                    history['total_checks'] = history.get('total_checks', 0) + 1
+                    if score >= 50:
+                        history['high_risk_count'] = history.get('high_risk_count', 0) + 1
+                update_member("risk_history.json", nickname, record_check, default={"warnings": [], "mini_course_completed": False, "total_checks": 0, "high_risk_count": 0})
             
-            append_to_json_list("logs.json", {"timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"), "type": "risk_check", "symbol": symbol, "direction": direction, "leverage": leverage, "position_size": position_size, "risk_score": score, "violation_count": len(violations)})
+            log_event("logs.json", {"timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"), "type": "risk_check", "symbol": symbol, "direction": direction, "leverage": leverage, "position_size": position_size, "risk_score": score, "violation_count": len(violations)})
             
             st.session_state.risk_checked = True
             st.session_state.risk_score = score
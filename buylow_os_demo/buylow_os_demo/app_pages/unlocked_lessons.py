@@ -1,7 +1,7 @@
 import streamlit as st
 
 # 안전한 데이터 접근을 위한 유틸리티
-from utils.data_utils import load_json
+from utils.data_utils import load_member
 
 
 def render():
@@ -52,8 +52,8 @@ def render():
     </style>
     """, unsafe_allow_html=True)
 
-    def load_unlocks():
-        return load_json("unlocks.json", default={})
+    def load_unlocks(nickname):
+        return load_member("unlocks.json", nickname, default={}, readonly=True)
 
     LESSONS = {
         "divergence_lesson": {
@@ -159,12 +159,7 @@ Support and Resistance Levels의 약자로 자동으로 지지/저항 구간을
 
     if nickname:
         st.session_state.nickname = nickname
-        unlocks = load_unlocks()
-        
-        if nickname not in unlocks:
-            unlocks[nickname] = {key: False for key in LESSONS.keys()}
-        
-        user_unlocks = unlocks.get(nickname, {})
+        user_unlocks = load_unlocks(nickname)
         
         st.markdown("""<div class="disclaimer">⚠️ 본 해설은 교육 및 정보 제공 목적입니다. 매매 추천, 가격 예측, 종목 추천이 아니며 투자 권유가 아닙니다.</div>""", unsafe_allow_html=True)
         
@@ -0,0 +1,41 @@
+# -*- coding: utf-8 -*-
+"""
+테스트 공용 설정
+
+앱은 app 폴더를 기준으로 `utils.…`를 import하므로 그 폴더를 경로에 넣고,
+저장소 테스트는 임시 data 폴더에서 JSON/SQLite 백엔드 각각으로 실행합니다.
+"""
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from utils import data_utils  # noqa: E402
+
+
+def _use_backend(name, tmp_path, monkeypatch):
+    monkeypatch.setenv("BUYLOW_DATA_DIR", str(tmp_path))
+    monkeypatch.delenv("BUYLOW_SQLITE_PATH", raising=False)
+    monkeypatch.delenv("BUYLOW_STORAGE_FORMAT", raising=False)
+    monkeypatch.setattr(data_utils, "_storage_formats", {})
+    monkeypatch.setattr(data_utils, "_append_listeners", {})
+    data_utils.invalidate_json_cache()
+    backend = data_utils.set_storage_backend(name)
+    yield backend
+    data_utils.flush_events()
+    data_utils.set_storage_backend("json")
+    data_utils.invalidate_json_cache()
+
+
+@pytest.fixture(params=["json", "sqlite"])
+def storage(request, tmp_path, monkeypatch):
+    """임시 data 폴더를 쓰는 저장소 백엔드 ("json" 또는 "sqlite")"""
+    yield from _use_backend(request.param, tmp_path, monkeypatch)
+
+
+@pytest.fixture
+def json_storage(tmp_path, monkeypatch):
+    """임시 data 폴더를 쓰는 JSON 파일 저장소 (저장 형식 테스트용)"""
+    yield from _use_backend("json", tmp_path, monkeypatch)
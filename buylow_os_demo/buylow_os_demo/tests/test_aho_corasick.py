@@ -0,0 +1,73 @@
+# -*- coding: utf-8 -*-
+"""여러 키워드 한 번에 찾기 (Aho-Corasick)"""
+import random
+
+import pytest
+
+from utils.aho_corasick import KeywordMatcher, compile_keywords
+
+
+def _expected(groups, text, ignore_case=True):
+    """키워드마다 `in`으로 찾은 결과 (matcher.find와 같아야 함)"""
+    if ignore_case:
+        text = text.lower()
+    result = {}
+    for name, keywords in groups.items():
+        found = [kw for kw in keywords if (kw.lower() if ignore_case else kw) in text]
+        if found:
+            result[name] = found
+    return result
+
+
+def test_docstring_example():
+    matcher = compile_keywords({"forbidden": ["추천", "무조건"], "risk": ["손절", "리스크"]})
+    assert matcher.find("손절 라인을 무조건 지킨다") == {"forbidden": ["무조건"], "risk": ["손절"]}
+
+
+@pytest.mark.parametrize("text", [
+    "손절가 설정",         # "손절"이 "손절가" 안에 있음
+    "손절",
+    "절가",
+    "ababab",
+    "abcabc",
+    "",
+])
+def test_overlapping_and_nested_patterns(text):
+    groups = {"nested": ["손절", "손절가", "절가", "절"], "overlap": ["aba", "bab", "ab", "b", "abcab", "cabc"]}
+    assert compile_keywords(groups).find(text) == _expected(groups, text)
+
+
+def test_keywords_keep_group_order_and_shared_keywords():
+    groups = {"a": ["다이버전스", "RSI"], "b": ["rsi"], "c": ["없는말"]}
+    assert compile_keywords(groups).find("rsi 다이버전스") == {"a": ["다이버전스", "RSI"], "b": ["rsi"]}
+
+
+def test_case_folding():
+    groups = {"g": ["RSI", "Stop Loss", "macd"]}
+    assert compile_keywords(groups).find("rsi와 STOP LOSS, MaCd") == {"g": ["RSI", "Stop Loss", "macd"]}
+    assert KeywordMatcher(groups, ignore_case=False).find("rsi와 Stop Loss") == {"g": ["Stop Loss"]}
+
+
+def test_empty_keyword_is_always_found():
+    groups = {"g": ["", "x"]}
+    assert compile_keywords(groups).find("") == {"g": [""]}
+    assert compile_keywords(groups).find("x") == {"g": ["", "x"]}
+
+
+def test_same_definition_is_compiled_once():
+    groups = {"g": ["손절", "리스크"]}
+    assert compile_keywords(groups) is compile_keywords({"g": ["손절", "리스크"]})
+    assert compile_keywords(groups) is not compile_keywords(groups, ignore_case=False)
+
+
+@pytest.mark.parametrize("ignore_case", [True, False])
+def test_random_texts_match_substring_search(ignore_case):
+    rng = random.Random(7)
+    alphabet = "abAB손절가리스크 "
+    for _ in range(300):
+        groups = {
+            f"g{i}": ["".join(rng.choice(alphabet) for _ in range(rng.randint(1, 4))) for _ in range(rng.randint(1, 5))]
+            for i in range(rng.randint(1, 3))
+        }
+        text = "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 30)))
+        assert KeywordMatcher(groups, ignore_case).find(text) == _expected(groups, text, ignore_case), (groups, text)
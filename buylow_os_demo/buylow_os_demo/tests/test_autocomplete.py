@@ -0,0 +1,75 @@
+# -*- coding: utf-8 -*-
+"""CS 검색어 자동완성"""
+from utils.autocomplete import Autocomplete, collect_entries
+from utils.kb_index import KEYWORD_PHRASE_SCORE
+
+DOCS = [
+    {"id": 1, "title": "RSI 다이버전스", "keywords": ["다이버전스", "rsi"]},
+    {"id": 2, "title": "손절가 설정 방법", "keywords": ["손절", "스탑로스"]},
+    {"id": 3, "title": "레버리지 사용 원칙", "keywords": ["레버리지"]},
+]
+
+
+def _query(text, doc_id, score=KEYWORD_PHRASE_SCORE):
+    return {"type": "cs_query", "query": text, "matched_doc_id": doc_id, "score": score}
+
+
+def test_prefix_matches_any_word_start():
+    complete = Autocomplete({"RSI 다이버전스": 1, "손절가 설정 방법": 1, "다이버전스": 1})
+    assert sorted(complete.suggest("다이버")) == ["RSI 다이버전스", "다이버전스"]
+    assert complete.suggest("설정") == ["손절가 설정 방법"]
+    # 단어 중간부터는 찾지 않음
+    assert complete.suggest("이버") == []
+    # 정규화해서 비교
+    assert complete.suggest("  rsi ") == ["RSI 다이버전스"]
+    assert complete.suggest("") == []
+    assert complete.suggest("rsi", limit=0) == []
+
+
+def test_suggestions_are_ranked_by_popularity_then_length():
+    complete = Autocomplete({"손절가 설정 방법": 5, "손절": 1, "손절가": 1, "손실 한도": 9})
+    assert complete.suggest("손") == ["손실 한도", "손절가 설정 방법", "손절", "손절가"]
+    assert complete.suggest("손절", limit=2) == ["손절가 설정 방법", "손절"]
+
+
+def test_entry_matching_twice_is_suggested_once():
+    complete = Autocomplete({"손절 손절가": 1})
+    assert complete.suggest("손절") == ["손절 손절가"]
+
+
+def test_collect_entries_counts_resolved_queries_only():
+    events = [
+        _query("손절 어떻게 정해요", 2),
+        _query("손절 어떻게 정해요 ", 2),
+        _query("손절은?", 2, score=KEYWORD_PHRASE_SCORE - 1),
+        {"type": "quiz", "query": "퀴즈", "matched_doc_id": 1, "score": 20},
+    ]
+    entries = collect_entries(DOCS, events)
+    # KB 항목: 해결된 질문 수 + 1
+    assert entries["손절가 설정 방법"] == 3
+    assert entries["스탑로스"] == 3
+    assert entries["레버리지 사용 원칙"] == 1
+    # 질문: 정규화해서 같은 질문끼리 합침, 해결하지 못한 질문과 다른 이벤트는 빠짐
+    assert entries["손절 어떻게 정해요"] == 2
+    assert "손절은?" not in entries and "퀴즈" not in entries
+
+
+def test_collect_entries_merges_query_into_kb_spelling():
+    entries = collect_entries(DOCS, [_query("RSI", 1)] * 4)
+    # 정규화하면 "rsi" 키워드와 같으므로 KB 표기로 한 번만, 인기도는 큰 쪽
+    assert "RSI" not in entries
+    assert entries["rsi"] == 5
+
+
+def test_only_most_frequent_queries_are_kept():
+    events = [_query(f"질문 {i}", 1) for i in range(10) for _ in range(i + 1)]
+    entries = collect_entries([], events, max_queries=3)
+    assert entries == {"질문 9": 10, "질문 8": 9, "질문 7": 8}
+
+
+def test_default_cutoff_is_500_queries():
+    events = [_query(f"질문 {i:04d}", 1) for i in range(600)]
+    events += [_query("질문 0599", 1)]
+    entries = collect_entries([], events)
+    assert len(entries) == 500
+    assert entries["질문 0599"] == 2
@@ -0,0 +1,144 @@
+# -*- coding: utf-8 -*-
+"""이벤트 집계 카운터 (event_counts)"""
+import json
+import threading
+import time
+
+from utils import data_utils
+from utils.data_utils import (EVENT_COUNTS_FILE, append_many_to_json_list, append_to_json_list, count_events,
+                              get_event_counts, invalidate_json_cache, load_member, rebuild_event_counts,
+                              save_json, save_member, thaw)
+from utils.event_counters import outcome_key
+from utils.event_writer import EventWriter
+
+RESOLVED = outcome_key("cs_query", "resolved")
+
+
+def _query(day, score):
+    return {"timestamp": f"{day} 10:00:00", "type": "cs_query", "query": "q", "score": score}
+
+
+def test_appends_update_counters(storage):
+    append_to_json_list("logs.json", _query("2026-10-17", 12))
+    append_many_to_json_list("logs.json", [
+        _query("2026-10-18", 3),
+        _query("2026-10-18", 15),
+        {"timestamp": "2026-10-18 11:00:00", "type": "quiz"},
+    ])
+    assert count_events("logs.json", "cs_query") == 3
+    assert count_events("logs.json", RESOLVED) == 2
+    assert count_events("logs.json", "cs_query", "2026-10-18") == 2
+    assert count_events("logs.json", RESOLVED, "2026-10-18") == 1
+    assert count_events("logs.json", "quiz") == 1
+    assert get_event_counts("logs.json")["total"] == 4
+
+
+def test_missing_counters_are_rebuilt_from_existing_log(storage, tmp_path):
+    # 예전 logs.json (SQLite 백엔드는 처음 읽을 때 가져옴)
+    legacy = [_query("2026-10-17", 12), _query("2026-10-18", 1)]
+    (tmp_path / "logs.json").write_text(json.dumps(legacy), encoding="utf-8")
+
+    assert count_events("logs.json", "cs_query") == 2
+    assert count_events("logs.json", RESOLVED) == 1
+    # 다시 집계한 카운터가 저장되어 있어야 함
+    invalidate_json_cache()
+    assert thaw(load_member(EVENT_COUNTS_FILE, "logs.json"))["total"] == 2
+
+
+def test_append_without_counters_counts_whole_log(storage, tmp_path):
+    (tmp_path / "logs.json").write_text(json.dumps([_query("2026-10-17", 12)]), encoding="utf-8")
+    append_to_json_list("logs.json", _query("2026-10-18", 12))
+    assert count_events("logs.json", "cs_query") == 2
+
+
+def test_whole_log_save_resets_counters(storage):
+    append_many_to_json_list("logs.json", [_query("2026-10-18", 12), _query("2026-10-18", 12)])
+    assert count_events("logs.json", "cs_query") == 2
+    save_json("logs.json", [_query("2026-10-18", 1)])
+    assert count_events("logs.json", "cs_query") == 1
+    assert count_events("logs.json", RESOLVED) == 0
+
+
+def test_rebuild_matches_log(storage):
+    append_many_to_json_list("logs.json", [_query("2026-10-18", 12), _query("2026-10-18", 2)])
+    save_member(EVENT_COUNTS_FILE, "logs.json", {"total": 99, "types": {}, "days": {}})
+    assert rebuild_event_counts("logs.json")["total"] == 2
+    assert count_events("logs.json", RESOLVED) == 1
+
+
+def test_deferred_events_update_counters_once_per_flush(storage, monkeypatch):
+    count_events("logs.json", "cs_query")
+    updates = []
+    original = data_utils.update_member
+
+    def counting_update(filename, *args, **kwargs):
+        if filename == EVENT_COUNTS_FILE:
+            updates.append(filename)
+        return original(filename, *args, **kwargs)
+
+    monkeypatch.setattr(data_utils, "update_member", counting_update)
+    writer = EventWriter(data_utils._write_event_batch, batch_size=1000, flush_interval=0.3)
+    try:
+        for i in range(50):
+            writer.submit("logs.json", _query("2026-10-18", 12 if i % 2 else 1))
+        assert writer.flush(timeout=10)
+    finally:
+        writer.close()
+
+    assert count_events("logs.json", "cs_query") == 50
+    assert count_events("logs.json", RESOLVED) == 25
+    # 50건이 한두 번의 기록으로 묶이고, 카운터도 기록마다 한 번만 갱신
+    assert 1 <= len(updates) <= 2
+
+
+def test_concurrent_bootstrap_keeps_every_event(storage, monkeypatch):
+    # 카운터가 없을 때 A가 먼저 훑고, A의 카운터 저장을 B가 훑을 때까지 붙잡아 둠.
+    # 잠금 없이 훑으면 A의 (B가 빠진) 결과가 남고 B의 항목은 영영 세지 않음
+    b_updating = threading.Event()
+    a_done = threading.Event()
+    calls = []
+    original = data_utils.update_member
+
+    def gated_update(filename, *args, **kwargs):
+        if filename != EVENT_COUNTS_FILE:
+            return original(filename, *args, **kwargs)
+        calls.append(filename)
+        if len(calls) == 1:
+            b_updating.wait(timeout=0.5)
+            try:
+                return original(filename, *args, **kwargs)
+            finally:
+                a_done.set()
+        b_updating.set()
+        a_done.wait(timeout=0.5)
+        return original(filename, *args, **kwargs)
+
+    monkeypatch.setattr(data_utils, "update_member", gated_update)
+    writer_a = threading.Thread(target=append_to_json_list, args=("logs.json", _query("2026-10-18", 12)))
+    writer_a.start()
+    while not calls and writer_a.is_alive():
+        time.sleep(0.01)
+    writer_b = threading.Thread(target=append_to_json_list, args=("logs.json", _query("2026-10-18", 1)))
+    writer_b.start()
+    writer_a.join()
+    writer_b.join()
+
+    invalidate_json_cache()
+    assert len(data_utils.load_json("logs.json", readonly=True)) == 2
+    assert get_event_counts("logs.json")["total"] == 2
+    assert count_events("logs.json", RESOLVED) == 1
+
+
+def test_concurrent_appends_without_counters_are_counted_once(storage):
+    def worker(score):
+        for _ in range(10):
+            append_to_json_list("logs.json", _query("2026-10-18", score))
+
+    threads = [threading.Thread(target=worker, args=(12 if i % 2 else 1,)) for i in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    invalidate_json_cache()
+    assert get_event_counts("logs.json")["total"] == 40
+    assert count_events("logs.json", RESOLVED) == 20
@@ -0,0 +1,106 @@
+# -*- coding: utf-8 -*-
+"""지연 기록 이벤트 (EventWriter, log_event/flush_events)"""
+import threading
+
+from utils import data_utils
+from utils.data_utils import count_events, flush_events, invalidate_json_cache, load_json, log_event
+from utils.event_writer import EventWriter
+
+
+class Recorder:
+    """기록한 배치와 기록한 스레드를 남기는 write_batch (백그라운드 스레드는 block이 풀릴 때까지 기다림)"""
+
+    def __init__(self):
+        self.batches = []
+        self.block = threading.Event()
+        self.block.set()
+        self.writing = threading.Event()
+
+    def __call__(self, filename, items):
+        if threading.current_thread().name == "buylow-event-writer":
+            self.writing.set()
+            assert self.block.wait(timeout=5)
+        self.batches.append((filename, list(items), threading.current_thread()))
+
+    def items(self):
+        return [item for _, items, _ in self.batches for item in items]
+
+
+def test_full_queue_writes_in_calling_thread():
+    recorder = Recorder()
+    recorder.block.clear()
+    writer = EventWriter(recorder, max_queue=1, batch_size=1, flush_interval=0.01)
+    try:
+        writer.submit("logs.json", {"n": 1})
+        # 백그라운드 스레드가 첫 항목을 기록하다 멈춰 있는 동안 큐를 채움
+        assert recorder.writing.wait(timeout=5)
+        writer.submit("logs.json", {"n": 2})
+        assert writer.pending == 2
+        writer.submit("logs.json", {"n": 3})
+        # 큐가 가득 차 있으므로 바로 기록됨
+        assert recorder.items() == [{"n": 3}]
+        recorder.block.set()
+        assert writer.flush(timeout=5)
+    finally:
+        writer.close()
+
+    assert sorted(item["n"] for item in recorder.items()) == [1, 2, 3]
+    assert recorder.batches[0] == ("logs.json", [{"n": 3}], threading.current_thread())
+    assert writer.pending == 0
+
+
+def test_closed_writer_writes_immediately():
+    recorder = Recorder()
+    writer = EventWriter(recorder, flush_interval=10)
+    writer.submit("logs.json", {"n": 1})
+    # 닫을 때 남은 이벤트를 기록
+    writer.close()
+    assert recorder.items() == [{"n": 1}]
+
+    writer.submit("logs.json", {"n": 2})
+    assert recorder.batches[-1] == ("logs.json", [{"n": 2}], threading.current_thread())
+    assert writer.pending == 0
+
+
+def test_batches_are_grouped_by_file():
+    recorder = Recorder()
+    writer = EventWriter(recorder, batch_size=1000, flush_interval=0.2)
+    try:
+        for i in range(10):
+            writer.submit("logs.json" if i % 2 else "tickets.json", {"n": i})
+        assert writer.flush(timeout=5)
+    finally:
+        writer.close()
+    written = {}
+    for filename, items, _ in recorder.batches:
+        written.setdefault(filename, []).extend(item["n"] for item in items)
+    assert written == {"tickets.json": [0, 2, 4, 6, 8], "logs.json": [1, 3, 5, 7, 9]}
+
+
+def test_failed_batch_does_not_block_flush(capsys):
+    def broken(filename, items):
+        raise IOError("disk full")
+
+    writer = EventWriter(broken, flush_interval=0.01)
+    try:
+        writer.submit("logs.json", {"n": 1})
+        assert writer.flush(timeout=5)
+    finally:
+        writer.close()
+    assert "Failed to write 1 events to logs.json" in capsys.readouterr().out
+
+
+def test_flush_events_drains_every_queued_event(storage):
+    for i in range(450):
+        log_event("logs.json", {"timestamp": "2026-10-18 10:00:00", "type": "cs_query", "query": f"q{i}",
+                                "score": 12})
+    for i in range(30):
+        log_event("tickets.json", {"id": i + 1, "timestamp": "2026-10-18 10:00:00", "query": f"q{i}",
+                                   "status": "open"})
+    assert flush_events(timeout=10)
+    assert data_utils.get_event_writer().pending == 0
+
+    invalidate_json_cache()
+    assert len(load_json("logs.json", readonly=True)) == 450
+    assert [t["id"] for t in load_json("tickets.json", readonly=True)] == list(range(1, 31))
+    assert count_events("logs.json", "cs_query") == 450
@@ -0,0 +1,82 @@
+# -*- coding: utf-8 -*-
+"""오타 교정 (SymSpell 삭제 색인, KB 검색 교정)"""
+import json
+from pathlib import Path
+
+import pytest
+
+from utils.fuzzy import MAX_DISTANCE, SymSpellIndex, allowed_distance, deletes, edit_distance
+from utils.kb_index import CORRECTED_MAX_SCORE, KEYWORD_PHRASE_SCORE, KBIndex
+
+KB_PATH = Path(__file__).resolve().parent.parent / "data" / "kb.json"
+
+VOCABULARY = {"다이버전스": 3, "레버리지": 5, "저항": 2, "매도": 4, "손절가": 1, "리스크": 2}
+
+
+@pytest.fixture(scope="module")
+def speller():
+    return SymSpellIndex(VOCABULARY)
+
+
+@pytest.fixture(scope="module")
+def shipped_index():
+    """저장소에 포함된 kb.json (읽기만 함)"""
+    return KBIndex(json.loads(KB_PATH.read_text(encoding="utf-8")))
+
+
+def test_edit_distance_counts_transpositions_and_stops_at_limit():
+    assert edit_distance("abcd", "abcd", 2) == 0
+    assert edit_distance("abcd", "abdc", 2) == 1
+    assert edit_distance("kitten", "sitting", 5) == 3
+    assert edit_distance("abc", "xyz", 1) == 2
+    assert edit_distance("a", "abcd", 2) == 3
+
+
+def test_deletes_and_allowed_distance():
+    assert deletes("abc", 1) == {"abc", "ab", "ac", "bc"}
+    assert "a" in deletes("abc", 2)
+    assert allowed_distance(3) == 0
+    assert allowed_distance(5) == 1
+    assert allowed_distance(12) == MAX_DISTANCE
+
+
+@pytest.mark.parametrize("word, expected", [
+    ("다이버젼스", ("다이버전스", 1)),
+    ("레버레지", ("레버리지", 1)),
+    ("손절거", ("손절가", 1)),
+    ("레버리지", ("레버리지", 0)),
+])
+def test_lookup_finds_closest_word(speller, word, expected):
+    assert speller.lookup(word) == expected
+
+
+@pytest.mark.parametrize("word", ["저장", "매수", "xyz", "완전히다른단어"])
+def test_short_or_distant_words_are_not_corrected(speller, word):
+    # "저장"→"저항", "매수"→"매도"는 자모 하나 차이지만 뜻이 다름
+    assert speller.lookup(word) is None
+
+
+def test_correct_keeps_known_words(shipped_index):
+    assert shipped_index.correct("다이버젼스가 뭔가요") == "다이버전스 뭔가요"
+    assert shipped_index.correct("저장하지") == "저장하지"
+
+
+def test_corrected_results_are_capped(shipped_index):
+    result = shipped_index.lookup("다이버젼스")
+    assert result.corrected == "다이버전스"
+    assert result.best[0]["title"] == "다이버전스 패턴"
+    assert result.best[1] == CORRECTED_MAX_SCORE < KEYWORD_PHRASE_SCORE
+
+
+@pytest.mark.parametrize("query", ["저장", "저장하지", "매수"])
+def test_short_words_do_not_resolve_to_other_entries(shipped_index, query):
+    result = shipped_index.lookup(query)
+    assert result.corrected is None
+    assert result.best[1] == 0
+
+
+def test_exact_match_is_not_corrected(shipped_index):
+    result = shipped_index.lookup("손절")
+    assert result.corrected is None
+    assert result.best[0]["title"] == "손절가 설정 방법"
+    assert result.best[1] >= KEYWORD_PHRASE_SCORE
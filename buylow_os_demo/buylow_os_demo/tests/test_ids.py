@@ -0,0 +1,41 @@
+# -*- coding: utf-8 -*-
+"""ID 발급 (컬렉션별 시퀀스)"""
+import json
+import threading
+
+import pytest
+
+from utils.data_utils import get_next_id, reserve_ids
+
+
+@pytest.mark.parametrize("filename", ["tickets.json", "homework_reviews.json", "announcements.json"])
+def test_next_id_continues_after_existing_items(storage, tmp_path, filename):
+    # 예전 JSON 파일 (SQLite 백엔드는 처음 접근할 때 가져옴)
+    (tmp_path / filename).write_text(json.dumps([{"id": 3}, {"id": 10}]), encoding="utf-8")
+    assert get_next_id(filename) == 11
+    assert get_next_id(filename) == 12
+
+
+def test_reserved_ids_are_skipped_by_next_id(storage):
+    assert get_next_id("tickets.json") == 1
+    assert list(reserve_ids("tickets.json", 5)) == [2, 3, 4, 5, 6]
+    assert get_next_id("tickets.json") == 7
+    with pytest.raises(ValueError):
+        reserve_ids("tickets.json", 0)
+
+
+def test_concurrent_callers_never_share_an_id(storage):
+    issued = []
+    lock = threading.Lock()
+
+    def allocate():
+        ids = [get_next_id("homework_submissions.json") for _ in range(25)]
+        with lock:
+            issued.extend(ids)
+
+    threads = [threading.Thread(target=allocate) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert sorted(issued) == list(range(1, 201))
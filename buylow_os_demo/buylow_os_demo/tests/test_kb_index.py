@@ -0,0 +1,112 @@
+# -*- coding: utf-8 -*-
+"""CS 지식베이스 검색 (규칙 점수 + BM25)"""
+import json
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from utils.kb_index import (CLOSE_GAP, KEYWORD_PHRASE_SCORE, KBIndex, QueryCache, SearchResult,
+                            confidence_gap, normalize_text)
+from utils.kb_search import BM25Index, top_indices
+
+KB_PATH = Path(__file__).resolve().parent.parent / "data" / "kb.json"
+
+DOCS = [
+    {"id": 1, "title": "레버리지 사용 원칙", "keywords": ["레버리지", "배율"],
+     "short_answer": "레버리지는 낮게", "detailed_answer": "초보는 3배 이하"},
+    {"id": 2, "title": "손절가 설정 방법", "keywords": ["손절", "스탑로스"],
+     "short_answer": "진입 전에 손절가를 정하세요", "detailed_answer": "손실 한도를 먼저 정합니다"},
+    {"id": 3, "title": "리스크 관리 원칙", "keywords": ["리스크", "손실 한도"],
+     "short_answer": "한 번에 1~2%만", "detailed_answer": "레버리지와 비중을 함께 봅니다"},
+]
+
+
+@pytest.fixture(scope="module")
+def index():
+    return KBIndex(DOCS)
+
+
+@pytest.fixture(scope="module")
+def shipped_index():
+    """저장소에 포함된 kb.json (읽기만 함)"""
+    return KBIndex(json.loads(KB_PATH.read_text(encoding="utf-8")))
+
+
+def test_normalize_text():
+    assert normalize_text("  RSI 다이버전스가,  뭔가요?! ") == "rsi 다이버전스가 뭔가요 "
+
+
+def test_rule_scores(index):
+    # 키워드 구문 10점 + 제목 단어 5점
+    assert index.scores("레버리지 몇 배?") == {0: 15}
+    # 제목 구문 15점 + 키워드 구문 10점
+    assert index.scores("손절가 설정 방법")[1] == 15 + 10
+    # 여러 단어 키워드는 단어만 겹쳐도 단어당 3점
+    assert index.scores("한도")[2] == 3
+
+
+def test_lookup_ranks_by_rule_score_then_bm25(index):
+    result = index.lookup("리스크 관리 원칙 알려줘", k=3)
+    assert isinstance(result, SearchResult)
+    assert [(hit.doc["id"], hit.score) for hit in result.hits[:2]] == [(3, 25), (1, 5)]
+    assert result.best == (result.hits[0].doc, 25)
+    assert result.gap == 20
+    assert result.corrected is None
+
+    # 규칙 점수가 같으면 (둘 다 15점) BM25 관련도가 높은 문서가 먼저
+    tied = index.search("레버리지 리스크", k=2)
+    assert [hit.score for hit in tied] == [15, 15]
+    assert tied[0].relevance >= tied[1].relevance
+
+
+def test_no_match_returns_none(index):
+    result = index.lookup("전혀 관계없는 질문")
+    assert result.best == (None, 0)
+    assert index.match("전혀 관계없는 질문") == (None, 0)
+
+
+def test_bm25_finds_words_with_particles(index):
+    # "손절가를"은 규칙으로는 안 맞지만 BM25 n-gram으로 찾음
+    hits = index.search("손절가를", k=3)
+    assert hits[0].doc["id"] == 2
+    assert hits[0].relevance > 0
+
+
+def test_confidence_gap():
+    assert confidence_gap(()) == 0
+    hits = KBIndex(DOCS).search("레버리지", k=2)
+    assert confidence_gap(hits[:1]) == hits[0].score
+    assert confidence_gap(hits) == hits[0].score - hits[1].score
+
+
+def test_shipped_kb_answers_common_questions(shipped_index):
+    for query, title in [("다이버전스가 뭔가요?", "다이버전스 패턴"),
+                         ("손절 어떻게 정해요", "손절가 설정 방법"),
+                         ("레버리지 몇 배까지", "레버리지 사용 원칙")]:
+        doc, score = shipped_index.match(query)
+        assert doc is not None and doc["title"] == title, query
+        assert score >= KEYWORD_PHRASE_SCORE
+    assert CLOSE_GAP > 0
+
+
+def test_bm25_top_k_and_top_indices():
+    bm25 = BM25Index(DOCS)
+    top = bm25.top_k("레버리지", k=2)
+    assert [doc for doc, _ in top][0] == 0
+    assert all(score > 0 for _, score in top)
+
+    values = np.array([0.0, 3.0, 1.0, 3.0, -1.0])
+    assert top_indices(values, 2) == [1, 3]
+    assert top_indices(values, 10) == [1, 3, 2]
+    assert top_indices(values, 0) == []
+
+
+def test_query_cache_is_lru():
+    cache = QueryCache(2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == 1
+    cache.put("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1 and cache.get("c") == 3
@@ -0,0 +1,77 @@
+# -*- coding: utf-8 -*-
+"""KB 관련 항목 (희소 TF-IDF 유사도, 증분 갱신)"""
+import copy
+import json
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from utils import kb_related
+from utils.kb_related import TfidfMatrix, term_counts, update_table
+
+KB_PATH = Path(__file__).resolve().parent.parent / "data" / "kb.json"
+
+
+@pytest.fixture(scope="module")
+def docs():
+    """저장소에 포함된 kb.json (읽기만 함)"""
+    return json.loads(KB_PATH.read_text(encoding="utf-8"))
+
+
+def _dense_cosine(counts):
+    """같은 가중치를 밀집 행렬로 계산한 기준값"""
+    vocabulary = sorted({t for tokens, _ in counts for t in tokens})
+    column = {t: j for j, t in enumerate(vocabulary)}
+    tf = np.zeros((len(counts), len(vocabulary)))
+    for i, (tokens, values) in enumerate(counts):
+        for token, value in zip(tokens, values):
+            tf[i, column[token]] = 1.0 + np.log(value)
+    df = (tf > 0).sum(axis=0)
+    weights = tf * (np.log((1.0 + len(counts)) / (1.0 + df)) + 1.0)
+    weights /= np.linalg.norm(weights, axis=1, keepdims=True)
+    return weights @ weights.T
+
+
+def test_similarities_match_dense_cosine(docs):
+    counts = [term_counts(doc) for doc in docs]
+    matrix = TfidfMatrix(counts)
+    expected = _dense_cosine(counts)
+    rows = [0, len(docs) // 2, len(docs) - 1]
+    np.testing.assert_allclose(matrix.similarities(rows), expected[rows], atol=1e-5)
+    np.testing.assert_allclose(np.diag(expected), 1.0, atol=1e-6)
+
+
+def test_sparse_columns_alone_match_dense_cosine(docs, monkeypatch):
+    # 밀집 열 없이 포스팅만으로 계산해도 같아야 함
+    monkeypatch.setattr(kb_related, "MAX_DENSE_COLUMNS", 0)
+    counts = [term_counts(doc) for doc in docs]
+    np.testing.assert_allclose(TfidfMatrix(counts).similarities(range(len(docs))),
+                               _dense_cosine(counts), atol=1e-5)
+
+
+def _related_ids(table):
+    return {key: [other for other, _ in entry["related"]] for key, entry in table["entries"].items()}
+
+
+def test_incremental_update_matches_full_rebuild(docs, monkeypatch):
+    monkeypatch.setattr(kb_related, "_term_counts", {})
+    table, changed = update_table(docs, None)
+    assert changed
+    assert set(table["entries"]) == {str(doc["id"]) for doc in docs}
+    assert update_table(docs, table) == (table, False)
+
+    edited = copy.deepcopy(docs)
+    edited[0]["keywords"] = list(edited[0].get("keywords", [])) + list(edited[-1].get("keywords", []))
+    del edited[1]
+    incremental, changed = update_table(edited, table)
+    assert changed
+    # 다시 계산하지 않은 항목은 예전 점수를 그대로 두므로 (IDF 변화 무시) 목록만 비교
+    assert _related_ids(incremental) == _related_ids(update_table(edited, None)[0])
+
+
+def test_related_excludes_self_and_weak_matches(docs):
+    table, _ = update_table(docs, None, count=2)
+    for key, entry in table["entries"].items():
+        assert len(entry["related"]) <= 2
+        assert all(str(other) != key and score >= kb_related.MIN_SIMILARITY for other, score in entry["related"])
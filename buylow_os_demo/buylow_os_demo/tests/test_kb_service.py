@@ -0,0 +1,130 @@
+# -*- coding: utf-8 -*-
+"""검색 인덱스 자동 갱신 서비스 (백그라운드 다시 만들기 + 교체)"""
+import threading
+import time
+
+import pytest
+
+from utils.data_utils import get_data_version, load_json, save_json
+from utils.kb_index import KBIndex
+from utils.kb_service import KBService
+
+POLL = 0.02
+
+
+def _docs(*titles):
+    return [{"id": i + 1, "title": title, "keywords": [title]} for i, title in enumerate(titles)]
+
+
+def _titles(index):
+    return [doc["title"] for doc in index.docs]
+
+
+def _wait_for(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(POLL / 2)
+    return False
+
+
+@pytest.fixture
+def make_service(json_storage):
+    """임시 data 폴더의 kb.json을 감시하는 서비스 (테스트가 끝나면 멈춤)"""
+    services = []
+
+    def make(build=None, on_swap=None):
+        def default_build(version):
+            return KBIndex(load_json("kb.json", default=[], readonly=True), version)
+
+        service = KBService(build or default_build, lambda: get_data_version("kb.json"),
+                            poll_interval=POLL, on_swap=on_swap, name="test-kb-service")
+        services.append(service)
+        return service
+
+    yield make
+    for service in services:
+        service.close()
+
+
+def test_kb_change_is_picked_up_after_poll(make_service):
+    save_json("kb.json", _docs("레버리지"))
+    swapped = []
+    service = make_service(on_swap=swapped.append)
+    first = service.index
+    assert _titles(first) == ["레버리지"]
+
+    save_json("kb.json", _docs("레버리지", "손절가 설정 방법"))
+    assert _wait_for(lambda: service.index is not first)
+    assert _titles(service.index) == ["레버리지", "손절가 설정 방법"]
+    assert service.version == get_data_version("kb.json") == service.index.version
+    # 교체한 뒤 알림 (검색 결과 캐시 비우기 등)
+    assert _wait_for(lambda: swapped)
+    assert swapped == [service.index]
+    # 바뀐 것이 없으면 다시 만들지 않음
+    assert service.refresh() is False
+
+
+def test_readers_keep_old_index_until_swap(make_service):
+    save_json("kb.json", _docs("레버리지"))
+    building = threading.Event()
+    release = threading.Event()
+    builds = []
+
+    def slow_build(version):
+        builds.append(version)
+        if len(builds) > 1:
+            building.set()
+            assert release.wait(timeout=5)
+        return KBIndex(load_json("kb.json", default=[], readonly=True), version)
+
+    service = make_service(build=slow_build)
+    old = service.index
+    save_json("kb.json", _docs("레버리지", "RSI 지표 기초"))
+
+    assert building.wait(timeout=5)
+    # 새 인덱스를 만드는 동안에도 요청은 이전 인덱스를 그대로 받음
+    assert service.index is old
+    assert _titles(service.index) == ["레버리지"]
+
+    release.set()
+    assert _wait_for(lambda: service.index is not old)
+    assert _titles(service.index) == ["레버리지", "RSI 지표 기초"]
+
+
+def test_failed_rebuild_keeps_old_index_and_retries(make_service, capsys):
+    save_json("kb.json", _docs("레버리지"))
+    failures = []
+
+    def flaky_build(version):
+        if version != service_version[0] and not failures:
+            failures.append(version)
+            raise ValueError("kb.json 파싱 실패")
+        return KBIndex(load_json("kb.json", default=[], readonly=True), version)
+
+    service_version = [get_data_version("kb.json")]
+    service = make_service(build=flaky_build)
+    old = service.index
+
+    save_json("kb.json", _docs("레버리지", "리스크 관리 원칙"))
+    assert _wait_for(lambda: service.index is not old)
+    # 한 번 실패해도 이전 인덱스를 쓰다가 다음 확인에서 다시 만듦
+    assert len(failures) == 1
+    assert _titles(service.index) == ["레버리지", "리스크 관리 원칙"]
+    assert "Failed to rebuild index" in capsys.readouterr().out
+
+
+def test_close_stops_watching(make_service):
+    save_json("kb.json", _docs("레버리지"))
+    service = make_service()
+    service.close()
+    assert not service._thread.is_alive()
+
+    old = service.index
+    save_json("kb.json", _docs("레버리지", "손절가 설정 방법"))
+    time.sleep(POLL * 5)
+    assert service.index is old
+    # 직접 확인하면 여전히 교체됨
+    assert service.refresh() is True
+    assert _titles(service.index) == ["레버리지", "손절가 설정 방법"]
@@ -0,0 +1,84 @@
+# -*- coding: utf-8 -*-
+"""회원별 저장 (member_profiles, unlocks, risk_history 등)"""
+import json
+import threading
+
+from utils.data_utils import (invalidate_json_cache, load_json, load_member, save_json, save_member,
+                              set_storage_backend, thaw, update_member)
+
+PROFILES = "member_profiles.json"
+
+
+def test_member_round_trip_and_collection_view(storage):
+    assert load_member(PROFILES, "alice") is None
+    assert load_member(PROFILES, "alice", default={"homework_count": 0}) == {"homework_count": 0}
+
+    assert save_member(PROFILES, "alice", {"nickname": "alice", "homework_count": 1})
+    assert save_member(PROFILES, "bob", {"nickname": "bob", "homework_count": 2})
+    assert load_member(PROFILES, "alice") == {"nickname": "alice", "homework_count": 1}
+    assert thaw(load_json(PROFILES, readonly=True)) == {
+        "alice": {"nickname": "alice", "homework_count": 1},
+        "bob": {"nickname": "bob", "homework_count": 2},
+    }
+
+    save_member(PROFILES, "alice", {"nickname": "alice", "homework_count": 5})
+    assert load_json(PROFILES, readonly=True)["alice"]["homework_count"] == 5
+
+
+def test_saving_none_clears_member(storage):
+    save_member("unlocks.json", "alice", {"srl_lesson": True})
+    save_member("unlocks.json", "bob", {"srl_lesson": True})
+    save_member("unlocks.json", "alice", None)
+    assert load_member("unlocks.json", "alice") is None
+    assert load_member("unlocks.json", "bob") == {"srl_lesson": True}
+
+
+def test_whole_collection_save_replaces_members(storage):
+    save_member("unlocks.json", "alice", {"srl_lesson": True})
+    save_json("unlocks.json", {"bob": {"divergence_lesson": True}, "carol": {}})
+    assert load_member("unlocks.json", "alice") is None
+    assert load_member("unlocks.json", "bob") == {"divergence_lesson": True}
+    assert set(load_json("unlocks.json", readonly=True)) == {"bob", "carol"}
+
+
+def test_legacy_collection_file_is_split_per_member(storage, tmp_path):
+    legacy = {"alice": {"warnings": [], "total_checks": 3}, "밥": {"warnings": [], "total_checks": 1}}
+    (tmp_path / "risk_history.json").write_text(json.dumps(legacy, ensure_ascii=False), encoding="utf-8")
+    assert load_member("risk_history.json", "밥") == {"warnings": [], "total_checks": 1}
+    assert thaw(load_json("risk_history.json", readonly=True)) == legacy
+
+
+def test_update_member_keeps_concurrent_increments(storage):
+    def bump(profile):
+        profile["homework_count"] = profile.get("homework_count", 0) + 1
+
+    def worker():
+        for _ in range(20):
+            update_member(PROFILES, "alice", bump, default={"nickname": "alice"})
+
+    threads = [threading.Thread(target=worker) for _ in range(5)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    invalidate_json_cache()
+    assert load_member(PROFILES, "alice")["homework_count"] == 100
+
+
+def test_update_member_return_value_replaces_data(storage):
+    save_member(PROFILES, "alice", {"homework_count": 1})
+    result = update_member(PROFILES, "alice", lambda current: {"homework_count": current["homework_count"] * 10})
+    assert result == {"homework_count": 10}
+    assert load_member(PROFILES, "alice") == {"homework_count": 10}
+
+
+def test_collection_view_sees_writes_from_another_backend_instance(storage):
+    name = "sqlite" if type(storage).__name__ == "SQLiteBackend" else "json"
+    save_member(PROFILES, "alice", {"homework_count": 1})
+    assert set(load_json(PROFILES, readonly=True)) == {"alice"}
+
+    other = set_storage_backend(name)
+    other.save_member(PROFILES, "bob", {"homework_count": 2})
+    assert set(load_json(PROFILES, readonly=True)) == {"alice", "bob"}
+    other.update_member(PROFILES, "alice", lambda profile: {"homework_count": 3}, None)
+    assert load_json(PROFILES, readonly=True)["alice"]["homework_count"] == 3
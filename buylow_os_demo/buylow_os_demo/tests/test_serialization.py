@@ -0,0 +1,68 @@
+# -*- coding: utf-8 -*-
+"""저장 형식 (pretty/compact/binary)"""
+import pytest
+
+from utils import serialization
+from utils.data_utils import (convert_storage_format, freeze, get_data_path, get_member_store_path,
+                              invalidate_json_cache, load_json, load_member, save_json, save_member,
+                              set_storage_format)
+
+DATA = {"title": "공지", "items": [1, 2.5, None, True], "nested": {"a": ["b"]}}
+
+
+@pytest.mark.parametrize("fmt", serialization.FORMATS)
+def test_round_trip(fmt):
+    raw = serialization.dumps(DATA, fmt)
+    assert serialization.loads(raw) == DATA
+    assert raw.startswith(serialization.BINARY_MAGIC) == (fmt == "binary")
+
+
+def test_binary_accepts_readonly_views():
+    assert serialization.loads(serialization.dumps(freeze(DATA), "binary")) == DATA
+
+
+def test_binary_from_another_version_is_rejected():
+    foreign = serialization.BINARY_PREFIX + b"2:py2.7:m1\n" + b"\x00garbage"
+    with pytest.raises(serialization.BinaryVersionError, match="py2.7"):
+        serialization.loads(foreign)
+    with pytest.raises(ValueError):
+        serialization.loads(b"   ")
+
+
+@pytest.mark.parametrize("fmt", serialization.FORMATS)
+def test_saved_files_are_read_back_in_any_format(json_storage, fmt):
+    set_storage_format(fmt)
+    save_json("content_versions.json", DATA)
+    save_member("member_profiles.json", "alice", {"homework_count": 1})
+    invalidate_json_cache()
+    assert load_json("content_versions.json") == DATA
+    assert load_member("member_profiles.json", "alice") == {"homework_count": 1}
+
+
+def test_convert_rewrites_files_in_new_format(json_storage):
+    save_json("content_versions.json", DATA)
+    save_member("member_profiles.json", "alice", {"homework_count": 1})
+
+    converted = convert_storage_format("binary")
+    assert converted["content_versions.json"] == 1
+    assert converted["member_profiles.json"] == 1
+    assert get_data_path("content_versions.json").read_bytes().startswith(serialization.BINARY_MAGIC)
+    member_files = [p for p in get_member_store_path("member_profiles.json").rglob("*.json")]
+    assert member_files and all(p.read_bytes().startswith(serialization.BINARY_MAGIC) for p in member_files)
+
+    convert_storage_format("compact")
+    invalidate_json_cache()
+    assert get_data_path("content_versions.json").read_bytes().startswith(b"{")
+    assert load_json("content_versions.json") == DATA
+    assert load_member("member_profiles.json", "alice") == {"homework_count": 1}
+
+
+def test_unreadable_binary_is_not_overwritten(json_storage):
+    path = get_data_path("content_versions.json")
+    path.parent.mkdir(parents=True, exist_ok=True)
+    foreign = serialization.BINARY_PREFIX + b"2:py2.7:m1\n" + b"\x00garbage"
+    path.write_bytes(foreign)
+
+    assert load_json("content_versions.json", default={}) == {}
+    assert "content_versions.json" not in convert_storage_format("compact")
+    assert path.read_bytes() == foreign
@@ -0,0 +1,114 @@
+# -*- coding: utf-8 -*-
+"""저장소 공개 API (data_utils) - JSON/SQLite 백엔드 공통 동작"""
+import json
+
+import pytest
+
+from utils.data_utils import (append_many_to_json_list, append_to_json_list, find_items, get_data_version,
+                              invalidate_json_cache, iter_events, load_json, load_log_window, save_json,
+                              set_storage_backend)
+
+
+def _write_legacy(tmp_path, filename, data):
+    """예전 JSON 파일 (SQLite 백엔드는 처음 읽을 때 가져옴)"""
+    (tmp_path / filename).write_text(json.dumps(data, ensure_ascii=False), encoding="utf-8")
+
+
+def test_save_and_load_round_trip(storage):
+    announcements = [{"id": 1, "title": "공지", "tags": ["a", "b"]}, {"id": 2, "title": "두 번째"}]
+    assert save_json("announcements.json", announcements)
+    assert load_json("announcements.json") == announcements
+
+    invalidate_json_cache()
+    assert load_json("announcements.json") == announcements
+
+
+def test_missing_file_returns_default(storage):
+    assert load_json("homework_reviews.json") == []
+    assert load_json("drafts.json", default=[{"id": 1}]) == [{"id": 1}]
+
+
+def test_load_returns_independent_copy(storage):
+    save_json("announcements.json", [{"id": 1, "title": "원본"}])
+    data = load_json("announcements.json")
+    data[0]["title"] = "수정"
+    data.append({"id": 2})
+    assert load_json("announcements.json") == [{"id": 1, "title": "원본"}]
+
+
+def test_readonly_view_cannot_be_modified(storage):
+    save_json("announcements.json", [{"id": 1, "title": "원본"}])
+    view = load_json("announcements.json", readonly=True)
+    assert view[0]["title"] == "원본"
+    with pytest.raises(TypeError):
+        view[0]["title"] = "수정"
+    assert not hasattr(view, "append")
+
+
+def test_append_is_visible_to_cached_readers(storage):
+    assert load_json("tickets.json", readonly=True) == ()
+    append_to_json_list("tickets.json", {"id": 1, "query": "첫 질문", "status": "open"})
+    assert [t["id"] for t in load_json("tickets.json", readonly=True)] == [1]
+
+    append_many_to_json_list("tickets.json", [
+        {"id": 2, "query": "둘", "status": "open"},
+        {"id": 3, "query": "셋", "status": "closed"},
+    ])
+    assert [t["id"] for t in load_json("tickets.json", readonly=True)] == [1, 2, 3]
+    assert [t["id"] for t in load_json("tickets.json")] == [1, 2, 3]
+    assert [t["id"] for t in iter_events("tickets.json")] == [1, 2, 3]
+
+
+def test_save_after_append_replaces_whole_list(storage):
+    append_many_to_json_list("tickets.json", [{"id": 1, "status": "open"}, {"id": 2, "status": "open"}])
+    tickets = load_json("tickets.json")
+    tickets[0]["status"] = "resolved"
+    assert save_json("tickets.json", tickets[:1])
+    assert load_json("tickets.json") == [{"id": 1, "status": "resolved"}]
+
+
+def test_writes_from_another_backend_instance_are_seen(storage):
+    # 같은 data 폴더를 쓰는 다른 프로세스 대신 백엔드 인스턴스를 하나 더 만듦
+    name = "sqlite" if type(storage).__name__ == "SQLiteBackend" else "json"
+    save_json("announcements.json", [{"id": 1}])
+    assert load_json("announcements.json", readonly=True)[0]["id"] == 1
+    before = get_data_version("announcements.json")
+
+    other = set_storage_backend(name)
+    other.save("announcements.json", [{"id": 1}, {"id": 2}])
+    other.append("tickets.json", {"id": 7, "status": "open"})
+    assert get_data_version("announcements.json") != before
+    assert [a["id"] for a in load_json("announcements.json", readonly=True)] == [1, 2]
+    assert [t["id"] for t in load_json("tickets.json", readonly=True)] == [7]
+
+
+def test_legacy_json_is_loaded_including_non_positive_ids(storage, tmp_path):
+    _write_legacy(tmp_path, "announcements.json", [{"id": 0, "title": "zero"}, {"id": -1, "title": "minus"},
+                                                   {"id": 5, "title": "five"}])
+    assert sorted(a["id"] for a in load_json("announcements.json")) == [-1, 0, 5]
+
+
+def test_find_items_matches_all_filters(storage):
+    append_many_to_json_list("tickets.json", [
+        {"id": 1, "status": "open", "reason": "매칭 실패"},
+        {"id": 2, "status": "resolved", "reason": "매칭 실패"},
+        {"id": 3, "status": "open", "reason": "부분 매칭"},
+    ])
+    assert [t["id"] for t in find_items("tickets.json", status="open")] == [1, 3]
+    assert [t["id"] for t in find_items("tickets.json", status="open", reason="부분 매칭")] == [3]
+    assert find_items("tickets.json", status="missing") == []
+
+
+def test_log_window_reads_only_requested_days_and_type(storage):
+    append_many_to_json_list("logs.json", [
+        {"timestamp": "2026-10-15 09:00:00", "type": "cs_query", "query": "a"},
+        {"timestamp": "2026-10-16 09:00:00", "type": "quiz"},
+        {"timestamp": "2026-10-16 18:00:00", "type": "cs_query", "query": "b"},
+        {"timestamp": "2026-10-18 09:00:00", "type": "cs_query", "query": "c"},
+    ])
+    window = load_log_window("logs.json", "2026-10-16", "2026-10-17")
+    assert [e["timestamp"] for e in window] == ["2026-10-16 09:00:00", "2026-10-16 18:00:00"]
+
+    queries = load_log_window("logs.json", "2026-10-16", event_type="cs_query")
+    assert [e["query"] for e in queries] == ["b", "c"]
+    assert len(load_json("logs.json", readonly=True)) == 4
@@ -0,0 +1,117 @@
+# -*- coding: utf-8 -*-
+"""과제 제출 수 인덱스 (submission_counts)"""
+import json
+import threading
+import time
+
+from utils import data_utils
+from utils.data_utils import (SUBMISSION_COUNTS_FILE, SUBMISSIONS_FILE, append_many_to_json_list, find_items,
+                              get_submission_counts, invalidate_json_cache, load_member, thaw,
+                              transaction)
+
+
+def _submission(item_id, nickname, topic):
+    return {"id": item_id, "nickname": nickname, "topic": topic, "content": "...",
+            "submitted_at": "2026-10-18 10:00:00", "reviewed": False, "review_result": None}
+
+
+def test_missing_index_is_filled_from_submissions(storage, tmp_path):
+    # 기존 JSON 데이터 (SQLite 백엔드는 처음 읽을 때 가져옴)
+    (tmp_path / SUBMISSIONS_FILE).write_text(json.dumps([
+        _submission(1, "alice", "SRL"),
+        _submission(2, "alice", "SRL"),
+        _submission(3, "alice", "다이버전스"),
+        _submission(4, "bob", "SRL"),
+    ], ensure_ascii=False), encoding="utf-8")
+
+    assert dict(get_submission_counts("alice")) == {"SRL": 2, "다이버전스": 1}
+    # 채운 인덱스가 그대로 저장되어 있어야 함 (빈 값이 저장되면 안 됨)
+    invalidate_json_cache()
+    assert thaw(load_member(SUBMISSION_COUNTS_FILE, "alice")) == {"SRL": 2, "다이버전스": 1}
+    assert dict(get_submission_counts("bob")) == {"SRL": 1}
+
+
+def test_member_without_submissions_gets_empty_index(storage):
+    assert dict(get_submission_counts("nobody")) == {}
+
+
+def test_submit_in_transaction_counts_from_filled_index(storage):
+    append_many_to_json_list(SUBMISSIONS_FILE, [_submission(1, "alice", "SRL")])
+    counts = get_submission_counts("alice")
+
+    def count_submission(topic_counts):
+        topic_counts["SRL"] = topic_counts.get("SRL", 0) + 1
+
+    with transaction() as tx:
+        new_id = tx.next_id(SUBMISSIONS_FILE)
+        tx.append(SUBMISSIONS_FILE, _submission(new_id, "alice", "SRL"))
+        tx.update_member(SUBMISSION_COUNTS_FILE, "alice", count_submission, default=thaw(counts))
+
+    assert tx.committed
+    assert new_id == 2
+    invalidate_json_cache()
+    assert dict(get_submission_counts("alice")) == {"SRL": 2}
+
+
+def _submit(nickname, topic):
+    """app_pages/homework.py의 제출 순서 (인덱스를 채운 뒤 작업 단위로 커밋)"""
+    counts = get_submission_counts(nickname)
+
+    def count_submission(topic_counts):
+        topic_counts[topic] = topic_counts.get(topic, 0) + 1
+
+    with transaction() as tx:
+        tx.append(SUBMISSIONS_FILE, _submission(tx.next_id(SUBMISSIONS_FILE), nickname, topic))
+        tx.update_member(SUBMISSION_COUNTS_FILE, nickname, count_submission, default=thaw(counts))
+    assert tx.committed
+
+
+def test_concurrent_first_submits_are_all_counted(storage, tmp_path, monkeypatch):
+    # 인덱스가 없는 회원의 예전 제출 1건
+    (tmp_path / SUBMISSIONS_FILE).write_text(json.dumps([_submission(1, "alice", "SRL")]), encoding="utf-8")
+    # 세션 A가 인덱스를 채우는 저장을 세션 B가 끼어들 때까지 붙잡아 둠
+    b_started = threading.Event()
+    a_done = threading.Event()
+    calls = []
+    original = data_utils.update_member
+
+    def gated_update(filename, *args, **kwargs):
+        if filename != SUBMISSION_COUNTS_FILE:
+            return original(filename, *args, **kwargs)
+        calls.append(filename)
+        if len(calls) == 1:
+            b_started.wait(timeout=0.5)
+            try:
+                return original(filename, *args, **kwargs)
+            finally:
+                a_done.set()
+        b_started.set()
+        a_done.wait(timeout=0.5)
+        return original(filename, *args, **kwargs)
+
+    monkeypatch.setattr(data_utils, "update_member", gated_update)
+    session_a = threading.Thread(target=_submit, args=("alice", "SRL"))
+    session_a.start()
+    while not calls and session_a.is_alive():
+        time.sleep(0.01)
+    session_b = threading.Thread(target=_submit, args=("alice", "SRL"))
+    session_b.start()
+    session_a.join()
+    session_b.join()
+
+    invalidate_json_cache()
+    assert len(find_items(SUBMISSIONS_FILE, nickname="alice")) == 3
+    assert thaw(load_member(SUBMISSION_COUNTS_FILE, "alice")) == {"SRL": 3}
+
+
+def test_many_sessions_keep_index_in_step_with_submissions(storage):
+    topics = ["SRL", "다이버전스"]
+    threads = [threading.Thread(target=_submit, args=("alice", topics[i % 2])) for i in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    invalidate_json_cache()
+    assert len(find_items(SUBMISSIONS_FILE, nickname="alice")) == 8
+    assert thaw(load_member(SUBMISSION_COUNTS_FILE, "alice")) == {"SRL": 4, "다이버전스": 4}
@@ -0,0 +1,61 @@
+# -*- coding: utf-8 -*-
+"""비슷한 CS 티켓 묶기 (MinHash LSH)"""
+import pytest
+
+from utils import ticket_clusters
+from utils.data_utils import append_to_json_list, get_next_id
+from utils.ticket_clusters import TicketClusterIndex, assign_cluster, get_cluster_index, group_tickets
+
+
+@pytest.fixture
+def fresh_index(storage, monkeypatch):
+    """임시 저장소를 따라가는 새 프로세스 공용 색인"""
+    monkeypatch.setattr(ticket_clusters, "_index", TicketClusterIndex())
+
+
+def _create_ticket(query, status="open"):
+    """cs_chat의 create_ticket과 같은 순서 (클러스터를 정한 뒤 저장)"""
+    ticket_id = get_next_id("tickets.json")
+    ticket = {"id": ticket_id, "timestamp": f"2026-10-18 10:00:{ticket_id:02d}", "query": query,
+              "reason": "no_match", "status": status, "cluster_id": assign_cluster(ticket_id, query)}
+    assert append_to_json_list("tickets.json", ticket)
+    return ticket
+
+
+def test_similar_tickets_share_a_cluster(fresh_index):
+    first = _create_ticket("레버리지 몇 배까지 써도 되나요")
+    second = _create_ticket("레버리지 몇 배까지 써도 돼요")
+    other = _create_ticket("출금 신청은 어디서 하나요")
+
+    assert first["cluster_id"] == first["id"]
+    assert second["cluster_id"] == first["id"]
+    assert other["cluster_id"] == other["id"]
+
+    clusters = group_tickets([first, second, other])
+    assert [len(c.tickets) for c in clusters] == [2, 1]
+    assert clusters[0].query == first["query"]
+    assert clusters[0].open_count == 2
+
+
+def test_assign_cluster_does_not_index_unsaved_ticket(fresh_index):
+    saved = _create_ticket("손절가는 어떻게 정하나요")
+    # 저장에 실패한 티켓: 클러스터만 정하고 저장하지 않음
+    unsaved_id = saved["id"] + 1
+    assert assign_cluster(unsaved_id, "리스크 관리 원칙이 궁금해요") == unsaved_id
+
+    index = get_cluster_index()
+    assert len(index) == 1
+    assert index.cluster_of(saved["id"]) == saved["id"]
+    # 저장되지 않은 티켓은 다른 티켓의 대표가 되지 않음
+    retry = _create_ticket("리스크 관리 원칙이 궁금해요")
+    assert retry["cluster_id"] == retry["id"]
+    assert len(get_cluster_index()) == 2
+
+
+def test_index_catches_up_with_saved_cluster_ids(fresh_index):
+    append_to_json_list("tickets.json", {"id": 1, "query": "RSI 다이버전스가 뭔가요", "cluster_id": 1})
+    append_to_json_list("tickets.json", {"id": 2, "query": "완전히 다른 질문", "cluster_id": 1})
+    index = get_cluster_index()
+    # 저장된 cluster_id를 그대로 따름
+    assert index.cluster_of(2) == 1
+    assert index.classify(3, "RSI 다이버전스가 뭔가요") == 1
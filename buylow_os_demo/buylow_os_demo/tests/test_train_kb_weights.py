@@ -0,0 +1,111 @@
+# -*- coding: utf-8 -*-
+"""CS 검색 점수 가중치 학습 (tools/train_kb_weights.py)"""
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+from tools import train_kb_weights
+from utils import kb_index
+from utils.kb_index import DEFAULT_FIELD_WEIGHTS, KBIndex
+
+WEIGHTS_PATH = Path(__file__).resolve().parent.parent / "data" / "kb_weights.json"
+KB_PATH = Path(__file__).resolve().parent.parent / "data" / "kb.json"
+
+DOCS = [
+    {"id": 1, "title": "레버리지 사용 원칙", "keywords": ["레버리지", "배율"]},
+    {"id": 2, "title": "포지션 크기", "keywords": ["비중", "분할 매수"]},
+]
+# 1번 문서의 "배율"도, 2번 문서의 "비중"도 키워드 구문 10점이라 동점
+TIED_QUERY = "배율이랑 비중"
+
+
+def _history(samples=30):
+    """'배율'로 찾은 답은 늘 티켓으로 이어지고, '비중'과 '레버리지'로 찾은 답은 해결됨"""
+    events, tickets = [], []
+    for i in range(samples):
+        day = f"2026-10-{1 + i % 28:02d}"
+        events.append({"timestamp": f"{day} 09:00:00", "type": "cs_query", "query": f"배율 질문 {i}",
+                       "matched_doc_id": 1, "score": 10})
+        tickets.append({"id": i + 1, "timestamp": f"{day} 09:05:00", "query": f"배율 질문 {i}",
+                        "status": "open"})
+        events.append({"timestamp": f"{day} 10:00:00", "type": "cs_query", "query": f"레버리지 질문 {i}",
+                       "matched_doc_id": 1, "score": 15})
+        events.append({"timestamp": f"{day} 11:00:00", "type": "cs_query", "query": f"비중 질문 {i}",
+                       "matched_doc_id": 2, "score": 10})
+    return events, tickets
+
+
+def test_dataset_labels_ticketed_answers_as_unresolved():
+    events, tickets = _history(samples=25)
+    data = train_kb_weights.build_dataset(KBIndex(DOCS), events, tickets)
+    assert data.features.shape == (75, len(train_kb_weights.FIELDS) + 3)
+    assert data.keywords == ["레버리지", "배율", "비중"]
+    assert data.labels.sum() == 50
+    # 티켓이 만들어진 질문은 모두 '배율' 열이 켜짐
+    column = len(train_kb_weights.FIELDS) + data.keywords.index("배율")
+    assert set(data.features[data.labels == 0, column]) == {1.0}
+
+
+def test_learned_weights_change_ranking(json_storage, tmp_path, monkeypatch):
+    events, tickets = _history()
+    (tmp_path / "kb.json").write_text(json.dumps(DOCS, ensure_ascii=False), encoding="utf-8")
+    (tmp_path / "logs.json").write_text(json.dumps(events, ensure_ascii=False), encoding="utf-8")
+    (tmp_path / "tickets.json").write_text(json.dumps(tickets, ensure_ascii=False), encoding="utf-8")
+    monkeypatch.setattr(sys, "argv", ["train_kb_weights"])
+    train_kb_weights.main()
+
+    weights = json.loads((tmp_path / "kb_weights.json").read_text(encoding="utf-8"))
+    # 키워드 구문 점수는 10점으로 고정, 키워드별 배율은 범위 안
+    assert weights["fields"]["keyword_phrase"] == 10
+    low, high = train_kb_weights.KEYWORD_SCALE_RANGE
+    assert low <= weights["keywords"]["배율"] < 1.0 < weights["keywords"]["비중"] <= high
+
+    # KB 인덱스는 데이터 폴더의 가중치를 읽음
+    default = KBIndex(DOCS)
+    trained = kb_index._build_index(None)
+    assert default.scores(TIED_QUERY) == {0: 10, 1: 10}
+    scores = trained.scores(TIED_QUERY)
+    assert scores[1] > 10 > scores[0]
+    assert trained.match(TIED_QUERY)[0]["id"] == 2
+
+
+def test_dry_run_does_not_save(json_storage, tmp_path, monkeypatch):
+    events, tickets = _history()
+    (tmp_path / "kb.json").write_text(json.dumps(DOCS, ensure_ascii=False), encoding="utf-8")
+    (tmp_path / "logs.json").write_text(json.dumps(events, ensure_ascii=False), encoding="utf-8")
+    (tmp_path / "tickets.json").write_text(json.dumps(tickets, ensure_ascii=False), encoding="utf-8")
+    monkeypatch.setattr(sys, "argv", ["train_kb_weights", "--dry-run"])
+    train_kb_weights.main()
+    assert not (tmp_path / "kb_weights.json").exists()
+
+
+def test_to_weights_needs_positive_keyword_phrase_coefficient():
+    assert train_kb_weights.to_weights(train_kb_weights.np.array([-1.0, 1.0, 1.0, 1.0]), []) is None
+    assert train_kb_weights.to_weights(train_kb_weights.np.array([2.0, 0.6, 3.0, -1.0]), []) == {
+        "fields": {"keyword_phrase": 10.0, "keyword_word": 3.0, "title_phrase": 15.0, "title_word": 0.0},
+        "keywords": {},
+    }
+
+
+def test_committed_empty_weights_keep_default_scores():
+    weights = json.loads(WEIGHTS_PATH.read_text(encoding="utf-8"))
+    assert weights == {}
+    docs = json.loads(KB_PATH.read_text(encoding="utf-8"))
+    shipped, default = KBIndex(docs, weights=weights), KBIndex(docs)
+    assert shipped.field_weights == DEFAULT_FIELD_WEIGHTS == {
+        "keyword_phrase": 10, "keyword_word": 3, "title_phrase": 15, "title_word": 5}
+    for query in ["레버리지 몇 배까지", "손절 어떻게 정해요", "RSI 다이버전스가 뭔가요?", "리스크 관리"]:
+        assert shipped.scores(query) == default.scores(query)
+
+
+@pytest.mark.parametrize("field, query, score", [
+    ("keyword_phrase", "배율", 10),
+    ("keyword_word", "분할", 3),
+    ("title_phrase", "포지션 크기", 15),
+    ("title_word", "포지션", 5),
+])
+def test_default_rule_scores(field, query, score):
+    assert DEFAULT_FIELD_WEIGHTS[field] == score
+    assert max(KBIndex(DOCS).scores(query).values()) == score
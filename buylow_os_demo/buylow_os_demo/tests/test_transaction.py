@@ -0,0 +1,78 @@
+# -*- coding: utf-8 -*-
+"""작업 단위 (transaction)"""
+import pytest
+
+from utils.data_utils import invalidate_json_cache, load_json, load_member, save_json, transaction
+
+SUBMISSIONS = "homework_submissions.json"
+PROFILES = "member_profiles.json"
+
+
+def test_changes_are_applied_together(storage):
+    save_json("announcements.json", [{"id": 1}])
+
+    with transaction() as tx:
+        new_id = tx.next_id(SUBMISSIONS)
+        tx.append(SUBMISSIONS, {"id": new_id, "nickname": "alice", "topic": "SRL"})
+        tx.update_member(PROFILES, "alice", lambda p: p.update(homework_count=p.get("homework_count", 0) + 1),
+                         default={"nickname": "alice"})
+        tx.save_member("unlocks.json", "alice", {"srl_lesson": True})
+        tx.save("announcements.json", [{"id": 1}, {"id": 2}])
+        # 커밋 전에는 아무것도 보이지 않음
+        assert load_json(SUBMISSIONS, readonly=True) == ()
+        assert load_member(PROFILES, "alice") is None
+
+    assert tx.committed
+    invalidate_json_cache()
+    assert [s["id"] for s in load_json(SUBMISSIONS, readonly=True)] == [new_id]
+    assert load_member(PROFILES, "alice") == {"nickname": "alice", "homework_count": 1}
+    assert load_member("unlocks.json", "alice") == {"srl_lesson": True}
+    assert [a["id"] for a in load_json("announcements.json", readonly=True)] == [1, 2]
+
+
+def test_exception_discards_all_changes(storage):
+    with pytest.raises(RuntimeError):
+        with transaction() as tx:
+            tx.append(SUBMISSIONS, {"id": tx.next_id(SUBMISSIONS), "nickname": "alice"})
+            tx.save_member(PROFILES, "alice", {"homework_count": 1})
+            raise RuntimeError("검증 실패")
+
+    assert not tx.committed
+    assert load_json(SUBMISSIONS, readonly=True) == ()
+    assert load_member(PROFILES, "alice") is None
+
+
+def test_failing_update_rolls_back_earlier_operations(storage):
+    def broken(profile):
+        raise ValueError("bad profile")
+
+    tx = transaction()
+    tx.append(SUBMISSIONS, {"id": 1, "nickname": "alice"})
+    tx.save_member("unlocks.json", "alice", {"srl_lesson": True})
+    tx.update_member(PROFILES, "alice", broken, default={})
+    assert tx.commit() is False
+
+    assert not tx.committed
+    invalidate_json_cache()
+    assert load_json(SUBMISSIONS, readonly=True) == ()
+    assert load_member("unlocks.json", "alice") is None
+
+
+def test_update_sees_value_from_same_transaction(storage):
+    with transaction() as tx:
+        tx.save_member(PROFILES, "alice", {"homework_count": 5})
+        tx.update_member(PROFILES, "alice", lambda p: p.update(homework_count=p["homework_count"] + 1))
+
+    assert load_member(PROFILES, "alice") == {"homework_count": 6}
+
+
+def test_unused_id_is_skipped(storage):
+    with transaction() as tx:
+        skipped = tx.next_id(SUBMISSIONS)
+        tx.rollback()
+    with transaction() as tx:
+        used = tx.next_id(SUBMISSIONS)
+        tx.append(SUBMISSIONS, {"id": used})
+
+    assert used == skipped + 1
+    assert [s["id"] for s in load_json(SUBMISSIONS, readonly=True)] == [used]
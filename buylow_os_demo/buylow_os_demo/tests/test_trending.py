@@ -0,0 +1,109 @@
+# -*- coding: utf-8 -*-
+"""인기 검색어 (시간 감쇠 Space-Saving)"""
+from datetime import datetime, timedelta
+
+import pytest
+
+from utils import trending
+from utils.kb_index import KBIndex
+from utils.trending import HALF_LIFE, TIMESTAMP_FORMAT, SpaceSaving, TrendingTerms, query_terms, trending_terms
+
+DAY = 24 * 3600
+T0 = 1_800_000_000.0
+
+DOCS = [
+    {"id": 1, "title": "손절가 설정 방법", "keywords": ["손절", "손절가", "스탑로스"]},
+    {"id": 2, "title": "RSI 지표 기초", "keywords": ["RSI", "과매수"]},
+    {"id": 3, "title": "레버리지 사용 원칙", "keywords": ["레버리지"]},
+]
+
+
+@pytest.fixture
+def kb(monkeypatch):
+    """전역 KB 서비스 대신 작은 인덱스"""
+    monkeypatch.setattr(trending, "get_kb_index", lambda: KBIndex(DOCS))
+
+
+def _query(text, when):
+    return {"type": "cs_query", "query": text, "timestamp": when.strftime(TIMESTAMP_FORMAT)}
+
+
+def test_counts_decay_by_half_life():
+    tracker = SpaceSaving(capacity=4, half_life=DAY)
+    tracker.add("rsi", now=T0)
+    tracker.add("rsi", now=T0)
+    tracker.add("손절", now=T0 + DAY)
+    assert tracker.top(2, now=T0 + DAY) == [("rsi", pytest.approx(1.0)), ("손절", pytest.approx(1.0))]
+    # 하루 더 지나면 둘 다 절반
+    assert dict(tracker.top(2, now=T0 + 2 * DAY)) == {"rsi": pytest.approx(0.5), "손절": pytest.approx(0.5)}
+
+
+def test_recent_term_outranks_older_heavier_term():
+    tracker = SpaceSaving(capacity=4, half_life=DAY)
+    for _ in range(3):
+        tracker.add("old", now=T0)
+    for _ in range(2):
+        tracker.add("new", now=T0 + 2 * DAY)
+    assert [term for term, _ in tracker.top(2, now=T0 + 2 * DAY)] == ["new", "old"]
+
+
+def test_full_tracker_hands_smallest_counter_to_new_term():
+    tracker = SpaceSaving(capacity=2, half_life=DAY)
+    tracker.add("a", count=5, now=T0)
+    tracker.add("b", count=1, now=T0)
+    tracker.add("c", now=T0)
+    assert len(tracker) == 2
+    assert "b" not in tracker
+    # 넘겨받은 값만큼 과대평가됨 (1 + 1)
+    assert tracker.top(2, now=T0) == [("a", pytest.approx(5.0)), ("c", pytest.approx(2.0))]
+
+
+def test_top_ties_are_sorted_by_term_and_limited():
+    tracker = SpaceSaving(capacity=8, half_life=DAY)
+    for term in ["c", "a", "b"]:
+        tracker.add(term, now=T0)
+    assert [term for term, _ in tracker.top(2, now=T0)] == ["a", "b"]
+    assert tracker.top(0, now=T0) == []
+    assert SpaceSaving().top(3, now=T0) == []
+
+
+def test_long_running_tracker_rebases_weights():
+    tracker = SpaceSaving(capacity=4, half_life=1.0)
+    tracker.add("a", now=T0)
+    tracker.add("a", now=T0 + 100)
+    assert tracker.top(1, now=T0 + 100) == [("a", pytest.approx(1.0))]
+    assert tracker.top(1, now=T0 + 101) == [("a", pytest.approx(0.5))]
+
+
+def test_query_terms_drop_keywords_inside_longer_ones(kb):
+    assert query_terms("손절가 설정은?") == ["손절가"]
+    assert sorted(query_terms("rsi 과매수에서 레버리지")) == ["RSI", "과매수", "레버리지"]
+    assert query_terms("상관없는 질문") == []
+
+
+def test_add_events_counts_cs_queries_with_kb_spelling(kb):
+    now = datetime.now()
+    terms = TrendingTerms(capacity=8)
+    terms.add_events([
+        _query("rsi 보는 법", now),
+        _query("RSI 다이버전스", now),
+        _query("레버리지 몇 배", now),
+        {"type": "quiz", "query": "rsi", "timestamp": now.strftime(TIMESTAMP_FORMAT)},
+        {"type": "cs_query", "query": "", "timestamp": now.strftime(TIMESTAMP_FORMAT)},
+    ])
+    top = terms.top(5)
+    assert [term for term, _ in top] == ["RSI", "레버리지"]
+    assert top[0][1] == pytest.approx(2.0, rel=1e-3)
+
+
+def test_trending_terms_falls_back_to_defaults(kb, monkeypatch):
+    now = datetime.now()
+    terms = TrendingTerms()
+    terms.add_events([_query("레버리지", now), _query("레버리지", now),
+                      _query("스탑로스", now - timedelta(seconds=10 * HALF_LIFE))])
+    monkeypatch.setattr(trending, "_trending", terms)
+
+    # 오래된 "스탑로스"는 0.5회 미만으로 줄어 빠지고, 기본 키워드로 채움 (중복 제외)
+    assert trending_terms(3, ["레버리지", "손절", "RSI"]) == ["레버리지", "손절", "RSI"]
+    assert trending_terms(1, ["손절"]) == ["레버리지"]
+    assert trending_terms(2) == ["레버리지"]
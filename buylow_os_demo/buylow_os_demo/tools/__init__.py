@@ -0,0 +1,4 @@
+# -*- coding: utf-8 -*-
+"""
+BuyLow OS - 개발용 도구 (앱 실행에는 필요하지 않음)
+"""
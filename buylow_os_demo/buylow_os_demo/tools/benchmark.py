@@ -0,0 +1,161 @@
+# -*- coding: utf-8 -*-
+"""
+BuyLow OS - 저장소 벤치마크
+
+합성 데이터(tools/synthetic_data.py)를 임시 폴더에 만든 뒤
+load_json, save_json, append_to_json_list, get_next_id의 소요 시간(p50/p99)과
+최대 메모리 사용량을 파일별로 측정합니다.
+
+    python -m tools.benchmark --scale medium
+    python -m tools.benchmark --scale production --backend sqlite
+    python -m tools.benchmark --scale production --format compact --files logs.json tickets.json
+
+측정 항목:
+- load (cold): 캐시를 비운 뒤 load_json (디스크에서 읽고 파싱)
+- load (warm): 캐시가 살아 있는 load_json (수정 가능한 사본)
+- load (readonly): 캐시가 살아 있는 load_json(readonly=True)
+- save: save_json으로 전체 저장
+- append: append_to_json_list로 한 항목 추가 (리스트 파일만)
+- next_id: get_next_id (id가 있는 리스트 파일만)
+"""
+import argparse
+import math
+import os
+import shutil
+import tempfile
+import time
+import tracemalloc
+from typing import Any, Callable, List, NamedTuple, Optional
+
+from tools.synthetic_data import SCALES, generate, write_dataset
+
+
+class Result(NamedTuple):
+    """측정 결과 한 줄"""
+    filename: str
+    operation: str
+    count: int
+    p50_ms: float
+    p99_ms: float
+    peak_mb: float
+
+
+def percentile(samples: List[float], pct: float) -> float:
+    """nearest-rank 백분위수"""
+    ordered = sorted(samples)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def measure(fn: Callable[[], Any], repeat: int, setup: Optional[Callable[[], None]] = None) -> tuple:
+    """
+    fn을 repeat번 실행해 소요 시간을 재고, 한 번 더 실행해 최대 메모리를 잽니다.
+
+    Returns:
+        (p50 ms, p99 ms, peak MB)
+    """
+    samples = []
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        started = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - started) * 1000)
+
+    # tracemalloc은 실행을 느리게 하므로 시간 측정과 분리
+    if setup is not None:
+        setup()
+    tracemalloc.start()
+    try:
+        fn()
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return percentile(samples, 50), percentile(samples, 99), peak / (1024 * 1024)
+
+
+def _sample_item(data: Any) -> Optional[dict]:
+    if isinstance(data, list) and data and isinstance(data[-1], dict):
+        return dict(data[-1])
+    return None
+
+
+def bench_file(filename: str, repeat: int, save_repeat: int) -> List[Result]:
+    """파일 하나에 대한 측정 결과"""
+    from utils import data_utils
+
+    data = data_utils.load_json(filename)
+    count = len(data)
+
+    def invalidate():
+        data_utils.invalidate_json_cache(filename)
+
+    cases = [
+        ("load (cold)", lambda: data_utils.load_json(filename), repeat, invalidate),
+        ("load (warm)", lambda: data_utils.load_json(filename), repeat, None),
+        ("load (readonly)", lambda: data_utils.load_json(filename, readonly=True), repeat, None),
+        ("save", lambda: data_utils.save_json(filename, data), save_repeat, None),
+    ]
+    item = _sample_item(data)
+    if item is not None:
+        cases.append(("append", lambda: data_utils.append_to_json_list(filename, item), repeat, None))
+        if "id" in item:
+            cases.append(("next_id", lambda: data_utils.get_next_id(filename), repeat, None))
+
+    results = []
+    for operation, fn, times, setup in cases:
+        p50, p99, peak = measure(fn, times, setup)
+        results.append(Result(filename, operation, count, p50, p99, peak))
+    return results
+
+
+def format_table(results: List[Result]) -> str:
+    header = f"{'file':<28}{'operation':<18}{'items':>10}{'p50 ms':>12}{'p99 ms':>12}{'peak MB':>10}"
+    lines = [header, "-" * len(header)]
+    for r in results:
+        lines.append(f"{r.filename:<28}{r.operation:<18}{r.count:>10,}{r.p50_ms:>12.3f}{r.p99_ms:>12.3f}{r.peak_mb:>10.2f}")
+    return "\n".join(lines)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="BuyLow OS 저장소 벤치마크")
+    parser.add_argument("--scale", choices=sorted(SCALES), default="small")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--backend", choices=["json", "sqlite"], default="json")
+    parser.add_argument("--format", choices=["pretty", "compact", "binary"], default=None,
+                        help="JSON 파일 저장 형식 (기본: BUYLOW_STORAGE_FORMAT 또는 pretty)")
+    parser.add_argument("--files", nargs="*", default=None, help="측정할 파일 (기본: DATA_FILES 전체)")
+    parser.add_argument("--repeat", type=int, default=20, help="읽기/추가 반복 횟수")
+    parser.add_argument("--save-repeat", type=int, default=5, help="전체 저장 반복 횟수")
+    parser.add_argument("--data-dir", default=None, help="합성 데이터를 만들 폴더 (지정하면 끝난 뒤에도 남김, 기본: 임시 폴더)")
+    args = parser.parse_args()
+
+    data_dir = args.data_dir or tempfile.mkdtemp(prefix="buylow_bench_")
+    os.environ["BUYLOW_DATA_DIR"] = os.path.abspath(data_dir)
+    os.environ["BUYLOW_STORAGE_BACKEND"] = args.backend
+    if args.format:
+        os.environ["BUYLOW_STORAGE_FORMAT"] = args.format
+
+    from utils import data_utils
+
+    try:
+        scale = SCALES[args.scale]
+        started = time.perf_counter()
+        write_dataset(generate(scale, args.seed))
+        data_utils.invalidate_json_cache()
+        print(f"데이터 생성: {args.scale} {scale} ({time.perf_counter() - started:.1f}초)")
+        print(f"백엔드: {data_utils.get_storage_backend().name}, 형식: {data_utils.get_storage_format()}")
+        print()
+
+        results: List[Result] = []
+        for filename in args.files or list(data_utils.DATA_FILES):
+            results.extend(bench_file(filename, args.repeat, args.save_repeat))
+        print(format_table(results))
+    finally:
+        data_utils.get_storage_backend().close()
+        if args.data_dir is None:
+            shutil.rmtree(data_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,207 @@
+# -*- coding: utf-8 -*-
+"""
+BuyLow OS - CS 검색 재현(replay) 도구
+
+logs.json에 기록된 cs_query를 한 건씩 읽어(전체를 메모리에 올리지 않음)
+현재 검색기 또는 후보 검색기로 다시 검색하고, 기록된 결과와 비교합니다.
+
+    python -m tools.replay_cs
+    python -m tools.replay_cs --since 2026-01-01 --show 20
+    python -m tools.replay_cs --kb /tmp/kb_candidate.json
+    python -m tools.replay_cs --weights /tmp/kb_weights_candidate.json
+    python -m tools.replay_cs --matcher mypkg.matcher:match --data-dir /tmp/buylow_data
+
+보고 항목:
+- 해결률(10점 이상) / 부분 매칭률(5~9점): 기록 vs 재현
+- 점수 분포: 기록 vs 재현
+- 답변이 바뀐 질문 수와 판정(해결/부분/실패) 변화, 예시
+- 질문당 검색 시간 p50/p90/p99/최대
+
+후보 검색기(--matcher)는 질문 문자열을 받아 (문서 또는 None, 점수)를
+반환하는 함수입니다 ("모듈:함수" 형식).
+"""
+import argparse
+import importlib
+import json
+import os
+import time
+from collections import Counter
+from typing import Any, Callable, List, Optional, Tuple
+
+from tools.benchmark import percentile
+
+RESOLVED_SCORE = 10
+PARTIAL_SCORE = 5
+
+# 점수 분포 구간 (하한)
+SCORE_BUCKETS = [0, 1, 5, 10, 15, 25]
+
+Matcher = Callable[[str], Tuple[Optional[Any], int]]
+
+
+def outcome(score: int) -> str:
+    """cs_chat과 같은 기준의 판정"""
+    if score >= RESOLVED_SCORE:
+        return "해결"
+    if score >= PARTIAL_SCORE:
+        return "부분"
+    return "실패"
+
+
+def bucket_label(score: int) -> str:
+    lower = max(b for b in SCORE_BUCKETS if b <= max(score, 0))
+    index = SCORE_BUCKETS.index(lower)
+    if index + 1 < len(SCORE_BUCKETS):
+        return f"{lower}-{SCORE_BUCKETS[index + 1] - 1}"
+    return f"{lower}+"
+
+
+def load_matcher(spec: Optional[str], kb_path: Optional[str], weights_path: Optional[str] = None) -> Matcher:
+    """
+    재현에 쓸 검색기를 만듭니다.
+
+    Args:
+        spec: "모듈:함수" (None이면 현재 KB 인덱스)
+        kb_path: 후보 kb.json 경로 (현재 검색기를 이 KB로 실행)
+        weights_path: 후보 점수 가중치 경로 (tools/train_kb_weights.py 형식)
+    """
+    if spec:
+        module_name, _, attr = spec.partition(":")
+        return getattr(importlib.import_module(module_name), attr or "match")
+
+    from utils.data_utils import load_json
+    from utils.kb_index import KB_FILE, WEIGHTS_FILE, KBIndex, get_kb_index
+
+    if kb_path or weights_path:
+        docs = _read_json(kb_path) if kb_path else load_json(KB_FILE, default=[], readonly=True)
+        weights = _read_json(weights_path) if weights_path else load_json(WEIGHTS_FILE, default={}, readonly=True)
+        index = KBIndex(docs, weights=weights)
+    else:
+        index = get_kb_index()
+    # 결과 캐시를 거치지 않아야 검색 시간을 제대로 잴 수 있음
+    return index.match
+
+
+def _read_json(path: str) -> Any:
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+class ReplayReport:
+    """재현 결과 집계"""
+
+    def __init__(self, show: int):
+        self.show = show
+        self.total = 0
+        self.logged_scores: Counter = Counter()
+        self.replayed_scores: Counter = Counter()
+        self.logged_outcomes: Counter = Counter()
+        self.replayed_outcomes: Counter = Counter()
+        self.transitions: Counter = Counter()
+        self.changed = 0
+        self.examples: List[Tuple[str, Any, Any, int, int]] = []
+        self.latencies_ms: List[float] = []
+
+    def add(self, event: dict, doc: Optional[Any], score: int, elapsed_ms: float) -> None:
+        logged_score = event.get("score") or 0
+        logged_id = event.get("matched_doc_id")
+        replayed_id = doc.get("id") if doc is not None else None
+
+        self.total += 1
+        self.latencies_ms.append(elapsed_ms)
+        self.logged_scores[bucket_label(logged_score)] += 1
+        self.replayed_scores[bucket_label(score)] += 1
+        self.logged_outcomes[outcome(logged_score)] += 1
+        self.replayed_outcomes[outcome(score)] += 1
+
+        if logged_id != replayed_id:
+            self.changed += 1
+            self.transitions[(outcome(logged_score), outcome(score))] += 1
+            if len(self.examples) < self.show:
+                new_title = doc.get("title") if doc is not None else None
+                self.examples.append((event.get("query", ""), event.get("matched_title"), new_title,
+                                      logged_score, score))
+
+    def _rate(self, counter: Counter, key: str) -> str:
+        return f"{counter[key] / self.total * 100:6.1f}%" if self.total else "     -"
+
+    def format(self) -> str:
+        lines = [f"재현한 질문: {self.total:,}건", ""]
+        if not self.total:
+            return "\n".join(lines)
+
+        lines.append(f"{'':<12}{'기록':>10}{'재현':>10}")
+        for key, label in (("해결", "해결률"), ("부분", "부분 매칭률"), ("실패", "실패율")):
+            lines.append(f"{label:<12}{self._rate(self.logged_outcomes, key):>10}"
+                         f"{self._rate(self.replayed_outcomes, key):>10}")
+
+        lines += ["", "점수 분포", f"{'구간':<12}{'기록':>10}{'재현':>10}"]
+        for lower in SCORE_BUCKETS:
+            label = bucket_label(lower)
+            lines.append(f"{label:<12}{self.logged_scores[label]:>10,}{self.replayed_scores[label]:>10,}")
+
+        lines += ["", f"답변이 바뀐 질문: {self.changed:,}건 ({self.changed / self.total * 100:.1f}%)"]
+        for (before, after), count in self.transitions.most_common():
+            lines.append(f"  {before} -> {after}: {count:,}건")
+        for query, old_title, new_title, old_score, new_score in self.examples:
+            lines.append(f"  - {query!r}: {old_title} ({old_score}) -> {new_title} ({new_score})")
+
+        lines += ["", "검색 시간 (ms)"]
+        for pct in (50, 90, 99):
+            lines.append(f"  p{pct:<4}{percentile(self.latencies_ms, pct):10.3f}")
+        lines.append(f"  max  {max(self.latencies_ms):10.3f}")
+        return "\n".join(lines)
+
+
+def replay(matcher: Matcher, since: Optional[str] = None, limit: Optional[int] = None,
+           show: int = 10) -> ReplayReport:
+    """
+    logs.json의 cs_query를 스트리밍하며 다시 검색합니다.
+
+    Args:
+        matcher: 질문 -> (문서, 점수)
+        since: 이 날짜('YYYY-MM-DD') 이후의 질문만
+        limit: 최대 질문 수
+        show: 보고서에 넣을 변경 예시 수
+    """
+    from utils.data_utils import iter_events
+
+    report = ReplayReport(show)
+    for event in iter_events("logs.json"):
+        if event.get("type") != "cs_query" or not event.get("query"):
+            continue
+        if since and str(event.get("timestamp", "")) < since:
+            continue
+        started = time.perf_counter()
+        doc, score = matcher(event["query"])
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        report.add(event, doc, score, elapsed_ms)
+        if limit is not None and report.total >= limit:
+            break
+    return report
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="BuyLow OS CS 검색 재현")
+    parser.add_argument("--matcher", default=None, help="후보 검색기 '모듈:함수' (기본: 현재 KB 인덱스)")
+    parser.add_argument("--kb", default=None, help="후보 kb.json 경로 (현재 검색기를 이 KB로 실행)")
+    parser.add_argument("--weights", default=None, help="후보 점수 가중치 JSON 경로 (기본: 저장된 kb_weights.json)")
+    parser.add_argument("--since", default=None, help="이 날짜(YYYY-MM-DD) 이후의 질문만")
+    parser.add_argument("--limit", type=int, default=None, help="최대 질문 수")
+    parser.add_argument("--show", type=int, default=10, help="답변이 바뀐 질문 예시 수")
+    parser.add_argument("--data-dir", default=None, help="데이터 폴더 (기본: 앱의 data/ 또는 BUYLOW_DATA_DIR)")
+    args = parser.parse_args()
+
+    if args.data_dir:
+        os.environ["BUYLOW_DATA_DIR"] = os.path.abspath(args.data_dir)
+
+    matcher = load_matcher(args.matcher, args.kb, args.weights)
+    started = time.perf_counter()
+    report = replay(matcher, args.since, args.limit, args.show)
+    print(report.format())
+    print()
+    print(f"소요 시간: {time.perf_counter() - started:.1f}초")
+
+
+if __name__ == "__main__":
+    main()
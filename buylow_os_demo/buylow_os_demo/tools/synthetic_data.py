@@ -0,0 +1,299 @@
+# -*- coding: utf-8 -*-
+"""
+BuyLow OS - 합성 데이터 생성기
+
+DATA_FILES의 모든 파일을 원하는 규모로 만들어 냅니다.
+같은 시드와 규모면 항상 같은 데이터가 나옵니다 (벤치마크 재현용).
+
+    python -m tools.synthetic_data --scale production --data-dir /tmp/buylow_data
+
+--data-dir로 지정한 폴더에 현재 저장소 백엔드/저장 형식으로 기록합니다.
+앱의 data/ 폴더를 덮어쓰지 않도록 반드시 다른 폴더를 지정하세요.
+"""
+import argparse
+import os
+import random
+import time
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, NamedTuple
+
+
+class Scale(NamedTuple):
+    """생성할 데이터 규모"""
+    members: int
+    logs: int
+    tickets: int
+    submissions: int
+    kb_entries: int
+    announcements: int
+    days: int
+
+
+SCALES: Dict[str, Scale] = {
+    "small": Scale(members=200, logs=5_000, tickets=300, submissions=1_000,
+                   kb_entries=40, announcements=20, days=30),
+    "medium": Scale(members=2_000, logs=50_000, tickets=3_000, submissions=10_000,
+                    kb_entries=100, announcements=50, days=90),
+    "production": Scale(members=20_000, logs=300_000, tickets=20_000, submissions=60_000,
+                        kb_entries=300, announcements=200, days=180),
+}
+
+# 기간의 마지막 날 (고정값이어야 같은 시드로 같은 데이터가 나옴)
+END_DATE = datetime(2026, 1, 31, 23, 59, 59)
+
+TOPICS = ["다이버전스", "지지저항", "SRL", "아래꼬리"]
+LESSON_KEYS = [
+    "divergence_lesson", "divergence_advanced", "support_resistance_lesson", "support_resistance_advanced",
+    "srl_lesson", "srl_advanced", "tail_candle_lesson", "tail_candle_advanced",
+]
+KEYWORDS = [
+    "RSI", "다이버전스", "지지", "저항", "SRL", "아래꼬리", "손절", "익절", "레버리지", "포지션",
+    "비중", "캔들", "추세선", "볼린저밴드", "이동평균", "거래량", "멤버십", "환불", "텔레그램", "과제",
+]
+QUERY_TEMPLATES = [
+    "{kw}가 뭔가요?", "{kw} 어떻게 설정하나요", "{kw} 기준 알려주세요", "{kw}", "{kw}랑 {kw2} 차이",
+    "{kw} 초보자 팁", "{kw} 언제 쓰나요?",
+]
+RISK_WARNINGS = ["손절가 미설정", "과도한 레버리지", "과도한 포지션 비중", "감정적 진입", "손익비 불량"]
+EMOTIONS = ["평온", "불안", "확신", "조급", "복수심"]
+
+
+def _timestamp(rng: random.Random, days: int) -> str:
+    moment = END_DATE - timedelta(seconds=rng.randrange(days * 86400))
+    return moment.strftime("%Y-%m-%d %H:%M:%S")
+
+
+def _sentence(rng: random.Random, words: int) -> str:
+    return " ".join(rng.choice(KEYWORDS) + rng.choice(["은", "는", "을", "를", "에서", "과", ""])
+                    for _ in range(words)) + "."
+
+
+def _members(scale: Scale) -> List[str]:
+    return [f"trader_{i:05d}" for i in range(scale.members)]
+
+
+def make_kb(rng: random.Random, scale: Scale) -> List[dict]:
+    entries = []
+    for i in range(1, scale.kb_entries + 1):
+        keywords = rng.sample(KEYWORDS, 4)
+        entries.append({
+            "id": i,
+            "intent": f"intent_{i}",
+            "title": f"{keywords[0]} 가이드 {i}",
+            "keywords": keywords,
+            "short_answer": _sentence(rng, 8),
+            "detailed_answer": "\n".join(_sentence(rng, 12) for _ in range(5)),
+            "next_actions": rng.sample(KEYWORDS, 2),
+        })
+    return entries
+
+
+def make_logs(rng: random.Random, scale: Scale, kb: List[dict]) -> List[dict]:
+    logs = []
+    for _ in range(scale.logs):
+        timestamp = _timestamp(rng, scale.days)
+        kind = rng.random()
+        if kind < 0.6:
+            kw, kw2 = rng.sample(KEYWORDS, 2)
+            doc = rng.choice(kb) if rng.random() < 0.8 else None
+            logs.append({
+                "timestamp": timestamp, "type": "cs_query",
+                "query": rng.choice(QUERY_TEMPLATES).format(kw=kw, kw2=kw2),
+                "matched_doc_id": doc["id"] if doc else None,
+                "matched_title": doc["title"] if doc else None,
+                "score": rng.randrange(0, 30) if doc else 0,
+            })
+        elif kind < 0.8:
+            total = 8
+            score = rng.randrange(total + 1)
+            logs.append({
+                "timestamp": timestamp, "type": "quiz_result", "score": score, "total": total,
+                "percentage": round(score / total * 100, 1),
+                "recommendations": rng.sample(KEYWORDS, 3),
+            })
+        else:
+            violations = rng.randrange(4)
+            logs.append({
+                "timestamp": timestamp, "type": "risk_check",
+                "symbol": rng.choice(["BTC", "ETH", "SOL", "XRP"]),
+                "direction": rng.choice(["Long (매수)", "Short (매도)"]),
+                "leverage": rng.choice([1, 2, 3, 5, 10, 20, 50]),
+                "position_size": rng.randrange(1, 101),
+                "risk_score": min(violations * 25, 100),
+                "violation_count": violations,
+            })
+    logs.sort(key=lambda item: item["timestamp"])
+    return logs
+
+
+def make_tickets(rng: random.Random, scale: Scale) -> List[dict]:
+    tickets = []
+    for i in range(1, scale.tickets + 1):
+        kw, kw2 = rng.sample(KEYWORDS, 2)
+        tickets.append({
+            "id": i,
+            "timestamp": _timestamp(rng, scale.days),
+            "query": rng.choice(QUERY_TEMPLATES).format(kw=kw, kw2=kw2),
+            "reason": rng.choice(["매칭 실패", "사용자 요청", "낮은 점수"]),
+            "status": "open" if rng.random() < 0.3 else "resolved",
+        })
+    tickets.sort(key=lambda item: item["timestamp"])
+    return tickets
+
+
+def make_announcements(rng: random.Random, scale: Scale) -> List[dict]:
+    return [{
+        "id": i,
+        "title": f"{rng.choice(KEYWORDS)} 공지 {i}",
+        "tag": rng.choice(["멤버십 안내", "교육 일정", "시스템"]),
+        "content": "\n".join(_sentence(rng, 10) for _ in range(3)),
+        "pinned": rng.random() < 0.05,
+        "created_at": _timestamp(rng, scale.days),
+        "related_faq": rng.sample(KEYWORDS, 2),
+    } for i in range(1, scale.announcements + 1)]
+
+
+def make_submissions(rng: random.Random, scale: Scale, members: List[str]) -> List[dict]:
+    submissions = []
+    for i in range(1, scale.submissions + 1):
+        reviewed = rng.random() < 0.5
+        submissions.append({
+            "id": i,
+            "nickname": rng.choice(members),
+            "topic": rng.choice(TOPICS),
+            "content": " ".join(_sentence(rng, 10) for _ in range(3)),
+            "submitted_at": _timestamp(rng, scale.days),
+            "reviewed": reviewed,
+            "review_result": {"passed": rng.randrange(6), "total": 5} if reviewed else None,
+        })
+    return submissions
+
+
+def make_submission_counts(submissions: List[dict]) -> Dict[str, Dict[str, int]]:
+    """제출 기록과 맞는 회원별·주제별 제출 수 인덱스"""
+    counts: Dict[str, Dict[str, int]] = {}
+    for submission in submissions:
+        topics = counts.setdefault(submission["nickname"], {})
+        topics[submission["topic"]] = topics.get(submission["topic"], 0) + 1
+    return counts
+
+
+def make_reviews(rng: random.Random, submissions: List[dict]) -> List[dict]:
+    reviews = []
+    for submission in submissions:
+        if not submission["reviewed"]:
+            continue
+        checklist = {key: rng.random() < 0.6 for key in (
+            "divergence_explained", "support_resistance_mentioned", "stop_loss_clear",
+            "position_size_appropriate", "emotion_recorded")}
+        reviews.append({
+            "submission_id": submission["id"],
+            "reviewer": "operator",
+            "reviewed_at": submission["submitted_at"],
+            "checklist": checklist,
+            "passed_count": sum(checklist.values()),
+            "total_count": len(checklist),
+            "feedback": _sentence(rng, 6),
+        })
+    return reviews
+
+
+def make_member_files(rng: random.Random, scale: Scale, members: List[str]) -> Dict[str, Dict[str, Any]]:
+    profiles, unlocks, risk_history = {}, {}, {}
+    for nickname in members:
+        homework_count = rng.randrange(0, 20)
+        profiles[nickname] = {
+            "nickname": nickname,
+            "created_at": _timestamp(rng, scale.days),
+            "onboarding_completed": rng.random() < 0.7,
+            "onboarding_checklist": {key: rng.random() < 0.7 for key in (
+                "membership_confirmed", "education_order_checked", "homework_method_checked",
+                "nickname_rule_checked", "faq_checked", "cs_rule_checked")},
+            "grade": rng.choice(["브론즈", "실버", "골드"]),
+            "points": rng.randrange(0, 1000),
+            "homework_count": homework_count,
+            "homework_streak": rng.randrange(0, min(homework_count, 10) + 1),
+        }
+        unlocks[nickname] = {key: rng.random() < 0.3 for key in LESSON_KEYS}
+        if rng.random() < 0.5:
+            risk_history[nickname] = {
+                "warnings": [{"type": w, "count": rng.randrange(1, 10), "last_occurred": _timestamp(rng, scale.days)}
+                             for w in rng.sample(RISK_WARNINGS, rng.randrange(0, 4))],
+                "mini_course_completed": rng.random() < 0.2,
+                "total_checks": rng.randrange(1, 50),
+                "high_risk_count": rng.randrange(0, 5),
+            }
+    return {"member_profiles.json": profiles, "unlocks.json": unlocks, "risk_history.json": risk_history}
+
+
+def make_content_versions(rng: random.Random) -> List[dict]:
+    return [{
+        "id": i,
+        "chapter": "Trading 2",
+        "title": f"{topic} 기초",
+        "version": f"2.{rng.randrange(10)}",
+        "uploaded_at": _timestamp(rng, 30),
+        "changelog": _sentence(rng, 6),
+        "related_homework": topic,
+        "sections": [_sentence(rng, 3) for _ in range(4)],
+    } for i, topic in enumerate(TOPICS, start=1)]
+
+
+def generate(scale: Scale, seed: int = 42) -> Dict[str, Any]:
+    """
+    DATA_FILES의 모든 파일에 대한 합성 데이터를 만듭니다.
+
+    Args:
+        scale: 데이터 규모
+        seed: 난수 시드 (같은 값이면 같은 데이터)
+
+    Returns:
+        파일명 -> 데이터
+    """
+    rng = random.Random(seed)
+    members = _members(scale)
+    kb = make_kb(rng, scale)
+    submissions = make_submissions(rng, scale, members)
+    data = {
+        "kb.json": kb,
+        "logs.json": make_logs(rng, scale, kb),
+        "tickets.json": make_tickets(rng, scale),
+        "announcements.json": make_announcements(rng, scale),
+        "homework_submissions.json": submissions,
+        "homework_reviews.json": make_reviews(rng, submissions),
+        "submission_counts.json": make_submission_counts(submissions),
+        "content_versions.json": make_content_versions(rng),
+    }
+    data.update(make_member_files(rng, scale, members))
+    return data
+
+
+def write_dataset(data: Dict[str, Any]) -> None:
+    """현재 저장소 백엔드로 데이터를 기록합니다 (BUYLOW_DATA_DIR를 먼저 설정하세요)."""
+    from utils.data_utils import save_json
+
+    for filename, content in data.items():
+        if not save_json(filename, content):
+            raise IOError(f"failed to write {filename}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="BuyLow OS 합성 데이터 생성기")
+    parser.add_argument("--scale", choices=sorted(SCALES), default="small")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--data-dir", required=True, help="데이터를 기록할 폴더 (BUYLOW_DATA_DIR)")
+    args = parser.parse_args()
+
+    os.environ["BUYLOW_DATA_DIR"] = os.path.abspath(args.data_dir)
+    os.makedirs(args.data_dir, exist_ok=True)
+
+    started = time.perf_counter()
+    data = generate(SCALES[args.scale], args.seed)
+    write_dataset(data)
+    for filename, content in data.items():
+        print(f"{filename}: {len(content):,}건")
+    print(f"완료: {args.data_dir} ({time.perf_counter() - started:.1f}초)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,267 @@
+# -*- coding: utf-8 -*-
+"""
+BuyLow OS - CS 검색 점수 가중치 학습
+
+logs.json의 cs_query와 tickets.json을 이어 붙여, 보여준 답변이 질문을 해결했는지를
+로지스틱 회귀(numpy, 일괄 경사 하강)로 학습하고 kb_weights.json에 저장합니다.
+KB 인덱스는 이 파일이 바뀌면 다시 만들어지며, 점수는 색인할 때 미리 계산하므로
+질문당 비용은 그대로입니다.
+
+    python -m tools.train_kb_weights --dry-run
+    python -m tools.train_kb_weights --output /tmp/kb_weights_candidate.json
+    python -m tools.train_kb_weights
+    python -m tools.train_kb_weights --data-dir /tmp/buylow_data --epochs 2000
+
+학습 데이터:
+- 양성: 해결(10점 이상)로 기록되고, 같은 날 같은 질문으로 티켓이 만들어지지 않은 질문
+- 음성: 질문 이후 같은 날 같은 질문으로 티켓이 만들어진 질문
+- 특징: 기록된 답변 문서에 대해 키워드 구문/키워드 단어/제목 구문/제목 단어 일치 수와,
+  일치한 키워드별 표시 (MIN_KEYWORD_SAMPLES번 이상 나온 키워드만)
+
+결과 가중치:
+- 정규화는 계수를 0이 아니라 현재 점수 비율(10/3/15/5)로 끌어당기므로,
+  데이터가 적은 항목은 현재 점수 근처에 머묾
+- 항목별 점수: 계수의 비율을 쓰되, 키워드 구문 점수를 10점으로 맞춤
+  (해결 판정 기준 10점이 그대로 의미를 갖도록)
+- 키워드별 배율: exp(계수)를 KEYWORD_SCALE_RANGE 안으로 제한
+
+바꾸기 전에 --output으로 후보 파일을 만들어 tools/replay_cs.py --weights로
+기록된 질문의 결과가 어떻게 바뀌는지 확인하세요.
+"""
+import argparse
+import json
+import os
+import time
+from collections import Counter, defaultdict
+from typing import Any, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+
+FIELDS = ("keyword_phrase", "keyword_word", "title_phrase", "title_word")
+RESOLVED_SCORE = 10
+MIN_KEYWORD_SAMPLES = 20
+KEYWORD_SCALE_RANGE = (0.5, 2.0)
+
+
+class Dataset(NamedTuple):
+    """학습 데이터 (행렬은 FIELDS 다음에 keywords 순서의 열)"""
+    features: np.ndarray
+    labels: np.ndarray
+    keywords: List[str]
+
+
+def _ticket_times(tickets: Sequence[Any]) -> Dict[str, List[str]]:
+    from utils.kb_index import normalize_text
+
+    times: Dict[str, List[str]] = defaultdict(list)
+    for ticket in tickets:
+        query = normalize_text(str(ticket.get("query") or "")).strip()
+        if query:
+            times[query].append(str(ticket.get("timestamp", "")))
+    for values in times.values():
+        values.sort()
+    return times
+
+
+def _ticket_after(times: Sequence[str], timestamp: str) -> bool:
+    return any(t >= timestamp and t[:10] == timestamp[:10] for t in times)
+
+
+def build_dataset(index: Any, events: Any, tickets: Sequence[Any],
+                  min_keyword_samples: int = MIN_KEYWORD_SAMPLES) -> Dataset:
+    """
+    기록된 질문을 특징 행렬과 결과(해결=1, 티켓=0)로 바꿉니다.
+
+    Args:
+        index: 현재 KB 인덱스 (utils.kb_index.KBIndex)
+        events: logs.json 이벤트
+        tickets: tickets.json 항목
+        min_keyword_samples: 키워드별 열을 만들 최소 등장 수
+    """
+    from utils.kb_index import TITLE_SLOT, normalize_text
+
+    doc_rows = {doc.get("id"): i for i, doc in enumerate(index.docs)}
+    ticket_times = _ticket_times(tickets)
+
+    rows: List[Tuple[List[float], Dict[str, int], int]] = []
+    keyword_counts: Counter = Counter()
+    for event in events:
+        if event.get("type") != "cs_query" or event.get("matched_doc_id") not in doc_rows:
+            continue
+        query = str(event.get("query") or "")
+        timestamp = str(event.get("timestamp", ""))
+        if _ticket_after(ticket_times.get(normalize_text(query).strip(), ()), timestamp):
+            label = 0
+        elif (event.get("score") or 0) >= RESOLVED_SCORE:
+            label = 1
+        else:
+            continue
+
+        doc_idx = doc_rows[event["matched_doc_id"]]
+        keywords = index.docs[doc_idx].get("keywords", ())
+        phrase_hits, word_hits = index.hits(query)
+        fields = [0.0] * len(FIELDS)
+        matched: Dict[str, int] = {}
+        for (hit_doc, slot) in phrase_hits:
+            if hit_doc == doc_idx:
+                fields[2 if slot == TITLE_SLOT else 0] += 1
+                if slot != TITLE_SLOT:
+                    matched[normalize_text(keywords[slot])] = 1
+        for (hit_doc, slot), count in word_hits.items():
+            if hit_doc == doc_idx:
+                fields[3 if slot == TITLE_SLOT else 1] += count
+                if slot != TITLE_SLOT:
+                    matched[normalize_text(keywords[slot])] = 1
+        if not any(fields):
+            continue
+        keyword_counts.update(matched)
+        rows.append((fields, matched, label))
+
+    keywords = sorted(k for k, n in keyword_counts.items() if n >= min_keyword_samples and k)
+    columns = {k: len(FIELDS) + i for i, k in enumerate(keywords)}
+    features = np.zeros((len(rows), len(FIELDS) + len(keywords)), dtype=np.float64)
+    labels = np.zeros(len(rows), dtype=np.float64)
+    for i, (fields, matched, label) in enumerate(rows):
+        features[i, :len(FIELDS)] = fields
+        for keyword in matched:
+            if keyword in columns:
+                features[i, columns[keyword]] = 1.0
+        labels[i] = label
+    return Dataset(features, labels, keywords)
+
+
+def _sigmoid(z: np.ndarray) -> np.ndarray:
+    return 1.0 / (1.0 + np.exp(-np.clip(z, -30, 30)))
+
+
+def fit_logistic(features: np.ndarray, labels: np.ndarray, epochs: int = 1000,
+                 learning_rate: float = 0.5, l2: float = 0.1,
+                 prior: Optional[np.ndarray] = None) -> Tuple[np.ndarray, float]:
+    """
+    L2 정규화 로지스틱 회귀 (일괄 경사 하강).
+
+    Args:
+        prior: 정규화가 끌어당기는 계수 (None이면 0). 데이터가 적은 항목은 이 값 근처에 머묾
+
+    Returns:
+        (계수, 절편)
+    """
+    n, d = features.shape
+    prior = np.zeros(d) if prior is None else prior
+    weights = prior.copy()
+    bias = 0.0
+    if n == 0:
+        return weights, bias
+    for _ in range(epochs):
+        error = _sigmoid(features @ weights + bias) - labels
+        weights -= learning_rate * (features.T @ error / n + l2 * (weights - prior))
+        bias -= learning_rate * float(error.mean())
+    return weights, bias
+
+
+def default_prior(data: Dataset, field_weights: Dict[str, float], epochs: int = 1000,
+                  learning_rate: float = 0.5) -> Optional[np.ndarray]:
+    """
+    현재 점수 비율을 그대로 둔 계수 (현재 점수 하나로 결과를 맞춘 크기).
+
+    Returns:
+        계수 (현재 점수가 해결과 양의 관계가 아니면 None)
+    """
+    from utils.kb_index import KEYWORD_PHRASE_SCORE
+
+    defaults = np.array([field_weights[name] for name in FIELDS], dtype=np.float64) / KEYWORD_PHRASE_SCORE
+    score = (data.features[:, :len(FIELDS)] @ defaults)[:, None]
+    (scale,), _ = fit_logistic(score, data.labels, epochs, learning_rate, l2=0.0)
+    if scale <= 0:
+        return None
+    return np.concatenate([defaults * scale, np.zeros(len(data.keywords))])
+
+
+def log_loss(features: np.ndarray, labels: np.ndarray, weights: np.ndarray, bias: float) -> float:
+    p = np.clip(_sigmoid(features @ weights + bias), 1e-12, 1 - 1e-12)
+    return float(-np.mean(labels * np.log(p) + (1 - labels) * np.log(1 - p)))
+
+
+def to_weights(coef: np.ndarray, keywords: Sequence[str]) -> Optional[dict]:
+    """
+    학습한 계수를 kb_weights.json 형식으로 바꿉니다.
+
+    Returns:
+        가중치 (키워드 구문 계수가 0 이하라 기준을 맞출 수 없으면 None)
+    """
+    from utils.kb_index import KEYWORD_PHRASE_SCORE
+
+    anchor = float(coef[0])
+    if anchor <= 0:
+        return None
+    scale = KEYWORD_PHRASE_SCORE / anchor
+    fields = {name: round(max(float(c), 0.0) * scale, 2) for name, c in zip(FIELDS, coef)}
+    low, high = KEYWORD_SCALE_RANGE
+    keyword_scales = {k: round(float(np.clip(np.exp(c), low, high)), 2)
+                      for k, c in zip(keywords, coef[len(FIELDS):])}
+    return {"fields": fields, "keywords": {k: v for k, v in keyword_scales.items() if v != 1.0}}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="BuyLow OS CS 검색 점수 가중치 학습")
+    parser.add_argument("--epochs", type=int, default=1000)
+    parser.add_argument("--learning-rate", type=float, default=0.5)
+    parser.add_argument("--l2", type=float, default=0.1, help="L2 정규화 세기")
+    parser.add_argument("--min-keyword-samples", type=int, default=MIN_KEYWORD_SAMPLES)
+    parser.add_argument("--dry-run", action="store_true", help="결과만 출력하고 저장하지 않음")
+    parser.add_argument("--output", default=None, help="가중치를 이 경로에 쓰기 (기본: 데이터 폴더의 kb_weights.json)")
+    parser.add_argument("--data-dir", default=None, help="데이터 폴더 (기본: 앱의 data/ 또는 BUYLOW_DATA_DIR)")
+    args = parser.parse_args()
+
+    if args.data_dir:
+        os.environ["BUYLOW_DATA_DIR"] = os.path.abspath(args.data_dir)
+
+    from utils.data_utils import iter_events, load_json, save_json
+    from utils.kb_index import KBIndex, WEIGHTS_FILE
+
+    started = time.perf_counter()
+    # 특징은 기본 점수의 인덱스로 계산 (키워드/제목 일치 여부만 쓰므로 가중치와 무관)
+    index = KBIndex(load_json("kb.json", default=[], readonly=True))
+    data = build_dataset(index, iter_events("logs.json"), load_json("tickets.json", default=[], readonly=True),
+                         args.min_keyword_samples)
+    positives = int(data.labels.sum())
+    print(f"학습 데이터: {len(data.labels):,}건 (해결 {positives:,} / 티켓 {len(data.labels) - positives:,}), "
+          f"키워드 {len(data.keywords):,}개")
+    if positives == 0 or positives == len(data.labels):
+        print("해결과 티켓이 모두 있어야 학습할 수 있습니다. 저장하지 않습니다.")
+        return
+
+    base_rate = float(data.labels.mean())
+    baseline = -(base_rate * np.log(base_rate) + (1 - base_rate) * np.log(1 - base_rate))
+    prior = default_prior(data, index.field_weights, args.epochs, args.learning_rate)
+    if prior is None:
+        print("현재 점수가 해결과 양의 관계를 보이지 않아 기준을 맞출 수 없습니다. 저장하지 않습니다.")
+        return
+    coef, bias = fit_logistic(data.features, data.labels, args.epochs, args.learning_rate, args.l2, prior)
+    accuracy = float(np.mean((_sigmoid(data.features @ coef + bias) >= 0.5) == data.labels))
+    print(f"log loss: {log_loss(data.features, data.labels, coef, bias):.4f} (상수 예측 {baseline:.4f}), "
+          f"정확도: {accuracy * 100:.1f}%")
+
+    weights = to_weights(coef, data.keywords)
+    if weights is None:
+        print("키워드 구문 일치가 해결과 양의 관계를 보이지 않아 기준을 맞출 수 없습니다. 저장하지 않습니다.")
+        return
+    print()
+    for name in FIELDS:
+        print(f"  {name:<16}{index.field_weights[name]:>8} -> {weights['fields'][name]:>8}")
+    for keyword, scale in sorted(weights["keywords"].items(), key=lambda item: item[1]):
+        print(f"  키워드 {keyword!r}: x{scale}")
+
+    if args.dry_run:
+        print("\n--dry-run: 저장하지 않았습니다.")
+    elif args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(weights, f, ensure_ascii=False, indent=2)
+        print(f"\n{args.output}에 저장했습니다.")
+    elif save_json(WEIGHTS_FILE, weights):
+        print(f"\n{WEIGHTS_FILE}에 저장했습니다.")
+    print(f"소요 시간: {time.perf_counter() - started:.1f}초")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+# -*- coding: utf-8 -*-
+"""
+BuyLow OS - 여러 키워드 한 번에 찾기 (Aho-Corasick)
+
+키워드 목록마다 `kw in text`를 반복하면 키워드 수만큼 글을 다시 읽습니다.
+키워드를 그룹(예: 금지 표현, 리스크 언급)별로 모아 오토마톤 하나로 컴파일해 두면,
+글을 한 번만 읽으면서 모든 그룹의 키워드를 찾습니다.
+
+- 대소문자 무시(ignore_case)는 컴파일할 때 대문자 전이도 함께 넣어 처리하므로,
+  검사할 때 글 전체를 소문자로 복사하지 않음
+- 같은 그룹 정의는 compile_keywords가 한 번만 컴파일해 재사용
+
+사용 예:
+    matcher = compile_keywords({"forbidden": ["추천", "무조건"], "risk": ["손절", "리스크"]})
+    matcher.find("손절 라인을 무조건 지킨다")
+    # {"forbidden": ["무조건"], "risk": ["손절"]}
+"""
+from collections import deque
+from functools import lru_cache
+from typing import Dict, List, Mapping, Sequence, Tuple
+
+
+class KeywordMatcher:
+    """그룹별 키워드에 대한 Aho-Corasick 오토마톤"""
+
+    def __init__(self, groups: Mapping[str, Sequence[str]], ignore_case: bool = True):
+        """
+        Args:
+            groups: {그룹 이름: 키워드 목록}
+            ignore_case: 대소문자 무시 여부 (`kw.lower() in text.lower()`와 같음)
+        """
+        self.groups = {name: tuple(keywords) for name, keywords in groups.items()}
+        self.ignore_case = ignore_case
+        # 키워드 번호 -> (그룹, 그룹 안 순서, 키워드)
+        self._patterns: List[Tuple[str, int, str]] = []
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._output: List[Tuple[int, ...]] = [()]
+        # 빈 키워드는 어떤 글에도 포함됨
+        self._always: List[int] = []
+
+        outputs: List[List[int]] = [[]]
+        for name, keywords in self.groups.items():
+            for order, keyword in enumerate(keywords):
+                pattern_id = len(self._patterns)
+                self._patterns.append((name, order, keyword))
+                text = keyword.lower() if ignore_case else keyword
+                if not text:
+                    self._always.append(pattern_id)
+                    continue
+                state = 0
+                for ch in text:
+                    nxt = self._goto[state].get(ch)
+                    if nxt is None:
+                        nxt = len(self._goto)
+                        self._goto.append({})
+                        outputs.append([])
+                        for variant in self._variants(ch):
+                            self._goto[state][variant] = nxt
+                    state = nxt
+                outputs[state].append(pattern_id)
+
+        # 실패 링크 (너비 우선). 대소문자 전이는 같은 상태를 가리키므로 한 번만 방문
+        self._fail = [0] * len(self._goto)
+        visited = set(self._goto[0].values())
+        queue = deque(visited)
+        order: List[int] = []
+        while queue:
+            state = queue.popleft()
+            order.append(state)
+            for ch, nxt in self._goto[state].items():
+                if nxt in visited:
+                    continue
+                visited.add(nxt)
+                fail = self._fail[state]
+                while fail and ch not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[nxt] = self._goto[fail].get(ch, 0)
+                outputs[nxt].extend(outputs[self._fail[nxt]])
+                queue.append(nxt)
+        self._output = [tuple(sorted(set(ids))) for ids in outputs]
+
+        # 실패 링크를 미리 따라가 둔 전이표: 검사할 때 글자 하나당 dict 조회 한 번.
+        # 얕은 상태부터 채우므로 실패 링크가 가리키는 행은 이미 완성되어 있음
+        self._delta: List[Dict[str, int]] = [dict(self._goto[0])] + [{} for _ in order]
+        for state in order:
+            row = dict(self._delta[self._fail[state]])
+            row.update(self._goto[state])
+            self._delta[state] = row
+
+    def _variants(self, ch: str) -> Tuple[str, ...]:
+        if not self.ignore_case:
+            return (ch,)
+        upper = ch.upper()
+        # 한 글자로 대응하는 대문자만 전이에 추가 ("ß".upper() == "SS" 등은 제외)
+        if upper != ch and len(upper) == 1 and upper.lower() == ch:
+            return (ch, upper)
+        return (ch,)
+
+    def find(self, text: str) -> Dict[str, List[str]]:
+        """
+        글에 포함된 키워드를 그룹별로 찾습니다 (글을 한 번만 읽음).
+
+        Returns:
+            {그룹 이름: 포함된 키워드 (그룹에 정의한 순서)}. 찾은 키워드가 없는 그룹은 빠짐
+        """
+        found = set(self._always)
+        delta, output = self._delta, self._output
+        state = 0
+        for ch in text:
+            state = delta[state].get(ch, 0)
+            if output[state]:
+                found.update(output[state])
+
+        result: Dict[str, List[Tuple[int, str]]] = {}
+        for pattern_id in found:
+            name, order, keyword = self._patterns[pattern_id]
+            result.setdefault(name, []).append((order, keyword))
+        return {name: [keyword for _, keyword in sorted(hits)] for name, hits in result.items()}
+
+
+@lru_cache(maxsize=32)
+def _compile(groups: Tuple[Tuple[str, Tuple[str, ...]], ...], ignore_case: bool) -> KeywordMatcher:
+    return KeywordMatcher(dict(groups), ignore_case)
+
+
+def compile_keywords(groups: Mapping[str, Sequence[str]], ignore_case: bool = True) -> KeywordMatcher:
+    """
+    그룹별 키워드를 컴파일합니다 (같은 정의는 프로세스에서 한 번만 컴파일).
+
+    Args:
+        groups: {그룹 이름: 키워드 목록}
+        ignore_case: 대소문자 무시 여부
+    """
+    key = tuple((name, tuple(keywords)) for name, keywords in groups.items())
+    return _compile(key, ignore_case)
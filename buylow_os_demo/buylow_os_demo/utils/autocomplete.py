@@ -0,0 +1,145 @@
+# -*- coding: utf-8 -*-
+"""
+BuyLow OS - CS 검색어 자동완성
+
+KB 제목/키워드와 자주 묻는(답을 찾은) 질문을 정렬된 배열에 넣어 두고,
+입력한 앞부분으로 bisect 검색해 인기순으로 추천합니다.
+
+- 항목마다 단어 시작 위치별 접미사를 키로 넣어, 중간 단어로도 찾음
+  ("다이버" -> "RSI 다이버전스")
+- 인기도: KB 항목은 그 문서로 해결된 질문 수 + 1, 질문은 같은 질문 수
+
+로그 전체를 훑어야 하므로, KB가 바뀌거나 REFRESH_INTERVAL이 지나면
+KB 서비스(utils/kb_service.py)가 백그라운드에서 다시 만듭니다.
+"""
+import heapq
+import threading
+import time
+from bisect import bisect_left
+from collections import Counter
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+from utils.data_utils import iter_events
+from utils.kb_index import KEYWORD_PHRASE_SCORE, get_kb_index, normalize_text
+from utils.kb_service import KBService
+
+# 추천에 넣을 과거 질문 수 (많이 나온 순)
+MAX_QUERIES = 500
+# 과거 질문 인기도를 다시 집계하는 주기 (초)
+REFRESH_INTERVAL = 600
+SUGGESTION_COUNT = 5
+
+_KEY_END = "\U0010ffff"
+
+
+def collect_entries(docs: Sequence[Mapping], events: Iterable[Any],
+                    max_queries: int = MAX_QUERIES) -> Dict[str, int]:
+    """
+    자동완성 항목과 인기도를 모읍니다.
+
+    정규화했을 때 같은 항목("RSI"/"rsi")은 하나로 합치고, KB에 있는 표기를 씁니다.
+
+    Args:
+        docs: KB 문서 목록
+        events: 로그 이벤트 (cs_query 중 답을 찾은 것만 사용)
+        max_queries: 넣을 과거 질문 수
+
+    Returns:
+        {표시할 문자열: 인기도}
+    """
+    doc_hits: Counter = Counter()
+    query_counts: Counter = Counter()
+    query_texts: Dict[str, str] = {}
+    for event in events:
+        if event.get("type") != "cs_query" or (event.get("score") or 0) < KEYWORD_PHRASE_SCORE:
+            continue
+        doc_hits[event.get("matched_doc_id")] += 1
+        text = str(event.get("query") or "").strip()
+        norm = normalize_text(text).strip()
+        if norm:
+            query_counts[norm] += 1
+            query_texts.setdefault(norm, text)
+
+    # 정규화한 문자열 -> (표시할 문자열, 인기도)
+    merged: Dict[str, Tuple[str, int]] = {}
+
+    def add(text: str, popularity: int) -> None:
+        norm = normalize_text(text).strip()
+        if not norm:
+            return
+        display, current = merged.get(norm, (text, 0))
+        merged[norm] = (display, max(current, popularity))
+
+    for doc in docs:
+        popularity = doc_hits.get(doc.get("id"), 0) + 1
+        for text in [doc.get("title", "")] + list(doc.get("keywords", ())):
+            add(text, popularity)
+    for norm, count in query_counts.most_common(max_queries):
+        add(query_texts[norm], count)
+    return {display: popularity for display, popularity in merged.values()}
+
+
+class Autocomplete:
+    """앞부분 일치 검색용 정렬 배열"""
+
+    def __init__(self, entries: Mapping[str, int], version: Any = None):
+        """
+        Args:
+            entries: {표시할 문자열: 인기도}
+            version: 만들 때 사용한 데이터 버전
+        """
+        self.version = version
+        self._popularity = dict(entries)
+        keys: List[Tuple[str, str]] = []
+        for text in self._popularity:
+            norm = normalize_text(text).strip()
+            starts = [0] + [i + 1 for i, ch in enumerate(norm) if ch == " "]
+            keys.extend((norm[start:], text) for start in starts)
+        keys.sort()
+        self._keys = [key for key, _ in keys]
+        self._texts = [text for _, text in keys]
+
+    def __len__(self) -> int:
+        return len(self._popularity)
+
+    def suggest(self, prefix: str, limit: int = SUGGESTION_COUNT) -> List[str]:
+        """
+        앞부분이 일치하는 항목을 인기순으로 추천합니다.
+
+        인기도가 같으면 짧은 항목을 먼저 보여줍니다.
+        """
+        norm = normalize_text(prefix).strip()
+        if not norm or limit <= 0:
+            return []
+        lo = bisect_left(self._keys, norm)
+        hi = bisect_left(self._keys, norm + _KEY_END, lo)
+        matches = set(self._texts[lo:hi])
+        return heapq.nsmallest(limit, matches, key=lambda text: (-self._popularity[text], len(text), text))
+
+
+_service: Optional[KBService] = None
+_service_lock = threading.Lock()
+
+
+def _version() -> Any:
+    return get_kb_index().version, int(time.time() // REFRESH_INTERVAL)
+
+
+def _build(version: Any) -> Autocomplete:
+    return Autocomplete(collect_entries(get_kb_index().docs, iter_events("logs.json")), version)
+
+
+def get_autocomplete() -> Autocomplete:
+    """현재 자동완성 색인 (처음 호출 시 만들고, 이후에는 백그라운드에서 갱신)"""
+    global _service
+    if _service is None:
+        with _service_lock:
+            if _service is None:
+                _service = KBService(_build, _version, poll_interval=REFRESH_INTERVAL / 10,
+                                      name="buylow-autocomplete")
+    return _service.index
+
+
+def suggest(prefix: str, limit: int = SUGGESTION_COUNT) -> List[str]:
+    """입력 중인 검색어에 대한 추천 검색어 (인기순)"""
+    return get_autocomplete().suggest(prefix, limit)
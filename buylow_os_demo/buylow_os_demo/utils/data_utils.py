@@ -6,11 +6,19 @@ BuyLow OS - 데이터 유틸리티
 파일 읽기/쓰기 함수를 제공합니다.
 """
 import json
+import marshal
 import os
+import threading
+from contextlib import ExitStack, nullcontext
 from pathlib import Path
-from typing import Any, Optional, Union
+from types import MappingProxyType
+from typing import Any, Callable, ContextManager, Dict, Iterator, List, Optional, Tuple, Union
 from datetime import datetime
 
+from utils import event_counters, event_log, journal, member_store, serialization
+from utils.event_writer import EventWriter
+from utils.file_lock import file_lock
+
 
 def get_project_root() -> Path:
     """
@@ -38,13 +46,19 @@ def get_data_path(filename: str = "") -> Path:
     """
     data 폴더 내 파일 경로를 반환합니다.
     
+    환경변수 BUYLOW_DATA_DIR가 있으면 그 폴더를 data 폴더로 사용합니다
+    (벤치마크용 합성 데이터 등).
+    
     Args:
         filename: 파일명 (빈 문자열이면 data 폴더 경로 반환)
     
     Returns:
         절대 경로 Path 객체
     """
-    data_dir = get_project_root() / "data"
+    if os.environ.get("BUYLOW_DATA_DIR"):
+        data_dir = Path(os.environ["BUYLOW_DATA_DIR"])
+    else:
+        data_dir = get_project_root() / "data"
     if filename:
         return data_dir / filename
     return data_dir
@@ -107,62 +121,1102 @@ DATA_FILES = {
     "unlocks.json": {},
     "content_versions.json": {},
     "member_profiles.json": {},
-    "risk_history.json": []
+    "risk_history.json": {},
+    "event_counts.json": {},
+    "submission_counts.json": {}
 }
 
 
-def load_json(filename: str, default: Optional[Any] = None) -> Any:
+# ============================================
+# 프로세스 공용 JSON 캐시
+# ============================================
+# Streamlit은 상호작용마다 스크립트를 재실행하므로 같은 파일을 반복해서
+# 읽고 파싱하게 됩니다. 파싱 결과를 검증 키(파일은 inode/mtime_ns/size)와
+# 함께 보관하여, 데이터가 바뀌지 않았다면 stat() 한 번으로 끝나도록 합니다.
+
+class CachedData:
+    """캐시 항목 (검증 키 + 파싱 결과)"""
+
+    __slots__ = ("key", "offset", "data", "size", "frozen", "blob", "view")
+
+    def __init__(self, key: tuple, data: Any, offset: int = 0, frozen: Optional[list] = None):
+        # 데이터가 바뀌었는지 판단하는 값 (파일: (inode, mtime_ns, size))
+        self.key = key
+        # 추가분만 읽기 위한 위치 (이벤트 로그: 파싱을 마친 바이트 위치)
+        self.offset = offset
+        # 파싱 결과 (밖으로 그대로 내주지 않음). 리스트는 뒤에 추가만 하므로
+        # 추가 전후의 항목이 같은 리스트를 공유하며, 이 항목은 앞의 size개까지만 유효
+        self.data = data
+        self.size = len(data) if isinstance(data, list) else None
+        # 항목별 읽기 전용 뷰 (리스트일 때, data와 같은 방식으로 공유)
+        self.frozen = frozen
+        # 수정 가능한 사본은 marshal 왕복으로 만듭니다 (json.loads보다 빠름).
+        # 사본과 읽기 전용 뷰는 처음 요청될 때 만듭니다
+        self.blob = None
+        self.view = None
+
+    def readonly(self) -> Any:
+        if self.view is None:
+            if self.size is None:
+                self.view = freeze(self.data)
+            else:
+                frozen = self.frozen
+                if frozen is None or len(frozen) < self.size:
+                    frozen = self.frozen = [freeze(item) for item in self.data[:self.size]]
+                self.view = tuple(frozen[:self.size])
+        return self.view
+
+    def mutable(self) -> Any:
+        if self.blob is None:
+            self.blob = marshal.dumps(self.data if self.size is None else self.data[:self.size])
+        return marshal.loads(self.blob)
+
+
+_json_cache: Dict[str, CachedData] = {}
+_json_cache_lock = threading.Lock()
+
+
+def freeze(data: Any) -> Any:
+    """
+    JSON 데이터를 읽기 전용 뷰로 변환합니다.
+
+    dict는 MappingProxyType, list는 tuple이 됩니다.
+    여러 세션이 같은 객체를 공유해도 안전합니다.
+    """
+    if isinstance(data, dict):
+        return MappingProxyType({k: freeze(v) for k, v in data.items()})
+    if isinstance(data, list):
+        return tuple(freeze(v) for v in data)
+    return data
+
+
+def thaw(data: Any) -> Any:
+    """읽기 전용 뷰를 수정 가능한 dict/list로 되돌립니다."""
+    if isinstance(data, (dict, MappingProxyType)):
+        return {k: thaw(v) for k, v in data.items()}
+    if isinstance(data, (list, tuple)):
+        return [thaw(v) for v in data]
+    return data
+
+
+def _json_default(obj: Any) -> Any:
+    """json.dump가 읽기 전용 뷰도 저장할 수 있게 합니다."""
+    if isinstance(obj, MappingProxyType):
+        return dict(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def _file_key(stat: os.stat_result) -> tuple:
+    return (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+
+
+def _cache_get(cache_key: str) -> Optional[CachedData]:
+    with _json_cache_lock:
+        return _json_cache.get(cache_key)
+
+
+def _cache_put(cache_key: str, key: tuple, data: Any, offset: int = 0) -> CachedData:
+    """
+    파싱 결과를 캐시에 넣습니다.
+
+    data는 캐시가 그대로 보관하므로, 호출한 쪽에서 계속 수정할 객체라면
+    사본을 넘기세요 (_cache_prime_file 참고).
+    """
+    entry = CachedData(key, data, offset)
+    with _json_cache_lock:
+        _json_cache[cache_key] = entry
+    return entry
+
+
+def _cache_extend(cache_key: str, entry: CachedData, key: tuple, items: List[Any],
+                  offset: int = 0) -> CachedData:
+    """
+    리스트 캐시 항목 뒤에 새 항목만 붙인 캐시 항목을 만듭니다.
+
+    기존 리스트를 복사하지 않고 이어 붙이므로 비용은 새 항목 수에 비례합니다.
+    다른 스레드가 이미 같은 리스트에 붙였다면 그때만 앞부분을 복사합니다.
+    """
+    with _json_cache_lock:
+        data, frozen = entry.data, entry.frozen
+        if len(data) != entry.size:
+            data, frozen = data[:entry.size], None
+        if frozen is not None and len(frozen) == entry.size:
+            frozen.extend(freeze(item) for item in items)
+        else:
+            frozen = None
+        data.extend(items)
+        extended = CachedData(key, data, offset, frozen)
+        _json_cache[cache_key] = extended
+    return extended
+
+
+def _cache_drop(cache_key: str) -> None:
+    with _json_cache_lock:
+        _json_cache.pop(cache_key, None)
+
+
+def _cache_prime_file(file_path: Path, data: Any, offset: Optional[int] = None) -> None:
+    """방금 저장한 데이터로 캐시를 갱신합니다 (다음 로드에서 다시 파싱하지 않도록)."""
+    if isinstance(data, (tuple, MappingProxyType)):
+        _cache_drop(str(file_path))
+        return
+    try:
+        stat = file_path.stat()
+        # 저장한 쪽이 data를 계속 수정할 수 있으므로 사본을 보관
+        _cache_put(str(file_path), _file_key(stat), marshal.loads(marshal.dumps(data)),
+                   stat.st_size if offset is None else offset)
+    except (ValueError, OSError):
+        _cache_drop(str(file_path))
+
+
+def invalidate_json_cache(filename: Optional[str] = None) -> None:
+    """
+    JSON 캐시를 비웁니다.
+
+    Args:
+        filename: 파일명 (None이면 전체 캐시 삭제)
+    """
+    if filename is None:
+        with _json_cache_lock:
+            _json_cache.clear()
+    else:
+        get_storage_backend().invalidate(filename)
+
+
+# ============================================
+# 추가 전용 이벤트 로그 (JSON Lines)
+# ============================================
+# 계속 쌓이기만 하는 파일은 .jsonl로 저장하여, 항목 추가 비용이
+# 전체 이력 크기와 무관하도록 합니다. 기존 API(load_json 등)는
+# 파일명 "logs.json"을 그대로 사용합니다.
+
+EVENT_LOG_FILES = ("logs.json", "tickets.json")
+
+# 일자별 세그먼트(data/logs/YYYY-MM-DD.jsonl)로 나눠 저장하는 이벤트 로그.
+# "오늘", "최근 7일" 같은 기간 조회가 해당 날짜 파일만 읽도록 합니다.
+PARTITIONED_LOG_FILES = ("logs.json",)
+
+_migrated_event_logs = set()
+_migrate_lock = threading.Lock()
+
+
+def is_event_log(filename: str) -> bool:
+    """이벤트 로그(.jsonl)로 저장되는 파일인지 확인합니다."""
+    return filename in EVENT_LOG_FILES
+
+
+def is_partitioned_log(filename: str) -> bool:
+    """일자별 세그먼트로 나눠 저장되는 이벤트 로그인지 확인합니다."""
+    return filename in PARTITIONED_LOG_FILES
+
+
+def get_event_log_path(filename: str) -> Path:
+    """
+    이벤트 로그 경로를 반환합니다.
+
+    예: tickets.json -> data/tickets.jsonl, logs.json -> data/logs/ (세그먼트 폴더)
+    """
+    if is_partitioned_log(filename):
+        return get_data_path(Path(filename).stem)
+    return get_data_path(Path(filename).stem + ".jsonl")
+
+
+def _migrate_event_log(filename: str) -> int:
+    path = get_event_log_path(filename)
+    if is_partitioned_log(filename):
+        # 예전 단일 파일(.jsonl 또는 배열 .json)에서 세그먼트로
+        legacy = get_data_path(Path(filename).stem + ".jsonl")
+        return event_log.migrate_to_segments(path, [legacy, get_data_path(filename)])
+    return event_log.migrate_array_file(get_data_path(filename), path)
+
+
+def migrate_event_logs() -> Dict[str, int]:
+    """
+    기존 JSON 배열 파일을 JSON Lines로 한 번 변환합니다.
+    일자별로 나눠 저장하는 로그는 세그먼트 폴더로 나눕니다.
+
+    Returns:
+        파일명별로 옮긴 항목 수
+    """
+    ensure_data_folder()
+    results = {}
+    for filename in EVENT_LOG_FILES:
+        try:
+            results[filename] = _migrate_event_log(filename)
+        except (ValueError, EOFError, IOError, OSError) as e:
+            print(f"[data_utils] Warning: Failed to migrate {filename}: {e}")
+            results[filename] = 0
+    return results
+
+
+def _ensure_event_log(filename: str) -> Path:
+    """이벤트 로그 파일을 준비합니다 (필요 시 변환/생성, 프로세스당 한 번)."""
+    path = get_event_log_path(filename)
+    if str(path) in _migrated_event_logs:
+        return path
+    with _migrate_lock:
+        if str(path) not in _migrated_event_logs:
+            _migrate_event_log(filename)
+            if is_partitioned_log(filename):
+                if not path.exists():
+                    event_log.write_partitioned(path, DATA_FILES.get(filename, []))
+            elif not path.exists():
+                event_log.write_lines(path, DATA_FILES.get(filename, []))
+            _migrated_event_logs.add(str(path))
+    return path
+
+
+# ============================================
+# 회원별 분할 저장소
+# ============================================
+# 닉네임을 키로 하는 딕셔너리는 회원마다 파일 하나로 나눠 저장합니다
+# (data/members/<이름>/<해시 앞 2자리>/<해시>.json). 한 회원의 갱신은
+# 그 회원의 파일만 다시 쓰므로, 서로 다른 회원의 동시 갱신이 서로를
+# 덮어쓰지 않습니다. load_json("member_profiles.json")은 전체를 모아 반환합니다.
+# event_counts.json은 닉네임 대신 로그 파일명을 키로 씁니다 (이벤트 집계 카운터).
+
+MEMBER_FILES = ("member_profiles.json", "unlocks.json", "risk_history.json", "event_counts.json",
+                "submission_counts.json")
+
+_migrated_member_stores = set()
+
+
+def is_member_collection(filename: str) -> bool:
+    """회원별로 나눠 저장되는 파일인지 확인합니다."""
+    return filename in MEMBER_FILES
+
+
+def get_member_store_path(filename: str) -> Path:
+    """회원별 파일 폴더를 반환합니다 (예: unlocks.json -> data/members/unlocks/)."""
+    return get_data_path("members") / Path(filename).stem
+
+
+def _ensure_member_store(filename: str) -> Path:
+    """회원별 폴더를 준비합니다 (필요 시 기존 파일을 나눔, 프로세스당 한 번)."""
+    root = get_member_store_path(filename)
+    if str(root) in _migrated_member_stores:
+        return root
+    with _migrate_lock:
+        if str(root) not in _migrated_member_stores:
+            member_store.migrate_dict_file(get_data_path(filename), root, get_storage_format(filename))
+            if not root.exists():
+                root.mkdir(parents=True, exist_ok=True)
+                member_store.write_all(root, DATA_FILES.get(filename, {}), get_storage_format(filename))
+            _migrated_member_stores.add(str(root))
+    return root
+
+
+def migrate_member_stores() -> Dict[str, int]:
+    """
+    닉네임을 키로 하는 기존 JSON 파일을 회원별 파일로 한 번 나눕니다.
+
+    Returns:
+        파일명별로 옮긴 회원 수
+    """
+    ensure_data_folder()
+    results = {}
+    for filename in MEMBER_FILES:
+        try:
+            results[filename] = member_store.migrate_dict_file(
+                get_data_path(filename), get_member_store_path(filename), get_storage_format(filename)
+            )
+        except (ValueError, EOFError, KeyError, IOError, OSError) as e:
+            print(f"[data_utils] Warning: Failed to migrate {filename}: {e}")
+            results[filename] = 0
+    return results
+
+
+def read_legacy_file(filename: str) -> Optional[Any]:
+    """
+    JSON 파일 저장소의 데이터를 캐시/자동 생성 없이 그대로 읽습니다.
+
+    다른 백엔드로 옮길 때 사용합니다.
+
+    Returns:
+        데이터 (파일이 없으면 None)
+    """
+    if is_partitioned_log(filename) and get_event_log_path(filename).is_dir():
+        return list(event_log.iter_segments(get_event_log_path(filename)))
+    if is_member_collection(filename) and get_member_store_path(filename).is_dir():
+        return dict(sorted(member_store.iter_members(get_member_store_path(filename))))
+    if is_event_log(filename):
+        for path in (get_data_path(Path(filename).stem + ".jsonl"), get_data_path(filename)):
+            if path.exists() and path.suffix == ".jsonl":
+                return event_log.read_from(path, 0)[0]
+            if path.exists():
+                return _read_data_file(path)
+        return None
+    path = get_data_path(filename)
+    if not path.exists():
+        return None
+    return _read_data_file(path)
+
+
+def _read_data_file(path: Path) -> Optional[Any]:
+    raw = path.read_bytes()
+    return serialization.loads(raw) if raw.strip() else None
+
+
+# ============================================
+# ID 시퀀스
+# ============================================
+# 컬렉션마다 마지막으로 발급한 ID를 작은 카운터 파일에 보관하여,
+# 새 ID를 받을 때 전체 리스트를 훑지 않고 잠금 안에서 바로 발급합니다.
+
+def _max_id(data: Any) -> int:
+    if not isinstance(data, (list, tuple)):
+        return 0
+    return max((item.get("id", 0) for item in data if isinstance(item, (dict, MappingProxyType))), default=0)
+
+
+def get_sequence_path(filename: str) -> Path:
+    """ID 카운터 파일 경로를 반환합니다 (예: tickets.json -> data/sequences/tickets.seq)."""
+    return get_data_path("sequences") / (Path(filename).stem + ".seq")
+
+
+def _write_text_atomic(path: Path, text: str) -> None:
+    """임시 파일에 쓰고 fsync 후 os.replace로 교체합니다."""
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.write(text)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+# ============================================
+# 저장 형식
+# ============================================
+# JSON 파일 저장소가 파일을 쓸 때 사용하는 형식입니다 (utils/serialization.py).
+#   - pretty : 들여쓰기 JSON (기본값)
+#   - compact: 공백 없는 JSON
+#   - binary : marshal 기반 바이너리 (쓴 Python 버전에서만 읽힘, convert_storage_format 참고)
+# 읽을 때는 내용으로 형식을 판별하므로, 형식을 바꿔도 기존 파일은 그대로 읽힙니다.
+# 환경변수 BUYLOW_STORAGE_FORMAT 또는 set_storage_format()으로 선택합니다.
+
+_storage_formats: Dict[Optional[str], str] = {}
+
+
+def get_storage_format(filename: Optional[str] = None) -> str:
+    """
+    파일을 저장할 형식을 반환합니다.
+
+    Args:
+        filename: 파일명 (파일별로 지정한 형식이 있으면 그 형식)
+
+    Returns:
+        "pretty", "compact", "binary" 중 하나
+    """
+    fmt = _storage_formats.get(filename) or _storage_formats.get(None)
+    if fmt:
+        return fmt
+    env_fmt = os.environ.get("BUYLOW_STORAGE_FORMAT", serialization.DEFAULT_FORMAT)
+    try:
+        return serialization.normalize_format(env_fmt)
+    except ValueError:
+        print(f"[data_utils] Warning: Unknown storage format '{env_fmt}', using {serialization.DEFAULT_FORMAT}")
+        return serialization.DEFAULT_FORMAT
+
+
+def set_storage_format(fmt: str, filename: Optional[str] = None) -> None:
+    """
+    저장 형식을 지정합니다. 다음 저장부터 적용됩니다.
+
+    Args:
+        fmt: "pretty", "compact", "binary"
+        filename: 파일명 (None이면 모든 파일의 기본 형식)
+    """
+    _storage_formats[filename] = serialization.normalize_format(fmt)
+
+
+def convert_storage_format(fmt: str) -> Dict[str, int]:
+    """
+    JSON 파일 저장소의 데이터 파일을 fmt 형식으로 다시 씁니다.
+
+    binary 형식은 쓴 Python 버전에서만 읽히므로, Python을 올리기 전에 같은
+    버전에서 compact 등으로 변환해 두세요. 이벤트 로그(.jsonl)는 항상 JSON Lines라
+    제외합니다. 읽지 못한 파일은 기본값으로 덮어쓰지 않고 건너뜁니다.
+    이 프로세스의 기본 저장 형식도 fmt로 바뀝니다.
+
+    Args:
+        fmt: "pretty", "compact", "binary"
+
+    Returns:
+        {파일명: 다시 쓴 파일 수}
+    """
+    fmt = serialization.normalize_format(fmt)
+    backend = get_storage_backend()
+    if not isinstance(backend, JsonFileBackend):
+        return {}
+    ensure_data_folder()
+    set_storage_format(fmt)
+    converted = {}
+    for filename in DATA_FILES:
+        if is_event_log(filename):
+            continue
+        try:
+            if is_member_collection(filename):
+                members = backend._load_members(_ensure_member_store(filename)).mutable()
+                for member, value in members.items():
+                    backend.save_member(filename, member, value)
+                converted[filename] = len(members)
+            elif get_data_path(filename).exists():
+                backend.save(filename, serialization.loads(get_data_path(filename).read_bytes()))
+                converted[filename] = 1
+        except backend.errors as e:
+            print(f"[data_utils] Warning: Failed to convert {filename}: {e}")
+    return converted
+
+
+# ============================================
+# 저장소 백엔드
+# ============================================
+# 페이지는 load_json/save_json/append_to_json_list/get_next_id만 사용하고,
+# 실제 저장 방식은 백엔드가 결정합니다.
+#   - json  : data/ 폴더의 JSON 파일 (기본값, Streamlit Cloud 호환)
+#   - sqlite: data/buylow.db (WAL 모드, 인덱스 조회와 행 단위 쓰기)
+# 환경변수 BUYLOW_STORAGE_BACKEND 또는 set_storage_backend()로 선택합니다.
+
+def _in_window(item: Any, since: str, until: Optional[str], event_type: Optional[str]) -> bool:
+    if not isinstance(item, (dict, MappingProxyType)):
+        return False
+    if event_type is not None and item.get("type") != event_type:
+        return False
+    day = str(item.get("timestamp", ""))[:10]
+    return day >= since and (until is None or day <= until)
+
+
+class StorageBackend:
+    """
+    저장소 백엔드 기본 클래스
+
+    메서드는 실패 시 예외를 던지고, 공개 함수(load_json 등)가
+    errors에 해당하는 예외를 잡아 기본값/경고로 처리합니다.
+    """
+
+    name = "base"
+    errors: tuple = (json.JSONDecodeError, IOError, OSError, ValueError, TypeError, EOFError)
+
+    def load(self, filename: str, default: Any, readonly: bool) -> Any:
+        raise NotImplementedError
+
+    def save(self, filename: str, data: Any) -> None:
+        raise NotImplementedError
+
+    def append(self, filename: str, item: dict) -> None:
+        raise NotImplementedError
+
+    def append_many(self, filename: str, items: List[dict]) -> None:
+        for item in items:
+            self.append(filename, item)
+
+    def reserve_ids(self, filename: str, count: int) -> range:
+        raise NotImplementedError
+
+    def load_member(self, filename: str, member: str, default: Any, readonly: bool) -> Any:
+        data = self.load(filename, {}, readonly=True)
+        value = data.get(member) if isinstance(data, MappingProxyType) else None
+        if value is None:
+            return freeze(default) if readonly else thaw(default)
+        return value if readonly else thaw(value)
+
+    def save_member(self, filename: str, member: str, data: Any) -> None:
+        members = self.load(filename, {}, readonly=False)
+        if not isinstance(members, dict):
+            members = {}
+        members[member] = data
+        self.save(filename, members)
+
+    def update_member(self, filename: str, member: str, update: Callable[[Any], Any], default: Any) -> Any:
+        value = self.load_member(filename, member, default, readonly=False)
+        result = update(value)
+        value = value if result is None else result
+        self.save_member(filename, member, value)
+        return value
+
+    def next_id(self, filename: str) -> int:
+        return self.reserve_ids(filename, 1).start
+
+    def max_id(self, filename: str) -> int:
+        """저장된 항목 중 가장 큰 id (시퀀스를 처음 만들 때 한 번만 사용)"""
+        return _max_id(self.load(filename, [], readonly=True))
+
+    def iter_items(self, filename: str) -> Iterator[Any]:
+        yield from self.load(filename, [], readonly=True)
+
+    def load_window(self, filename: str, since: str, until: Optional[str],
+                    event_type: Optional[str]) -> tuple:
+        data = self.load(filename, [], readonly=True)
+        return tuple(item for item in data if _in_window(item, since, until, event_type))
+
+    def find(self, filename: str, filters: Dict[str, Any]) -> list:
+        data = self.load(filename, [], readonly=True)
+        return [
+            item for item in data
+            if isinstance(item, MappingProxyType) and all(item.get(k) == v for k, v in filters.items())
+        ]
+
+    def version(self, filename: str) -> Any:
+        """
+        데이터 버전을 반환합니다. 데이터가 바뀌면 다른 값이 됩니다.
+
+        파생 데이터(검색 인덱스 등)를 다시 만들어야 하는지 판단할 때 사용합니다.
+        """
+        raise NotImplementedError
+
+    def commit(self, ops: List[tuple]) -> None:
+        """
+        작업 단위(Transaction)에 모인 변경을 적용합니다.
+
+        ops의 각 항목은 (메서드 이름, 파일명, 인자...) 입니다. 예:
+        ("append_many", "homework_submissions.json", [item]).
+        기본 구현은 순서대로 적용하며 원자성을 보장하지 않습니다.
+        """
+        for kind, *args in ops:
+            getattr(self, kind)(*args)
+
+    def invalidate(self, filename: str) -> None:
+        pass
+
+    def close(self) -> None:
+        pass
+
+
+class JsonFileBackend(StorageBackend):
+    """data/ 폴더의 JSON 파일 저장소 (이벤트 로그는 .jsonl, logs는 일자별 세그먼트)"""
+
+    name = "json"
+
+    def __init__(self):
+        # 지난 실행에서 중단된 커밋을 마저 수행
+        try:
+            count = journal.recover(get_journal_path(), get_data_path())
+            if count:
+                print(f"[data_utils] Recovered {count} interrupted transaction(s)")
+                # 복구로 교체된 회원 파일이 있을 수 있으므로 모든 회원 폴더를 바뀐 것으로 표시
+                for filename in MEMBER_FILES:
+                    if get_member_store_path(filename).is_dir():
+                        member_store.touch_stamp(get_member_store_path(filename))
+        except OSError as e:
+            print(f"[data_utils] Warning: Failed to recover transactions: {e}")
+
+    def load(self, filename: str, default: Any, readonly: bool) -> Any:
+        if is_event_log(filename):
+            return self._load_event_log(filename, readonly)
+        if is_member_collection(filename):
+            entry = self._load_members(_ensure_member_store(filename))
+            return entry.readonly() if readonly else entry.mutable()
+
+        file_path = get_data_path(filename)
+        try:
+            stat = file_path.stat()
+        except FileNotFoundError:
+            # 파일이 없으면 기본값으로 생성
+            self.save(filename, default)
+            return freeze(default) if readonly else default
+
+        entry = _cache_get(str(file_path))
+        if entry is None or entry.key != _file_key(stat):
+            with open(file_path, "rb") as f:
+                raw = f.read()
+            if not raw.strip():
+                # 빈 파일인 경우 기본값 저장 후 반환
+                self.save(filename, default)
+                return freeze(default) if readonly else default
+            # 형식(pretty/compact/binary)은 내용으로 판별
+            entry = _cache_put(str(file_path), _file_key(stat), serialization.loads(raw))
+        return entry.readonly() if readonly else entry.mutable()
+
+    def _load_event_log(self, filename: str, readonly: bool) -> Any:
+        path = _ensure_event_log(filename)
+        if is_partitioned_log(filename):
+            entry = self._load_segments(path)
+        else:
+            entry = self._load_jsonl(path)
+        return entry.readonly() if readonly else entry.mutable()
+
+    def _load_jsonl(self, path: Path) -> CachedData:
+        """.jsonl 파일을 로드합니다. 파일이 늘어난 경우 추가된 줄만 파싱합니다."""
+        stat = path.stat()
+        key = _file_key(stat)
+        entry = _cache_get(str(path))
+        if entry is None or entry.key != key:
+            if entry is not None and entry.key[0] == stat.st_ino and stat.st_size > entry.key[2]:
+                # 같은 파일에 줄이 추가된 경우: 추가분만 파싱해 캐시 뒤에 붙임
+                new_items, offset = event_log.read_from(path, entry.offset)
+                entry = _cache_extend(str(path), entry, key, new_items, offset)
+            else:
+                data, offset = event_log.read_from(path, 0)
+                entry = _cache_put(str(path), key, data, offset)
+        return entry
+
+    def _load_segments(self, seg_dir: Path) -> CachedData:
+        """모든 세그먼트를 날짜순으로 이어 붙입니다 (세그먼트별 캐시 재사용)."""
+        entries = [(path, self._load_jsonl(path)) for path in event_log.list_segments(seg_dir)]
+        key = tuple((path.name,) + entry.key + (entry.size,) for path, entry in entries)
+        combined = _cache_get(str(seg_dir))
+        if combined is None or combined.key != key:
+            new_items = self._appended_segment_items(combined, key, entries)
+            if new_items is not None:
+                combined = _cache_extend(str(seg_dir), combined, key, new_items)
+            else:
+                data = []
+                for _, entry in entries:
+                    data.extend(entry.data[:entry.size])
+                combined = _cache_put(str(seg_dir), key, data)
+        return combined
+
+    @staticmethod
+    def _appended_segment_items(combined: Optional[CachedData], key: tuple,
+                                entries: List[Tuple[Path, CachedData]]) -> Optional[list]:
+        """
+        지난 캐시 이후 마지막 세그먼트에 줄이 추가되거나 새 세그먼트가 생기기만 했다면
+        추가된 항목을 반환합니다 (그 밖의 변경은 None: 전부 다시 이어 붙임).
+        """
+        if combined is None or not combined.key or len(key) < len(combined.key):
+            return None
+        last = len(combined.key) - 1
+        if key[:last] != combined.key[:last]:
+            return None
+        (old_name, old_ino, _, old_bytes, old_size), (name, ino, _, size_bytes, size) = combined.key[last], key[last]
+        if (name, ino) != (old_name, old_ino) or size_bytes < old_bytes or size < old_size:
+            return None
+        entry = entries[last][1]
+        items = entry.data[old_size:entry.size]
+        for _, entry in entries[last + 1:]:
+            items.extend(entry.data[:entry.size])
+        return items
+
+    def _load_member_file(self, path: Path) -> CachedData:
+        """회원 파일 하나를 로드합니다 ({"member": 닉네임, "data": 데이터})."""
+        key = _file_key(path.stat())
+        entry = _cache_get(str(path))
+        if entry is None or entry.key != key:
+            member, data = member_store.read_member(path)
+            entry = _cache_put(str(path), key, {"member": member, "data": data})
+        return entry
+
+    def _load_members(self, root: Path) -> CachedData:
+        """
+        모든 회원 파일을 닉네임 순 딕셔너리로 모읍니다.
+
+        폴더의 변경 표시(member_store.touch_stamp)가 지난번과 같으면 회원 파일을
+        훑지 않고 캐시를 반환합니다. 바뀌었으면 회원 파일별 캐시를 재사용해 다시 모읍니다.
+        """
+        stamp = member_store.read_stamp(root)
+        if stamp is None:
+            try:
+                stamp = member_store.touch_stamp(root)
+            except OSError:
+                # 쓸 수 없는 환경: 매번 회원 파일을 확인
+                stamp = None
+        combined = _cache_get(str(root))
+        if stamp is not None and combined is not None and combined.key == (stamp,):
+            return combined
+
+        entries = []
+        for path in member_store.list_member_files(root):
+            try:
+                entries.append((path, self._load_member_file(path)))
+            except FileNotFoundError:
+                continue
+        key = (stamp,) if stamp is not None else tuple(sorted((path.name,) + entry.key for path, entry in entries))
+        if combined is None or combined.key != key:
+            records = [entry.readonly() for _, entry in entries]
+            data = {record["member"]: thaw(record["data"])
+                    for record in sorted(records, key=lambda r: r["member"])}
+            combined = _cache_put(str(root), key, data)
+        return combined
+
+    def load_member(self, filename: str, member: str, default: Any, readonly: bool) -> Any:
+        if not is_member_collection(filename):
+            return super().load_member(filename, member, default, readonly)
+        path = member_store.member_path(_ensure_member_store(filename), member)
+        try:
+            entry = self._load_member_file(path)
+        except FileNotFoundError:
+            return freeze(default) if readonly else thaw(default)
+        return entry.readonly()["data"] if readonly else entry.mutable()["data"]
+
+    def save_member(self, filename: str, member: str, data: Any) -> None:
+        if not is_member_collection(filename):
+            super().save_member(filename, member, data)
+            return
+        root = _ensure_member_store(filename)
+        path = member_store.member_path(root, member)
+        member_store.write_member(path, member, data, get_storage_format(filename))
+        _cache_prime_file(path, {"member": member, "data": data})
+
+    def update_member(self, filename: str, member: str, update: Callable[[Any], Any], default: Any) -> Any:
+        if not is_member_collection(filename):
+            return super().update_member(filename, member, update, default)
+        root = _ensure_member_store(filename)
+        path = member_store.member_path(root, member)
+        # 같은 하위 폴더의 회원끼리만 잠금을 공유하므로 다른 회원의 갱신은 기다리지 않음
+        with file_lock(member_store.bucket_path(root, member)):
+            try:
+                value = member_store.read_member(path)[1]
+            except FileNotFoundError:
+                value = thaw(default)
+            result = update(value)
+            value = value if result is None else result
+            self.save_member(filename, member, value)
+        return value
+
+    def _save_members(self, filename: str, data: Any) -> None:
+        """바뀐 회원의 파일만 다시 쓰고, 없어진 회원의 파일은 삭제합니다."""
+        root = _ensure_member_store(filename)
+        current = self._load_members(root).readonly()
+        members = data if isinstance(data, (dict, MappingProxyType)) else {}
+        for member, value in members.items():
+            if member not in current or thaw(current[member]) != thaw(value):
+                self.save_member(filename, member, value)
+        for member in current:
+            if member not in members:
+                path = member_store.member_path(root, member)
+                member_store.delete_member(path)
+                _cache_drop(str(path))
+        _cache_drop(str(root))
+
+    def version(self, filename: str) -> Any:
+        if is_partitioned_log(filename):
+            paths = event_log.list_segments(_ensure_event_log(filename))
+        elif is_event_log(filename):
+            paths = [_ensure_event_log(filename)]
+        elif is_member_collection(filename):
+            root = _ensure_member_store(filename)
+            stamp = member_store.read_stamp(root)
+            if stamp is not None:
+                return (stamp,)
+            paths = member_store.list_member_files(root)
+        else:
+            paths = [get_data_path(filename)]
+        try:
+            return tuple(sorted((path.name,) + _file_key(path.stat()) for path in paths))
+        except FileNotFoundError:
+            return None
+
+    def commit(self, ops: List[tuple]) -> None:
+        """
+        여러 파일의 변경을 임시 파일에 준비한 뒤 redo 저널로 한꺼번에 교체합니다.
+
+        이벤트 로그(.jsonl)는 추가만 하므로 교체가 끝난 뒤에 기록합니다.
+        """
+        _ensure_staged_targets(ops)
+        with ExitStack() as stack:
+            for lock_path in sorted(_transaction_lock_paths(ops)):
+                stack.enter_context(file_lock(lock_path))
+            files, members, deferred = self._stage_state(ops)
+
+            txid = journal.new_txid()
+            renames: List[Tuple[Path, Path]] = []
+            deletes: List[Path] = []
+            primes: List[Tuple[Path, Any]] = []
+            try:
+                for filename, data in files.items():
+                    path = get_data_path(filename)
+                    payload = serialization.dumps(data, get_storage_format(filename))
+                    renames.append((journal.stage(path, payload, txid), path))
+                    primes.append((path, data))
+                for (filename, member), data in members.items():
+                    path = member_store.member_path(get_member_store_path(filename), member)
+                    if data is _DELETED:
+                        deletes.append(path)
+                        continue
+                    record = {"member": member, "data": data}
+                    payload = serialization.dumps(record, get_storage_format(filename))
+                    renames.append((journal.stage(path, payload, txid), path))
+                    primes.append((path, record))
+            except BaseException:
+                journal.discard(tmp for tmp, _ in renames)
+                raise
+            journal.commit(get_journal_path(), get_data_path(), txid, renames, deletes)
+            for filename in {filename for filename, _ in members}:
+                member_store.touch_stamp(get_member_store_path(filename))
+
+        for path, data in primes:
+            _cache_prime_file(path, data)
+        for path in deletes:
+            _cache_drop(str(path))
+        for filename in {filename for filename, _ in members}:
+            _cache_drop(str(get_member_store_path(filename)))
+        for kind, *args in deferred:
+            getattr(self, kind)(*args)
+
+    def _stage_state(self, ops: List[tuple]) -> Tuple[dict, dict, list]:
+        """ops를 순서대로 적용한 최종 상태를 메모리에서 계산합니다 (잠금 안에서 호출)."""
+        files: Dict[str, Any] = {}
+        members: Dict[Tuple[str, str], Any] = {}
+        deferred = []
+        for kind, filename, *args in ops:
+            if is_event_log(filename):
+                deferred.append((kind, filename, *args))
+            elif is_member_collection(filename):
+                root = get_member_store_path(filename)
+                if kind == "save":
+                    new = args[0] if isinstance(args[0], (dict, MappingProxyType)) else {}
+                    for member in self._load_members(root).readonly():
+                        if member not in new:
+                            members[(filename, member)] = _DELETED
+                    for member, value in new.items():
+                        members[(filename, member)] = value
+                elif kind == "save_member":
+                    members[(filename, args[0])] = args[1]
+                elif kind == "update_member":
+                    member, update, default = args
+                    value = members.get((filename, member), _DELETED)
+                    if value is _DELETED:
+                        try:
+                            value = member_store.read_member(member_store.member_path(root, member))[1]
+                        except FileNotFoundError:
+                            value = thaw(default)
+                    result = update(value)
+                    members[(filename, member)] = value if result is None else result
+                else:
+                    raise TypeError(f"{kind} is not supported for {filename}")
+            elif kind == "save":
+                files[filename] = args[0]
+            elif kind == "append_many":
+                if filename not in files:
+                    files[filename] = self.load(filename, _resolve_default(filename, None), readonly=False)
+                if not isinstance(files[filename], list):
+                    files[filename] = []
+                files[filename].extend(args[0])
+            else:
+                raise TypeError(f"{kind} is not supported for {filename}")
+        return files, members, deferred
+
+    def load_window(self, filename: str, since: str, until: Optional[str],
+                    event_type: Optional[str]) -> tuple:
+        if not is_partitioned_log(filename):
+            return super().load_window(filename, since, until, event_type)
+        # 기간에 해당하는 날짜의 세그먼트만 엽니다
+        items = []
+        for path in event_log.segments_between(_ensure_event_log(filename), since, until):
+            view = self._load_jsonl(path).readonly()
+            if event_type is None:
+                items.extend(view)
+            else:
+                items.extend(item for item in view
+                             if isinstance(item, MappingProxyType) and item.get("type") == event_type)
+        return tuple(items)
+
+    def save(self, filename: str, data: Any) -> None:
+        if is_partitioned_log(filename):
+            seg_dir = _ensure_event_log(filename)
+            event_log.write_partitioned(seg_dir, data)
+            self.invalidate(filename)
+            return
+
+        if is_event_log(filename):
+            file_path = _ensure_event_log(filename)
+            event_log.write_lines(file_path, data)
+            _cache_prime_file(file_path, data)
+            return
+
+        if is_member_collection(filename):
+            self._save_members(filename, data)
+            return
+
+        file_path = get_data_path(filename)
+        payload = serialization.dumps(data, get_storage_format(filename))
+        with open(file_path, "wb") as f:
+            f.write(payload)
+        _cache_prime_file(file_path, data)
+
+    def append(self, filename: str, item: dict) -> None:
+        self.append_many(filename, [item])
+
+    def append_many(self, filename: str, items: List[dict]) -> None:
+        if is_partitioned_log(filename):
+            event_log.append_partitioned(_ensure_event_log(filename), items)
+            return
+
+        if is_event_log(filename):
+            event_log.append_lines(_ensure_event_log(filename), items)
+            return
+
+        # 작업 단위(commit)와 같은 잠금을 사용하여 동시 추가가 사라지지 않게 함
+        with file_lock(get_data_path(filename)):
+            data = self.load(filename, [], readonly=False)
+            if not isinstance(data, list):
+                data = []
+            data.extend(items)
+            self.save(filename, data)
+
+    def reserve_ids(self, filename: str, count: int) -> range:
+        seq_path = get_sequence_path(filename)
+        seq_path.parent.mkdir(parents=True, exist_ok=True)
+        with file_lock(seq_path):
+            try:
+                last = int(seq_path.read_text(encoding="utf-8").strip())
+            except (FileNotFoundError, ValueError):
+                # 카운터가 없거나 손상된 경우에만 기존 데이터에서 시작값을 구함
+                last = self.max_id(filename)
+            _write_text_atomic(seq_path, str(last + count))
+        return range(last + 1, last + count + 1)
+
+    def iter_items(self, filename: str) -> Iterator[Any]:
+        if is_partitioned_log(filename):
+            yield from event_log.iter_segments(_ensure_event_log(filename))
+        elif is_event_log(filename):
+            yield from event_log.iter_lines(_ensure_event_log(filename))
+        else:
+            yield from super().iter_items(filename)
+
+    def invalidate(self, filename: str) -> None:
+        if is_partitioned_log(filename):
+            seg_dir = get_event_log_path(filename)
+            _cache_drop(str(seg_dir))
+            for path in event_log.list_segments(seg_dir):
+                _cache_drop(str(path))
+        elif is_event_log(filename):
+            _cache_drop(str(get_event_log_path(filename)))
+        elif is_member_collection(filename):
+            root = get_member_store_path(filename)
+            _cache_drop(str(root))
+            for path in member_store.list_member_files(root):
+                _cache_drop(str(path))
+        else:
+            _cache_drop(str(get_data_path(filename)))
+
+
+# 삭제할 회원 (작업 단위 준비 중 표시용)
+_DELETED = object()
+
+
+def get_journal_path() -> Path:
+    """작업 단위 커밋 저널 폴더 (data/.journal/)"""
+    return get_data_path(".journal")
+
+
+def _ensure_staged_targets(ops: List[tuple]) -> None:
+    for _, filename, *_ in ops:
+        if is_event_log(filename):
+            _ensure_event_log(filename)
+        elif is_member_collection(filename):
+            _ensure_member_store(filename)
+
+
+def _transaction_lock_paths(ops: List[tuple]) -> set:
+    """작업 단위가 잠가야 할 경로 (교착을 피하려고 정렬해서 잠금)"""
+    paths = set()
+    for kind, filename, *args in ops:
+        if is_event_log(filename):
+            continue
+        if is_member_collection(filename):
+            root = get_member_store_path(filename)
+            if kind == "save":
+                members = args[0] if isinstance(args[0], (dict, MappingProxyType)) else {}
+                paths.update(member_store.bucket_path(root, m) for m in members)
+            else:
+                paths.add(member_store.bucket_path(root, args[0]))
+        else:
+            paths.add(get_data_path(filename))
+    return {str(path) for path in paths}
+
+
+_backend: Optional[StorageBackend] = None
+_backend_lock = threading.Lock()
+
+
+def _create_backend(name: str) -> StorageBackend:
+    name = (name or "json").strip().lower()
+    if name == "sqlite":
+        from utils.sqlite_backend import SQLiteBackend
+        db_path = os.environ.get("BUYLOW_SQLITE_PATH") or get_data_path("buylow.db")
+        return SQLiteBackend(Path(db_path))
+    if name != "json":
+        print(f"[data_utils] Warning: Unknown storage backend '{name}', using json")
+    return JsonFileBackend()
+
+
+def get_storage_backend() -> StorageBackend:
+    """
+    현재 저장소 백엔드를 반환합니다.
+
+    처음 호출될 때 환경변수 BUYLOW_STORAGE_BACKEND("json" 또는 "sqlite")로
+    백엔드를 만듭니다.
+    """
+    global _backend
+    if _backend is None:
+        with _backend_lock:
+            if _backend is None:
+                _backend = _create_backend(os.environ.get("BUYLOW_STORAGE_BACKEND", "json"))
+    return _backend
+
+
+def set_storage_backend(backend: Union[StorageBackend, str]) -> StorageBackend:
+    """
+    저장소 백엔드를 교체합니다.
+
+    Args:
+        backend: StorageBackend 인스턴스 또는 이름("json", "sqlite")
+
+    Returns:
+        새로 설정된 백엔드
+    """
+    global _backend
+    if isinstance(backend, str):
+        backend = _create_backend(backend)
+    with _backend_lock:
+        previous, _backend = _backend, backend
+    if previous is not None and previous is not backend:
+        previous.close()
+    return backend
+
+
+# ============================================
+# 공개 API
+# ============================================
+
+def _resolve_default(filename: str, default: Optional[Any]) -> Any:
+    if default is not None:
+        return default
+    if filename in DATA_FILES:
+        return DATA_FILES[filename]
+    if filename.endswith(".json"):
+        # 파일명으로 추측 (list 또는 dict)
+        return [] if "list" in filename.lower() or filename.endswith("s.json") else {}
+    return []
+
+
+def load_json(filename: str, default: Optional[Any] = None, readonly: bool = False) -> Any:
     """
     JSON 파일을 안전하게 로드합니다.
     
     파일이 없거나 읽기 실패 시 기본값을 반환합니다.
     기본 데이터 파일의 경우 자동으로 생성합니다.
+    파싱 결과는 프로세스 공용 캐시에 보관되며, 파일의 mtime/크기가
+    바뀌면 다시 읽습니다.
     
     Args:
         filename: 파일명 (예: "kb.json")
         default: 기본값 (None이면 DATA_FILES에서 찾거나 빈 리스트/딕셔너리)
+        readonly: True면 캐시된 읽기 전용 뷰(MappingProxyType/tuple)를
+            복사 없이 반환합니다. 수정하지 않는 화면에서 사용하세요.
     
     Returns:
         로드된 데이터 또는 기본값
     """
     ensure_data_folder()
-    file_path = get_data_path(filename)
-    
-    # 기본값 결정
-    if default is None:
-        if filename in DATA_FILES:
-            default = DATA_FILES[filename]
-        elif filename.endswith(".json"):
-            # 파일명으로 추측 (list 또는 dict)
-            default = [] if "list" in filename.lower() or filename.endswith("s.json") else {}
-        else:
-            default = []
+    default = _resolve_default(filename, default)
+    backend = get_storage_backend()
     
     try:
-        if file_path.exists():
-            with open(file_path, "r", encoding="utf-8") as f:
-                content = f.read().strip()
-                if content:
-                    return json.loads(content)
-                else:
-                    # 빈 파일인 경우 기본값 저장 후 반환
-                    save_json(filename, default)
-                    return default
-        else:
-            # 파일이 없으면 기본값으로 생성
-            save_json(filename, default)
-            return default
-            
-    except (json.JSONDecodeError, IOError, OSError) as e:
+        return backend.load(filename, default, readonly)
+    except backend.errors as e:
         # 오류 발생 시 기본값 반환 (배포 환경에서 안전하게)
         print(f"[data_utils] Warning: Failed to load {filename}: {e}")
-        return default
+        return freeze(default) if readonly else default
 
 
 def save_json(filename: str, data: Any) -> bool:
     """
     JSON 파일을 안전하게 저장합니다.
     
+    파일 형식은 get_storage_format(filename)을 따릅니다 (기본값: 들여쓰기 JSON).
+    
     Args:
         filename: 파일명 (예: "logs.json")
         data: 저장할 데이터
@@ -171,23 +1225,28 @@ def save_json(filename: str, data: Any) -> bool:
         성공 여부
     """
     ensure_data_folder()
-    file_path = get_data_path(filename)
+    backend = get_storage_backend()
     
-    try:
-        with open(file_path, "w", encoding="utf-8") as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
-        return True
-        
-    except (IOError, OSError) as e:
-        # Streamlit Cloud에서 쓰기 실패할 수 있음
-        print(f"[data_utils] Warning: Failed to save {filename}: {e}")
-        return False
+    with _counter_lock(filename):
+        try:
+            backend.save(filename, data)
+        except backend.errors as e:
+            # Streamlit Cloud에서 쓰기 실패할 수 있음
+            print(f"[data_utils] Warning: Failed to save {filename}: {e}")
+            return False
+        if filename in COUNTED_LOG_FILES:
+            # 내용이 통째로 바뀌었으므로 다음에 읽을 때 다시 집계
+            save_member(EVENT_COUNTS_FILE, filename, None)
+    return True
 
 
 def append_to_json_list(filename: str, item: dict) -> bool:
     """
     JSON 리스트 파일에 항목을 추가합니다.
     
+    이벤트 로그 파일(EVENT_LOG_FILES)과 SQLite 테이블은 한 항목만
+    기록하므로 기존 이력 크기와 무관하게 일정한 비용이 듭니다.
+    
     Args:
         filename: 파일명
         item: 추가할 딕셔너리
@@ -195,16 +1254,105 @@ def append_to_json_list(filename: str, item: dict) -> bool:
     Returns:
         성공 여부
     """
-    data = load_json(filename, default=[])
-    if not isinstance(data, list):
-        data = []
-    data.append(item)
-    return save_json(filename, data)
+    ensure_data_folder()
+    backend = get_storage_backend()
+    
+    with _counter_lock(filename):
+        try:
+            backend.append(filename, item)
+        except backend.errors as e:
+            print(f"[data_utils] Warning: Failed to append {filename}: {e}")
+            return False
+        _count_appended(filename, [item])
+    _after_append(filename, [item])
+    return True
+
+
+def append_many_to_json_list(filename: str, items: List[dict]) -> bool:
+    """
+    JSON 리스트 파일에 여러 항목을 한 번에 추가합니다.
+    
+    Args:
+        filename: 파일명
+        items: 추가할 딕셔너리 리스트
+    
+    Returns:
+        성공 여부
+    """
+    if not items:
+        return True
+    ensure_data_folder()
+    backend = get_storage_backend()
+    
+    with _counter_lock(filename):
+        try:
+            backend.append_many(filename, items)
+        except backend.errors as e:
+            print(f"[data_utils] Warning: Failed to append {len(items)} items to {filename}: {e}")
+            return False
+        _count_appended(filename, items)
+    _after_append(filename, items)
+    return True
+
+
+# ============================================
+# 지연 기록 이벤트
+# ============================================
+# 화면 응답을 디스크 속도와 분리하기 위해, 로그성 이벤트는 큐에 넣고
+# 백그라운드 스레드가 모아서 기록합니다. 기록 전의 이벤트는 잠시 동안
+# load_json 결과에 보이지 않을 수 있습니다.
+
+_event_writer: Optional[EventWriter] = None
+_event_writer_lock = threading.Lock()
+
+
+def _write_event_batch(filename: str, items: List[Any]) -> None:
+    if not append_many_to_json_list(filename, items):
+        raise IOError(f"append to {filename} failed")
+
+
+def get_event_writer() -> EventWriter:
+    """프로세스 공용 이벤트 작성기를 반환합니다 (처음 호출 시 생성)."""
+    global _event_writer
+    if _event_writer is None:
+        with _event_writer_lock:
+            if _event_writer is None:
+                _event_writer = EventWriter(_write_event_batch)
+    return _event_writer
+
+
+def log_event(filename: str, item: dict) -> None:
+    """
+    로그 항목을 지연 기록합니다.
+    
+    append_to_json_list와 같은 결과를 남기지만, 디스크 기록은
+    백그라운드 스레드에서 이루어지므로 호출이 바로 반환됩니다.
+    
+    Args:
+        filename: 파일명 (예: "logs.json")
+        item: 추가할 딕셔너리
+    """
+    get_event_writer().submit(filename, item)
+
+
+def flush_events(timeout: Optional[float] = None) -> bool:
+    """
+    지연 기록 중인 이벤트가 모두 기록될 때까지 기다립니다.
+    
+    Returns:
+        시간 안에 모두 기록됐는지 여부
+    """
+    if _event_writer is None:
+        return True
+    return _event_writer.flush(timeout)
 
 
 def get_next_id(filename: str) -> int:
     """
-    JSON 리스트 파일에서 다음 ID를 반환합니다.
+    JSON 리스트 파일에 사용할 다음 ID를 발급합니다.
+    
+    컬렉션별 시퀀스에서 원자적으로 발급하므로 여러 세션이 동시에
+    호출해도 같은 ID를 받지 않습니다. 발급된 ID는 다시 나오지 않습니다.
     
     Args:
         filename: 파일명
@@ -212,9 +1360,501 @@ def get_next_id(filename: str) -> int:
     Returns:
         다음 사용 가능한 ID
     """
-    data = load_json(filename, default=[])
-    if not isinstance(data, list) or not data:
-        return 1
+    ensure_data_folder()
+    backend = get_storage_backend()
+    
+    try:
+        return backend.next_id(filename)
+    except backend.errors as e:
+        # 카운터를 쓸 수 없는 환경(읽기 전용 배포 등)에서는 기존 방식으로 계산
+        print(f"[data_utils] Warning: Failed to allocate id for {filename}: {e}")
+        return _max_id(load_json(filename, default=[], readonly=True)) + 1
+
+
+def reserve_ids(filename: str, count: int) -> range:
+    """
+    ID를 여러 개 한 번에 예약합니다 (가져오기 등 대량 추가용).
+    
+    Args:
+        filename: 파일명
+        count: 예약할 개수
+    
+    Returns:
+        예약된 ID 범위 (예: range(101, 151))
+    """
+    if count < 1:
+        raise ValueError("count must be at least 1")
+    ensure_data_folder()
+    return get_storage_backend().reserve_ids(filename, count)
+
+
+def iter_events(filename: str) -> Iterator[Any]:
+    """
+    이벤트 로그를 한 항목씩 스트리밍합니다.
+
+    전체 이력을 메모리에 올리지 않고 순회할 때 사용합니다.
+
+    Args:
+        filename: 파일명 (예: "logs.json")
+    """
+    ensure_data_folder()
+    backend = get_storage_backend()
+    try:
+        yield from backend.iter_items(filename)
+    except backend.errors as e:
+        print(f"[data_utils] Warning: Failed to read {filename}: {e}")
+
+
+def load_log_window(filename: str, since: str, until: Optional[str] = None,
+                    event_type: Optional[str] = None) -> tuple:
+    """
+    기간 안의 로그만 읽습니다 (읽기 전용 뷰).
+
+    일자별로 나눠 저장하는 로그는 해당 날짜의 세그먼트만 열기 때문에,
+    "오늘" 조회는 전체 이력 크기와 무관하게 하루치 파일만 읽습니다.
+    SQLite 백엔드에서는 timestamp 인덱스를 사용합니다.
+
+    Args:
+        filename: 파일명 (예: "logs.json")
+        since: 시작 날짜 'YYYY-MM-DD' (포함)
+        until: 끝 날짜 'YYYY-MM-DD' (포함, None이면 제한 없음)
+        event_type: 로그 유형 (예: "cs_query", None이면 전체)
+
+    Returns:
+        기간 안의 항목 tuple
+    """
+    ensure_data_folder()
+    backend = get_storage_backend()
+    try:
+        return backend.load_window(filename, since, until, event_type)
+    except backend.errors as e:
+        print(f"[data_utils] Warning: Failed to query {filename}: {e}")
+        return ()
+
+
+def get_data_version(filename: str) -> Any:
+    """
+    데이터 버전을 반환합니다 (바뀌면 다른 값, 실패 시 None).
+
+    JSON 파일은 stat 정보, SQLite는 컬렉션 버전이므로 데이터를 읽지 않고
+    바뀌었는지 확인할 수 있습니다.
+
+    Args:
+        filename: 파일명 (예: "kb.json")
+    """
+    ensure_data_folder()
+    backend = get_storage_backend()
+    try:
+        return backend.version(filename)
+    except backend.errors as e:
+        print(f"[data_utils] Warning: Failed to read version of {filename}: {e}")
+        return None
+
+
+def find_items(filename: str, **filters: Any) -> list:
+    """
+    리스트 파일에서 필드 값이 모두 일치하는 항목을 찾습니다.
+
+    SQLite 백엔드에서는 인덱스가 있는 컬럼(예: tickets의 status)을
+    인덱스로 조회합니다. 결과는 읽기 전용 뷰입니다.
+
+    Args:
+        filename: 파일명 (예: "tickets.json")
+        **filters: 필드명=값 (예: status="open")
+
+    Returns:
+        일치하는 항목 리스트
+    """
+    ensure_data_folder()
+    backend = get_storage_backend()
+    try:
+        return backend.find(filename, filters)
+    except backend.errors as e:
+        print(f"[data_utils] Warning: Failed to query {filename}: {e}")
+        return []
+
+
+# ============================================
+# 회원별 데이터
+# ============================================
+# member_profiles.json, unlocks.json, risk_history.json은 회원 한 명의 데이터만
+# 읽고 쓸 수 있습니다. JSON 파일 저장소에서는 회원마다 파일이 따로 있고,
+# SQLite 백엔드에서는 회원마다 행이 따로 있습니다.
+
+def load_member(filename: str, member: str, default: Optional[Any] = None,
+                readonly: bool = False) -> Any:
+    """
+    회원 한 명의 데이터를 로드합니다.
+    
+    Args:
+        filename: 파일명 (예: "member_profiles.json")
+        member: 닉네임
+        default: 회원 데이터가 없을 때 반환할 값
+        readonly: True면 읽기 전용 뷰를 복사 없이 반환합니다.
+    
+    Returns:
+        회원 데이터 또는 기본값
+    """
+    ensure_data_folder()
+    backend = get_storage_backend()
+    
+    try:
+        return backend.load_member(filename, member, default, readonly)
+    except backend.errors as e:
+        print(f"[data_utils] Warning: Failed to load {member} from {filename}: {e}")
+        return freeze(default) if readonly else thaw(default)
+
+
+def save_member(filename: str, member: str, data: Any) -> bool:
+    """
+    회원 한 명의 데이터를 저장합니다. 다른 회원의 데이터는 다시 쓰지 않습니다.
+    
+    Args:
+        filename: 파일명 (예: "member_profiles.json")
+        member: 닉네임
+        data: 저장할 데이터
+    
+    Returns:
+        성공 여부
+    """
+    ensure_data_folder()
+    backend = get_storage_backend()
+    
+    try:
+        backend.save_member(filename, member, data)
+        return True
+    except backend.errors as e:
+        print(f"[data_utils] Warning: Failed to save {member} to {filename}: {e}")
+        return False
+
+
+def update_member(filename: str, member: str, update: Callable[[Any], Any],
+                  default: Optional[Any] = None) -> Optional[Any]:
+    """
+    회원 한 명의 데이터를 잠금 안에서 읽고-수정하고-저장합니다.
+    
+    같은 회원을 동시에 갱신해도 변경이 사라지지 않습니다.
+    update는 잠금(SQLite에서는 쓰기 트랜잭션) 안에서 실행되므로 그 안에서
+    다른 데이터를 읽거나 쓰지 마세요. 필요한 값은 호출 전에 준비합니다.
+    
+    Args:
+        filename: 파일명 (예: "risk_history.json")
+        member: 닉네임
+        update: 현재 데이터(없으면 default의 사본)를 받아 수정하는 함수.
+            새 값을 반환하면 그 값을, None을 반환하면 수정된 인자를 저장합니다.
+        default: 회원 데이터가 없을 때 시작할 값
+    
+    Returns:
+        저장된 데이터 (실패 시 None)
+    """
+    ensure_data_folder()
+    backend = get_storage_backend()
     
-    max_id = max((item.get("id", 0) for item in data if isinstance(item, dict)), default=0)
-    return max_id + 1
+    try:
+        return backend.update_member(filename, member, update, default)
+    except backend.errors as e:
+        print(f"[data_utils] Warning: Failed to update {member} in {filename}: {e}")
+        return None
+
+
+# ============================================
+# 이벤트 집계 카운터 / 추가 알림
+# ============================================
+# COUNTED_LOG_FILES에 항목을 추가할 때 유형별·일자별 개수도 함께 올려,
+# 통계가 로그 이력 크기와 무관하게 카운터 하나만 읽도록 합니다.
+# 카운터는 event_counts.json에 로그 파일명을 키로 저장됩니다 (회원별 저장소와
+# 같은 방식이라 잠금 안에서 갱신됨). 카운터가 없거나 로그를 통째로 다시
+# 저장한 뒤에는 처음 읽을 때 로그를 한 번 훑어 다시 만듭니다.
+# 로그 추가와 카운터 갱신, 로그를 훑어 카운터를 다시 만드는 일은 로그별
+# 카운터 잠금(_counter_lock, 프로세스 사이에서도 유효) 안에서 합니다. 잠금
+# 없이 훑으면 먼저 훑은 (항목이 빠진) 결과가 나중에 저장되거나, 이미 훑어
+# 센 항목을 한 번 더 더할 수 있습니다.
+# 로그는 update_member를 부르기 전에 훑습니다. 갱신 함수는 잠금(SQLite에서는
+# 쓰기 트랜잭션) 안에서 실행되므로, 그 안에서 다른 파일을 읽으면 안 됩니다.
+# 지연 기록 이벤트는 EventWriter가 한 번 기록할 때 모은 항목 전체로 카운터를
+# 한 번만 갱신합니다.
+#
+# 그 밖에 기록된 이벤트를 이어서 받아야 하는 기능(예: 인기 검색어)은
+# add_append_listener로 등록합니다.
+
+EVENT_COUNTS_FILE = "event_counts.json"
+COUNTED_LOG_FILES = ("logs.json",)
+
+_append_listeners: Dict[str, List[Callable[[List[Any]], None]]] = {}
+_append_listeners_lock = threading.Lock()
+
+
+def _has_counter_lock(filename: str) -> bool:
+    """집계 인덱스(이벤트 카운터, 과제 제출 수)를 두는 파일인지"""
+    return filename in COUNTED_LOG_FILES or filename == SUBMISSIONS_FILE
+
+
+def _counter_lock(filename: str) -> ContextManager:
+    """집계 인덱스를 두는 파일의 인덱스 잠금 (그 밖의 파일은 잠그지 않음)"""
+    if not _has_counter_lock(filename):
+        return nullcontext()
+    return file_lock(get_data_path(f"{filename}.counts"))
+
+
+def _scan_event_counts(filename: str) -> dict:
+    return event_counters.add_events(None, iter_events(filename))
+
+
+def _store_scanned_counts(filename: str) -> Tuple[dict, Optional[Any]]:
+    """
+    로그 전체를 훑은 카운터로 교체합니다 (카운터 잠금 안에서 호출).
+
+    Returns:
+        (훑은 카운터, 저장된 카운터 (실패 시 None))
+    """
+    scanned = _scan_event_counts(filename)
+    return scanned, update_member(EVENT_COUNTS_FILE, filename, lambda _: scanned)
+
+
+def _count_appended(filename: str, items: List[Any]) -> None:
+    """방금 추가한 항목을 카운터에 더합니다 (카운터 잠금 안에서 호출)."""
+    if filename not in COUNTED_LOG_FILES:
+        return
+    if load_member(EVENT_COUNTS_FILE, filename, readonly=True) is None:
+        # 카운터가 없으면 방금 추가한 항목까지 포함해 다시 집계
+        _store_scanned_counts(filename)
+        return
+    update_member(EVENT_COUNTS_FILE, filename,
+                  lambda counts: event_counters.add_events(counts if isinstance(counts, dict) else None, items))
+
+
+def add_append_listener(filename: str, listener: Callable[[List[Any]], None]) -> None:
+    """
+    이 프로세스에서 항목을 추가(기록)할 때마다 호출할 함수를 등록합니다.
+
+    지연 기록 이벤트(log_event)는 실제로 기록될 때 호출되며, 다른 프로세스가
+    추가한 항목에는 호출되지 않습니다. 예외는 경고만 남기고 무시합니다.
+
+    Args:
+        filename: 파일명 (예: "logs.json")
+        listener: 추가된 항목 리스트를 받는 함수
+    """
+    with _append_listeners_lock:
+        _append_listeners.setdefault(filename, []).append(listener)
+
+
+def _after_append(filename: str, items: List[Any]) -> None:
+    for listener in list(_append_listeners.get(filename, ())):
+        try:
+            listener(items)
+        except Exception as e:  # 리스너 오류로 기록이 실패하지 않도록
+            print(f"[data_utils] Warning: Append listener for {filename} failed: {e}")
+
+
+def rebuild_event_counts(filename: str) -> Optional[Any]:
+    """
+    로그 전체를 훑어 카운터를 다시 만듭니다.
+
+    Args:
+        filename: 파일명 (예: "logs.json")
+
+    Returns:
+        새 카운터 (실패 시 None)
+    """
+    with _counter_lock(filename):
+        return _store_scanned_counts(filename)[1]
+
+
+def get_event_counts(filename: str) -> Any:
+    """
+    이벤트 로그의 카운터를 반환합니다 (읽기 전용 뷰).
+
+    형식은 utils/event_counters.py를 참고하세요.
+
+    Args:
+        filename: 파일명 (예: "logs.json")
+    """
+    counts = load_member(EVENT_COUNTS_FILE, filename, readonly=True)
+    if counts is None:
+        with _counter_lock(filename):
+            # 잠금을 기다리는 사이 다른 곳에서 만들었을 수 있음
+            counts = load_member(EVENT_COUNTS_FILE, filename, readonly=True)
+            if counts is None:
+                scanned, counts = _store_scanned_counts(filename)
+                return freeze(counts if counts is not None else scanned)
+    return counts
+
+
+def count_events(filename: str, key: str, day: Optional[str] = None) -> int:
+    """
+    이벤트 개수를 카운터에서 읽습니다 (로그를 읽지 않음).
+
+    아직 기록되지 않은 지연 기록 이벤트(log_event)는 포함되지 않습니다.
+
+    Args:
+        filename: 파일명 (예: "logs.json")
+        key: 이벤트 유형 (예: "cs_query") 또는 결과별 키 (예: "cs_query:resolved")
+        day: 'YYYY-MM-DD' (None이면 전체 기간)
+
+    Returns:
+        개수
+    """
+    return event_counters.count(get_event_counts(filename), key, day)
+
+
+# ============================================
+# 과제 제출 수 인덱스
+# ============================================
+# 언락 판단이 제출 기록 전체를 훑지 않도록, 회원별·주제별 제출 수를
+# submission_counts.json(회원별 저장소, {닉네임: {주제: 제출 수}})에 둡니다.
+# 제출 기록을 추가하는 작업 단위에서 같이 올리며(tx.update_member),
+# 인덱스가 없던 회원은 get_submission_counts가 제출 기록으로 한 번 채웁니다.
+# 이벤트 카운터와 같이, 제출 기록을 바꾸는 커밋과 인덱스를 채우는 일은
+# 인덱스 잠금(_counter_lock) 안에서 하므로 훑은 사이의 제출이 빠지지 않습니다.
+#
+# 제출 기록을 통째로 다시 저장할 때(예: 채점 결과 반영)는 닉네임과 주제를
+# 바꾸지 않아야 인덱스와 맞습니다.
+
+SUBMISSIONS_FILE = "homework_submissions.json"
+SUBMISSION_COUNTS_FILE = "submission_counts.json"
+
+
+def _scan_submission_counts(nickname: str) -> Dict[str, int]:
+    counts: Dict[str, int] = {}
+    for item in find_items(SUBMISSIONS_FILE, nickname=nickname):
+        topic = item.get("topic")
+        if isinstance(topic, str):
+            counts[topic] = counts.get(topic, 0) + 1
+    return counts
+
+
+def get_submission_counts(nickname: str) -> Any:
+    """
+    회원의 주제별 과제 제출 수를 반환합니다 (읽기 전용 뷰).
+
+    인덱스가 없던 회원은 제출 기록을 한 번 훑어 채웁니다. 제출을 저장하기 전에
+    호출해 두면, 같은 작업 단위의 update_member는 이미 채워진 값에서 시작합니다.
+
+    Args:
+        nickname: 닉네임
+
+    Returns:
+        {주제: 제출 수}
+    """
+    counts = load_member(SUBMISSION_COUNTS_FILE, nickname, readonly=True)
+    if counts is None:
+        with _counter_lock(SUBMISSIONS_FILE):
+            # 잠금을 기다리는 사이 다른 세션이 채웠을 수 있음
+            counts = load_member(SUBMISSION_COUNTS_FILE, nickname, readonly=True)
+            if counts is None:
+                # 갱신 함수는 잠금(SQLite에서는 쓰기 트랜잭션) 안에서 실행되므로 미리 훑어 둠
+                scanned = _scan_submission_counts(nickname)
+                counts = update_member(SUBMISSION_COUNTS_FILE, nickname, lambda _: scanned)
+                return freeze(counts if counts is not None else scanned)
+    return counts
+
+
+# ============================================
+# 작업 단위 (트랜잭션)
+# ============================================
+# 여러 파일에 걸친 변경을 모아 두었다가 한 번에 커밋합니다.
+# JSON 파일 저장소에서는 임시 파일 + redo 저널 + os.replace로,
+# SQLite 백엔드에서는 하나의 트랜잭션으로 적용합니다.
+
+class Transaction:
+    """
+    여러 컬렉션의 변경을 모아 한 번에 커밋하는 작업 단위
+
+    사용 예:
+        with transaction() as tx:
+            new_id = tx.next_id("homework_submissions.json")
+            tx.append("homework_submissions.json", {"id": new_id, ...})
+            tx.update_member("member_profiles.json", nickname, count_homework)
+        if not tx.committed:
+            st.error("저장하지 못했습니다")
+    """
+
+    def __init__(self, backend: StorageBackend):
+        self.backend = backend
+        self.ops: List[tuple] = []
+        self.committed = False
+
+    def save(self, filename: str, data: Any) -> None:
+        """파일 전체를 data로 교체합니다."""
+        self.ops.append(("save", filename, data))
+
+    def append(self, filename: str, item: dict) -> None:
+        """리스트 파일에 항목을 추가합니다."""
+        self.ops.append(("append_many", filename, [item]))
+
+    def save_member(self, filename: str, member: str, data: Any) -> None:
+        """회원 한 명의 데이터를 교체합니다."""
+        self.ops.append(("save_member", filename, member, data))
+
+    def update_member(self, filename: str, member: str, update: Callable[[Any], Any],
+                      default: Optional[Any] = None) -> None:
+        """
+        회원 한 명의 데이터를 수정합니다.
+
+        update는 커밋할 때 잠금 안에서 호출됩니다 (update_member 함수와 같은 규칙).
+        """
+        self.ops.append(("update_member", filename, member, update, default))
+
+    def next_id(self, filename: str) -> int:
+        """
+        다음 ID를 바로 발급합니다.
+
+        ID는 커밋 여부와 관계없이 발급되며, 커밋하지 않으면 그 ID는 건너뜁니다.
+        """
+        return get_next_id(filename)
+
+    def commit(self) -> bool:
+        """
+        모은 변경을 적용합니다.
+
+        Returns:
+            성공 여부
+        """
+        if self.committed or not self.ops:
+            self.committed = True
+            return True
+        ensure_data_folder()
+        with ExitStack() as stack:
+            # 집계 인덱스를 두는 파일을 바꾸면 인덱스 갱신까지 인덱스 잠금 안에서
+            for filename in sorted({op[1] for op in self.ops if _has_counter_lock(op[1])}):
+                stack.enter_context(_counter_lock(filename))
+            try:
+                self.backend.commit(self.ops)
+            except self.backend.errors as e:
+                print(f"[data_utils] Warning: Failed to commit {len(self.ops)} changes: {e}")
+                return False
+            self.committed = True
+            for kind, filename, *args in self.ops:
+                if kind == "append_many":
+                    _count_appended(filename, args[0])
+                elif kind == "save" and filename in COUNTED_LOG_FILES:
+                    save_member(EVENT_COUNTS_FILE, filename, None)
+        for kind, filename, *args in self.ops:
+            if kind == "append_many":
+                _after_append(filename, args[0])
+        return True
+
+    def rollback(self) -> None:
+        """모은 변경을 버립니다."""
+        self.ops = []
+
+    def __enter__(self) -> "Transaction":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is None:
+            self.commit()
+        else:
+            self.rollback()
+
+
+def transaction() -> Transaction:
+    """
+    작업 단위를 시작합니다.
+
+    with 블록이 예외 없이 끝나면 커밋하고, 예외가 나면 아무것도 쓰지 않습니다.
+
+    Returns:
+        Transaction
+    """
+    return Transaction(get_storage_backend())
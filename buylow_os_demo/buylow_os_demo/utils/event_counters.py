@@ -0,0 +1,89 @@
+# -*- coding: utf-8 -*-
+"""
+BuyLow OS - 이벤트 집계 카운터
+
+통계 화면이 로그 전체를 훑지 않도록, 이벤트를 기록할 때 유형별·일자별 개수를
+함께 올려 둡니다. 저장과 잠금은 data_utils가 맡고, 이 모듈은 집계 규칙만 다룹니다.
+
+카운터 형식:
+    {
+        "total": 120,
+        "types": {"cs_query": 80, "quiz": 40},
+        "days": {"2026-01-27": {"cs_query": 5, "cs_query:resolved": 3, "quiz": 2}}
+    }
+
+"cs_query:resolved"처럼 콜론이 붙은 키는 결과별 개수입니다 (OUTCOMES 참고).
+"""
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional, Tuple
+
+# cs_chat의 "관련 정보를 찾았습니다" 기준과 같은 점수
+RESOLVED_SCORE = 10
+
+# 이벤트 유형 -> [(결과 이름, 판정 함수)]
+OUTCOMES: Dict[str, List[Tuple[str, Callable[[Mapping], bool]]]] = {
+    "cs_query": [("resolved", lambda event: (event.get("score") or 0) >= RESOLVED_SCORE)],
+}
+
+
+def outcome_key(event_type: str, outcome: str) -> str:
+    """결과별 카운터 키 (예: "cs_query:resolved")"""
+    return f"{event_type}:{outcome}"
+
+
+def empty() -> dict:
+    return {"total": 0, "types": {}, "days": {}}
+
+
+def event_keys(event: Mapping) -> List[str]:
+    """이벤트 하나가 올리는 카운터 키 목록"""
+    event_type = event.get("type")
+    if not isinstance(event_type, str):
+        return []
+    keys = [event_type]
+    for outcome, test in OUTCOMES.get(event_type, ()):
+        if test(event):
+            keys.append(outcome_key(event_type, outcome))
+    return keys
+
+
+def add_events(counts: Optional[dict], events: Iterable[Any]) -> dict:
+    """
+    카운터에 이벤트를 더합니다.
+
+    Args:
+        counts: 기존 카운터 (None이면 새로 시작)
+        events: 추가된 이벤트
+
+    Returns:
+        갱신된 카운터 (counts를 직접 수정)
+    """
+    if counts is None:
+        counts = empty()
+    types = counts.setdefault("types", {})
+    days = counts.setdefault("days", {})
+    for event in events:
+        if not isinstance(event, Mapping):
+            continue
+        counts["total"] = counts.get("total", 0) + 1
+        keys = event_keys(event)
+        day = str(event.get("timestamp", ""))[:10]
+        day_counts = days.setdefault(day, {}) if day else None
+        for key in keys:
+            types[key] = types.get(key, 0) + 1
+            if day_counts is not None:
+                day_counts[key] = day_counts.get(key, 0) + 1
+    return counts
+
+
+def count(counts: Mapping, key: str, day: Optional[str] = None) -> int:
+    """
+    카운터 값을 읽습니다.
+
+    Args:
+        counts: 카운터
+        key: 이벤트 유형 또는 결과별 키
+        day: 'YYYY-MM-DD' (None이면 전체 기간)
+    """
+    if day is None:
+        return counts.get("types", {}).get(key, 0)
+    return counts.get("days", {}).get(day, {}).get(key, 0)
@@ -0,0 +1,256 @@
+# -*- coding: utf-8 -*-
+"""
+BuyLow OS - 추가 전용(JSON Lines) 이벤트 로그
+
+logs.json, tickets.json처럼 계속 쌓이기만 하는 데이터를
+한 줄에 한 항목씩 기록하는 .jsonl 파일로 저장합니다.
+
+- 추가: O_APPEND로 한 줄을 한 번의 write()로 기록 (기존 크기와 무관하게 일정한 비용)
+- 읽기: 한 줄씩 스트리밍하며, 쓰는 중인 마지막 줄이나 손상된 줄은 건너뜀
+- 전체 교체: 임시 파일 작성 후 os.replace로 원자적 교체 (티켓 상태 변경 등)
+- 일자별 분할: timestamp의 날짜마다 세그먼트 파일(예: logs/2026-01-27.jsonl)을 두어
+  기간 조회 시 해당 날짜의 파일만 엽니다.
+"""
+import os
+import re
+import shutil
+import threading
+from collections import defaultdict
+from collections.abc import Mapping
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from utils import serialization
+
+
+def encode_line(item: Any) -> bytes:
+    """항목 하나를 개행으로 끝나는 JSON 한 줄로 인코딩합니다."""
+    return serialization.dumps_line(item)
+
+
+def _read_array_file(path: Path) -> List[Any]:
+    # 예전 배열 형식 파일 (저장 형식은 내용으로 판별)
+    raw = path.read_bytes()
+    data = serialization.loads(raw) if raw.strip() else []
+    return data if isinstance(data, list) else []
+
+
+def append_line(path: Path, item: Any) -> None:
+    """
+    항목 하나를 파일 끝에 추가합니다.
+
+    O_APPEND로 연 파일에 한 번의 write()로 기록하므로 여러 세션이
+    동시에 추가해도 줄이 섞이지 않습니다.
+    """
+    append_lines(path, [item])
+
+
+def append_lines(path: Path, items: Iterable[Any]) -> None:
+    """여러 항목을 한 번의 write()로 파일 끝에 추가합니다."""
+    payload = b"".join(encode_line(item) for item in items)
+    if not payload:
+        return
+    fd = os.open(path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+    try:
+        written = os.write(fd, payload)
+        # 드물게 부분 기록이 일어나면 나머지를 이어서 기록
+        while written < len(payload):
+            written += os.write(fd, payload[written:])
+    finally:
+        os.close(fd)
+
+
+def parse_lines(chunk: bytes) -> Tuple[List[Any], int]:
+    """
+    바이트 덩어리에서 완성된 줄들을 파싱합니다.
+
+    Returns:
+        (파싱된 항목 리스트, 소비한 바이트 수)
+        개행으로 끝나지 않은 마지막 줄은 소비하지 않습니다.
+    """
+    end = chunk.rfind(b"\n") + 1
+    items = []
+    for line in chunk[:end].splitlines():
+        if not line.strip():
+            continue
+        try:
+            items.append(serialization.loads_line(line))
+        except serialization.DECODE_ERRORS:
+            print(f"[event_log] Warning: Skipping corrupt line: {line[:80]!r}")
+    return items, end
+
+
+def read_from(path: Path, offset: int = 0) -> Tuple[List[Any], int]:
+    """
+    offset 위치부터 파일 끝까지의 완성된 줄을 읽습니다.
+
+    Returns:
+        (항목 리스트, 다음에 읽기 시작할 위치)
+    """
+    with open(path, "rb") as f:
+        f.seek(offset)
+        items, consumed = parse_lines(f.read())
+    return items, offset + consumed
+
+
+def iter_lines(path: Path) -> Iterator[Any]:
+    """파일 전체를 메모리에 올리지 않고 한 줄씩 항목을 반환합니다."""
+    with open(path, "rb") as f:
+        for line in f:
+            if not line.endswith(b"\n"):
+                # 다른 세션이 아직 쓰는 중인 줄
+                break
+            if not line.strip():
+                continue
+            try:
+                yield serialization.loads_line(line)
+            except serialization.DECODE_ERRORS:
+                print(f"[event_log] Warning: Skipping corrupt line: {line[:80]!r}")
+
+
+def write_lines(path: Path, items: Iterable[Any]) -> None:
+    """파일 전체를 원자적으로 교체합니다 (임시 파일 + os.replace)."""
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        with open(tmp_path, "wb") as f:
+            for item in items:
+                f.write(encode_line(item))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    finally:
+        if tmp_path.exists():
+            tmp_path.unlink()
+
+
+def migrate_array_file(json_path: Path, jsonl_path: Path) -> int:
+    """
+    JSON 배열 파일을 JSON Lines 파일로 한 번 변환합니다.
+
+    이미 .jsonl 파일이 있으면 아무것도 하지 않습니다.
+    원본은 삭제하지 않고 '.bak'을 붙여 보관합니다.
+
+    Returns:
+        옮긴 항목 수
+    """
+    if jsonl_path.exists() or not json_path.exists():
+        return 0
+
+    data = _read_array_file(json_path)
+
+    write_lines(jsonl_path, data)
+    os.replace(json_path, json_path.with_name(json_path.name + ".bak"))
+    return len(data)
+
+
+# ============================================
+# 일자별 세그먼트
+# ============================================
+
+SEGMENT_SUFFIX = ".jsonl"
+# timestamp가 없거나 형식이 다른 항목이 모이는 세그먼트
+UNDATED_SEGMENT = "undated"
+
+_DAY_PATTERN = re.compile(r"^\d{4}-\d{2}-\d{2}")
+
+
+def day_of(item: Any) -> str:
+    """항목이 들어갈 세그먼트 이름 (timestamp의 날짜 'YYYY-MM-DD')"""
+    timestamp = item.get("timestamp") if isinstance(item, Mapping) else None
+    if isinstance(timestamp, str) and _DAY_PATTERN.match(timestamp):
+        return timestamp[:10]
+    return UNDATED_SEGMENT
+
+
+def segment_path(seg_dir: Path, day: str) -> Path:
+    return seg_dir / (day + SEGMENT_SUFFIX)
+
+
+def list_segments(seg_dir: Path) -> List[Path]:
+    """세그먼트 파일 목록 (날짜순, undated는 마지막)"""
+    try:
+        names = [name for name in os.listdir(seg_dir)
+                 if name.endswith(SEGMENT_SUFFIX) and not name.startswith(".")]
+    except FileNotFoundError:
+        return []
+    return [seg_dir / name for name in sorted(names)]
+
+
+def segments_between(seg_dir: Path, since: str, until: Optional[str] = None) -> List[Path]:
+    """
+    since~until(포함) 날짜에 해당하는 세그먼트만 반환합니다.
+
+    Args:
+        since: 시작 날짜 'YYYY-MM-DD'
+        until: 끝 날짜 'YYYY-MM-DD' (None이면 끝 제한 없음)
+    """
+    selected = []
+    for path in list_segments(seg_dir):
+        day = path.name[:-len(SEGMENT_SUFFIX)]
+        if day == UNDATED_SEGMENT or day < since:
+            continue
+        if until is not None and day > until:
+            continue
+        selected.append(path)
+    return selected
+
+
+def group_by_day(items: Iterable[Any]) -> Dict[str, List[Any]]:
+    groups: Dict[str, List[Any]] = defaultdict(list)
+    for item in items:
+        groups[day_of(item)].append(item)
+    return groups
+
+
+def append_partitioned(seg_dir: Path, items: Iterable[Any]) -> None:
+    """항목을 날짜별 세그먼트 끝에 추가합니다 (세그먼트마다 한 번의 write())."""
+    for day, group in group_by_day(items).items():
+        append_lines(segment_path(seg_dir, day), group)
+
+
+def write_partitioned(seg_dir: Path, items: Iterable[Any]) -> None:
+    """세그먼트 전체를 다시 씁니다. 항목이 없어진 날짜의 세그먼트는 삭제합니다."""
+    seg_dir.mkdir(parents=True, exist_ok=True)
+    groups = group_by_day(items)
+    for day, group in groups.items():
+        write_lines(segment_path(seg_dir, day), group)
+    for path in list_segments(seg_dir):
+        if path.name[:-len(SEGMENT_SUFFIX)] not in groups:
+            path.unlink()
+
+
+def iter_segments(seg_dir: Path) -> Iterator[Any]:
+    for path in list_segments(seg_dir):
+        yield from iter_lines(path)
+
+
+def migrate_to_segments(seg_dir: Path, sources: Iterable[Path]) -> int:
+    """
+    단일 로그 파일(.jsonl 또는 JSON 배열)을 일자별 세그먼트로 한 번 나눕니다.
+
+    sources 중 처음 존재하는 파일을 사용하며, 세그먼트 폴더가 이미 있으면
+    아무것도 하지 않습니다. 원본은 '.bak'을 붙여 보관합니다.
+
+    Returns:
+        옮긴 항목 수
+    """
+    if seg_dir.exists():
+        return 0
+    source = next((path for path in sources if path.exists()), None)
+    if source is None:
+        return 0
+
+    if source.suffix == SEGMENT_SUFFIX:
+        items = read_from(source, 0)[0]
+    else:
+        items = _read_array_file(source)
+
+    # 임시 폴더에 다 쓴 뒤 이름을 바꿔, 중간에 실패해도 반쯤 만든 폴더가 남지 않게 함
+    tmp_dir = seg_dir.with_name(f".{seg_dir.name}.{os.getpid()}.tmp")
+    if tmp_dir.exists():
+        shutil.rmtree(tmp_dir)
+    write_partitioned(tmp_dir, items)
+    os.replace(tmp_dir, seg_dir)
+    os.replace(source, source.with_name(source.name + ".bak"))
+    return len(items)
+
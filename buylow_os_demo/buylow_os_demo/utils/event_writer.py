@@ -0,0 +1,153 @@
+# -*- coding: utf-8 -*-
+"""
+BuyLow OS - 지연 기록(write-behind) 이벤트 작성기
+
+CS 질문, 퀴즈 결과, 리스크 체크 같은 로그는 화면 응답보다 늦게 기록돼도
+괜찮습니다. 이벤트를 크기 제한이 있는 큐에 넣고, 백그라운드(daemon)
+스레드가 모아서 한 번에 기록합니다.
+
+- 배치 크기(batch_size)에 도달하거나 flush_interval이 지나면 기록
+- 큐가 가득 차면 호출한 스레드에서 바로 기록 (이벤트를 버리지 않음)
+- 인터프리터 종료 시 남은 이벤트를 모두 기록 (atexit)
+"""
+import atexit
+import queue
+import threading
+import time
+from collections import defaultdict
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+# (파일명, 항목 리스트)를 받아 기록하는 함수
+BatchWriter = Callable[[str, List[Any]], None]
+
+_STOP = object()
+
+
+class EventWriter:
+    """크기 제한 큐 + 백그라운드 스레드로 이벤트를 모아 기록합니다."""
+
+    def __init__(
+        self,
+        write_batch: BatchWriter,
+        max_queue: int = 10000,
+        batch_size: int = 200,
+        flush_interval: float = 0.5,
+    ):
+        """
+        Args:
+            write_batch: 파일명과 항목 리스트를 받아 기록하는 함수
+            max_queue: 큐에 쌓아둘 수 있는 최대 이벤트 수
+            batch_size: 이 개수가 모이면 바로 기록
+            flush_interval: 마지막 기록 후 이 시간(초)이 지나면 기록
+        """
+        self._write_batch = write_batch
+        self._queue: "queue.Queue[Any]" = queue.Queue(maxsize=max_queue)
+        self._batch_size = batch_size
+        self._flush_interval = flush_interval
+        self._pending = 0
+        self._pending_cond = threading.Condition()
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="buylow-event-writer", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def submit(self, filename: str, item: Any) -> None:
+        """
+        이벤트를 기록 대기열에 넣습니다.
+
+        큐가 가득 찼거나 작성기가 닫힌 경우 현재 스레드에서 바로 기록합니다.
+        """
+        if self._closed:
+            self._write_batch(filename, [item])
+            return
+        with self._pending_cond:
+            self._pending += 1
+        try:
+            self._queue.put_nowait((filename, item))
+        except queue.Full:
+            self._done(1)
+            self._write_batch(filename, [item])
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        대기 중인 이벤트가 모두 기록될 때까지 기다립니다.
+
+        Returns:
+            시간 안에 모두 기록됐는지 여부
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._pending_cond:
+            while self._pending > 0:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._pending_cond.wait(remaining)
+        return True
+
+    def close(self, timeout: float = 5.0) -> None:
+        """남은 이벤트를 기록하고 백그라운드 스레드를 멈춥니다."""
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(_STOP)
+        self._thread.join(timeout)
+        # 스레드가 시간 안에 끝나지 못했으면 남은 것을 직접 기록
+        leftovers = []
+        while True:
+            try:
+                entry = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if entry is not _STOP:
+                leftovers.append(entry)
+        self._write_entries(leftovers)
+
+    @property
+    def pending(self) -> int:
+        """아직 기록되지 않은 이벤트 수"""
+        return self._pending
+
+    def _done(self, count: int) -> None:
+        with self._pending_cond:
+            self._pending -= count
+            if self._pending <= 0:
+                self._pending_cond.notify_all()
+
+    def _run(self) -> None:
+        while True:
+            entry = self._queue.get()
+            if entry is _STOP:
+                return
+            batch = [entry]
+            deadline = time.monotonic() + self._flush_interval
+            stop = False
+            while len(batch) < self._batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    entry = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if entry is _STOP:
+                    stop = True
+                    break
+                batch.append(entry)
+            self._write_entries(batch)
+            if stop:
+                return
+
+    def _write_entries(self, entries: List[Tuple[str, Any]]) -> None:
+        if not entries:
+            return
+        by_file: Dict[str, List[Any]] = defaultdict(list)
+        for filename, item in entries:
+            by_file[filename].append(item)
+        try:
+            for filename, items in by_file.items():
+                try:
+                    self._write_batch(filename, items)
+                except Exception as e:  # 백그라운드 스레드가 죽지 않도록
+                    print(f"[event_writer] Warning: Failed to write {len(items)} events to {filename}: {e}")
+        finally:
+            self._done(len(entries))
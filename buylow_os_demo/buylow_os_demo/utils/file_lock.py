@@ -0,0 +1,65 @@
+# -*- coding: utf-8 -*-
+"""
+BuyLow OS - 파일 잠금
+
+같은 프로세스의 여러 세션(스레드)과 여러 프로세스 사이에서
+파일 하나에 대한 읽기-수정-쓰기를 직렬화합니다.
+POSIX에서는 fcntl.flock, Windows에서는 msvcrt.locking을 사용합니다.
+"""
+import os
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterator
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+
+_thread_locks: Dict[str, threading.Lock] = {}
+_thread_locks_guard = threading.Lock()
+
+
+def _thread_lock(path: Path) -> threading.Lock:
+    key = str(path)
+    with _thread_locks_guard:
+        lock = _thread_locks.get(key)
+        if lock is None:
+            lock = _thread_locks[key] = threading.Lock()
+        return lock
+
+
+@contextmanager
+def file_lock(path: Path) -> Iterator[None]:
+    """
+    path에 대한 배타적 잠금을 잡습니다.
+
+    잠금은 path 옆의 '.lock' 파일에 걸리므로, 잠금 중에도
+    path 자체를 os.replace로 교체할 수 있습니다.
+
+    Args:
+        path: 보호할 파일 경로
+    """
+    path = Path(path)
+    lock_path = path.with_name(path.name + ".lock")
+    with _thread_lock(lock_path):
+        fd = os.open(lock_path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            if fcntl is not None:
+                fcntl.flock(fd, fcntl.LOCK_EX)
+            else:
+                os.lseek(fd, 0, os.SEEK_SET)
+                msvcrt.locking(fd, msvcrt.LK_LOCK, 1)
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(fd, fcntl.LOCK_UN)
+                else:
+                    os.lseek(fd, 0, os.SEEK_SET)
+                    msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+        finally:
+            os.close(fd)
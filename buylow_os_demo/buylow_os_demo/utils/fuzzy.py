@@ -0,0 +1,132 @@
+# -*- coding: utf-8 -*-
+"""
+BuyLow OS - 오타 교정 (SymSpell 삭제 색인)
+
+"다이버젼스", "레버레지"처럼 잘못 입력한 단어를 KB 어휘에서 가장 가까운
+단어로 바꿉니다. 한글은 자모로 풀어 쓴 뒤 비교합니다 (utils/hangul.py).
+
+모든 어휘와 편집 거리를 계산하는 대신, 어휘마다 글자를 최대 max_distance개
+지운 문자열을 미리 색인해 둡니다. 질문 단어도 같은 방식으로 지워 보고
+색인에서 만난 어휘만 실제 편집 거리를 확인합니다.
+
+두 음절 이하의 한글 단어("저장", "매수")는 고치지 않습니다. 자모 하나만
+달라도 전혀 다른 뜻의 어휘("저항", "매도")가 되기 때문입니다.
+"""
+from collections import defaultdict
+from itertools import combinations
+from typing import Dict, List, Mapping, Optional, Set, Tuple
+
+from utils.hangul import is_hangul, to_jamo
+
+MAX_DISTANCE = 2
+# 자모 수가 이보다 짧은 단어는 한 글자 차이까지만 허용 (짧은 단어는 오교정이 잦음)
+SHORT_WORD = 7
+# 자모 수가 이보다 짧은 단어는 교정하지 않음
+MIN_LENGTH = 4
+# 음절 수가 이 이하인 한글 단어는 교정하지 않음 (한 자모 차이로 뜻이 바뀜)
+MIN_HANGUL_SYLLABLES = 2
+
+
+def deletes(word: str, distance: int) -> Set[str]:
+    """글자를 최대 distance개 지운 문자열 전체 (원래 단어 포함)"""
+    results = {word}
+    for n in range(1, min(distance, len(word)) + 1):
+        for positions in combinations(range(len(word)), n):
+            removed = set(positions)
+            results.add("".join(ch for i, ch in enumerate(word) if i not in removed))
+    return results
+
+
+def edit_distance(a: str, b: str, limit: int) -> int:
+    """
+    인접 글자 바꿈을 포함한 편집 거리 (Damerau-Levenshtein, OSA).
+
+    limit을 넘으면 limit + 1을 반환합니다.
+    """
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    previous2: List[int] = []
+    previous = list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        current = [i] + [0] * len(b)
+        for j in range(1, len(b) + 1):
+            cost = 0 if a[i - 1] == b[j - 1] else 1
+            current[j] = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost)
+            if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                current[j] = min(current[j], previous2[j - 2] + 1)
+        if min(current) > limit:
+            return limit + 1
+        previous2, previous = previous, current
+    return min(previous[-1], limit + 1)
+
+
+def allowed_distance(length: int, max_distance: int = MAX_DISTANCE) -> int:
+    """자모 길이에 따라 허용하는 편집 거리"""
+    if length < MIN_LENGTH:
+        return 0
+    if length < SHORT_WORD:
+        return min(1, max_distance)
+    return max_distance
+
+
+class SymSpellIndex:
+    """어휘에 대한 삭제 색인"""
+
+    def __init__(self, vocabulary: Mapping[str, int], max_distance: int = MAX_DISTANCE):
+        """
+        Args:
+            vocabulary: {어휘: 빈도} (빈도는 거리가 같은 후보 사이의 우선순위)
+            max_distance: 허용하는 최대 자모 편집 거리
+        """
+        self.max_distance = max_distance
+        # 자모 문자열 -> (원래 단어, 빈도)
+        self._words: Dict[str, Tuple[str, int]] = {
+            to_jamo(word): (word, count) for word, count in vocabulary.items()
+        }
+
+        self._deletes: Dict[str, List[str]] = defaultdict(list)
+        for jamo in self._words:
+            for deleted in deletes(jamo, allowed_distance(len(jamo), max_distance)):
+                self._deletes[deleted].append(jamo)
+        self._deletes = dict(self._deletes)
+
+    def __contains__(self, word: str) -> bool:
+        return to_jamo(word) in self._words
+
+    def lookup(self, word: str) -> Optional[Tuple[str, int]]:
+        """
+        가장 가까운 어휘를 찾습니다.
+
+        거리가 같으면 빈도가 높은 어휘, 그다음 사전 순으로 고릅니다.
+
+        Returns:
+            (어휘, 자모 편집 거리). 허용 거리 안에 없으면 None
+        """
+        jamo = to_jamo(word)
+        if jamo in self._words:
+            return self._words[jamo][0], 0
+        if is_hangul(word) and len(word) <= MIN_HANGUL_SYLLABLES:
+            return None
+        limit = allowed_distance(len(jamo), self.max_distance)
+        if limit == 0:
+            return None
+
+        best = None
+        seen = set()
+        for deleted in deletes(jamo, limit):
+            for candidate in self._deletes.get(deleted, ()):
+                if candidate in seen:
+                    continue
+                seen.add(candidate)
+                # 어휘 쪽 허용 거리도 넘지 않아야 함 (짧은 어휘로의 과한 교정 방지)
+                candidate_limit = min(limit, allowed_distance(len(candidate), self.max_distance))
+                distance = edit_distance(jamo, candidate, candidate_limit)
+                if distance > candidate_limit:
+                    continue
+                original, count = self._words[candidate]
+                key = (distance, -count, original)
+                if best is None or key < best[0]:
+                    best = (key, original, distance)
+        if best is None:
+            return None
+        return best[1], best[2]
@@ -0,0 +1,87 @@
+# -*- coding: utf-8 -*-
+"""
+BuyLow OS - 한국어 검색용 토큰화
+
+한국어는 조사가 단어에 붙기 때문에("다이버전스가", "손절을") 공백 단위 단어로는
+같은 말끼리도 일치하지 않습니다. 그래서 한글은 글자 2-gram/3-gram으로,
+영문/숫자는 단어로 나눕니다.
+
+    >>> tokenize("RSI 다이버전스가")
+    ['rsi', '다이', '이버', '버전', '전스', '스가', '다이버', '이버전', '버전스', '전스가']
+
+오타 교정(utils/fuzzy.py)에는 음절을 자모로 풀어 쓴 문자열을 사용합니다.
+"다이버젼스"와 "다이버전스"는 음절로는 한 글자가 다르지만 자모로는
+ㅕ/ㅓ 하나만 다르므로 더 정확한 편집 거리를 얻을 수 있습니다.
+"""
+import re
+from typing import List
+
+# 한글 음절 덩어리 / 그 밖의 단어 문자 덩어리 (밑줄 제외)
+_RUN_RE = re.compile(r'[가-힣]+|[^\W_가-힣]+')
+_HANGUL_RE = re.compile(r'[가-힣]')
+
+NGRAM_SIZES = (2, 3)
+
+_SYLLABLE_BASE = 0xAC00
+_SYLLABLE_LAST = 0xD7A3
+_CHOSEONG = "ㄱㄲㄴㄷㄸㄹㅁㅂㅃㅅㅆㅇㅈㅉㅊㅋㅌㅍㅎ"
+_JUNGSEONG = "ㅏㅐㅑㅒㅓㅔㅕㅖㅗㅘㅙㅚㅛㅜㅝㅞㅟㅠㅡㅢㅣ"
+_JONGSEONG = ("", "ㄱ", "ㄲ", "ㄳ", "ㄴ", "ㄵ", "ㄶ", "ㄷ", "ㄹ", "ㄺ", "ㄻ", "ㄼ", "ㄽ", "ㄾ",
+              "ㄿ", "ㅀ", "ㅁ", "ㅂ", "ㅄ", "ㅅ", "ㅆ", "ㅇ", "ㅈ", "ㅊ", "ㅋ", "ㅌ", "ㅍ", "ㅎ")
+
+
+def is_hangul(text: str) -> bool:
+    """한글 음절로 시작하는지 여부"""
+    return bool(_HANGUL_RE.match(text))
+
+
+def to_jamo(text: str) -> str:
+    """
+    한글 음절을 초성/중성/종성 자모로 풀어 씁니다 (그 밖의 글자는 그대로).
+
+        >>> to_jamo("전스")
+        'ㅈㅓㄴㅅㅡ'
+    """
+    chars = []
+    for ch in text:
+        code = ord(ch)
+        if _SYLLABLE_BASE <= code <= _SYLLABLE_LAST:
+            offset = code - _SYLLABLE_BASE
+            chars.append(_CHOSEONG[offset // 588])
+            chars.append(_JUNGSEONG[(offset % 588) // 28])
+            chars.append(_JONGSEONG[offset % 28])
+        else:
+            chars.append(ch)
+    return "".join(chars)
+
+
+def char_ngrams(word: str, sizes=NGRAM_SIZES) -> List[str]:
+    """
+    글자 n-gram 목록. 가장 작은 n보다 짧은 단어는 단어 그대로 반환합니다.
+
+    Args:
+        word: 한 단어 (공백 없음)
+        sizes: n 목록
+    """
+    if len(word) < min(sizes):
+        return [word]
+    grams = []
+    for n in sizes:
+        grams.extend(word[i:i + n] for i in range(len(word) - n + 1))
+    return grams
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    검색용 토큰 목록 (중복 포함, 순서 유지).
+
+    - 한글: 글자 2-gram + 3-gram
+    - 영문/숫자 등: 소문자 단어
+    """
+    tokens = []
+    for run in _RUN_RE.findall(text.lower()):
+        if is_hangul(run):
+            tokens.extend(char_ngrams(run))
+        else:
+            tokens.append(run)
+    return tokens
@@ -0,0 +1,146 @@
+# -*- coding: utf-8 -*-
+"""
+BuyLow OS - 여러 파일 원자적 교체 (redo 저널)
+
+작업 단위(transaction) 하나가 여러 파일을 바꿀 때, 모두 바뀌거나
+하나도 바뀌지 않도록 합니다.
+
+1. 새 내용을 각 파일 옆 임시 파일에 쓰고 fsync (한 번의 fsync 패스)
+2. "어떤 임시 파일을 어디로 옮길지"를 저널 파일에 기록하고 fsync (커밋 시점)
+3. os.replace로 차례로 교체한 뒤 폴더를 fsync하고 저널 삭제
+
+2단계 이전에 중단되면 원본은 그대로이고, 이후에 중단되면 다음 실행 시
+recover()가 저널을 보고 남은 교체를 마저 수행합니다.
+"""
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Iterable, List, Tuple
+
+JOURNAL_SUFFIX = ".journal"
+
+
+def new_txid() -> str:
+    return f"{time.time_ns()}-{os.getpid()}-{threading.get_ident()}"
+
+
+def stage(path: Path, payload: bytes, txid: str) -> Path:
+    """
+    path 옆의 임시 파일에 내용을 쓰고 fsync합니다.
+
+    Returns:
+        임시 파일 경로
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f".{path.name}.{txid}.tmp")
+    with open(tmp_path, "wb") as f:
+        f.write(payload)
+        f.flush()
+        os.fsync(f.fileno())
+    return tmp_path
+
+
+def discard(tmp_paths: Iterable[Path]) -> None:
+    """커밋하지 않은 임시 파일을 지웁니다."""
+    for tmp_path in tmp_paths:
+        try:
+            tmp_path.unlink()
+        except FileNotFoundError:
+            pass
+
+
+def _fsync_dir(path: Path) -> None:
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except OSError:
+        # Windows는 폴더를 열 수 없음 (os.replace 자체가 메타데이터를 기록함)
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def _apply(base: Path, record: dict) -> List[Path]:
+    """저널 내용대로 교체/삭제합니다. 이미 교체된 항목은 건너뜁니다."""
+    touched = []
+    for tmp_name, dst_name in record.get("renames", []):
+        tmp_path, dst_path = base / tmp_name, base / dst_name
+        if tmp_path.exists():
+            os.replace(tmp_path, dst_path)
+        touched.append(dst_path.parent)
+    for name in record.get("deletes", []):
+        path = base / name
+        try:
+            path.unlink()
+        except FileNotFoundError:
+            pass
+        touched.append(path.parent)
+    return touched
+
+
+def _relative(path: Path, base: Path) -> str:
+    return Path(os.path.relpath(path, base)).as_posix()
+
+
+def commit(journal_dir: Path, base: Path, txid: str,
+           renames: List[Tuple[Path, Path]], deletes: List[Path]) -> None:
+    """
+    준비된 임시 파일들을 한꺼번에 제자리로 옮깁니다.
+
+    Args:
+        journal_dir: 저널 폴더
+        base: 저널에 기록할 경로의 기준 폴더 (data/)
+        txid: 작업 단위 ID (stage에 넘긴 값)
+        renames: (임시 파일, 대상 파일) 목록
+        deletes: 삭제할 파일 목록
+    """
+    record = {
+        "renames": [[_relative(tmp, base), _relative(dst, base)] for tmp, dst in renames],
+        "deletes": [_relative(path, base) for path in deletes],
+    }
+    journal_dir.mkdir(parents=True, exist_ok=True)
+    journal_path = journal_dir / (txid + JOURNAL_SUFFIX)
+    tmp_path = journal_dir / f".{txid}{JOURNAL_SUFFIX}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(record, f, ensure_ascii=False)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, journal_path)
+    _fsync_dir(journal_dir)
+
+    # 여기부터는 커밋된 것으로 봅니다 (중단돼도 recover가 마저 수행)
+    for directory in set(_apply(base, record)):
+        _fsync_dir(directory)
+    journal_path.unlink()
+
+
+def recover(journal_dir: Path, base: Path) -> int:
+    """
+    중단된 커밋을 마저 수행합니다 (프로세스 시작 시 한 번).
+
+    Returns:
+        복구한 작업 단위 수
+    """
+    if not journal_dir.is_dir():
+        return 0
+    recovered = 0
+    for journal_path in sorted(journal_dir.glob("*" + JOURNAL_SUFFIX)):
+        try:
+            with open(journal_path, "r", encoding="utf-8") as f:
+                record = json.load(f)
+        except (ValueError, OSError) as e:
+            print(f"[journal] Warning: Skipping unreadable journal {journal_path.name}: {e}")
+            continue
+        for directory in set(_apply(base, record)):
+            _fsync_dir(directory)
+        journal_path.unlink()
+        recovered += 1
+    # 저널을 다 쓰기 전에 중단된 커밋의 흔적
+    for tmp_path in journal_dir.glob("." + "*" + JOURNAL_SUFFIX + ".tmp"):
+        tmp_path.unlink()
+    return recovered
@@ -0,0 +1,419 @@
+# -*- coding: utf-8 -*-
+"""
+BuyLow OS - CS 지식베이스(kb.json) 검색 인덱스
+
+kb.json이 바뀔 때마다 한 번만 만들어 두고, 질문마다 문서 전체를 다시
+정규화하지 않도록 합니다.
+
+- 단어 인덱스: 정규화한 단어 -> (문서, 슬롯) 목록
+- 구문 인덱스: 키워드/제목 구문의 앞 2글자 -> (구문, 문서, 슬롯) 목록
+  (질문의 각 위치에서 앞 2글자로 찾은 구문만 비교)
+
+슬롯은 문서 안의 키워드 순서이며, 제목은 TITLE_SLOT입니다.
+규칙 점수(score)는 예전 전체 탐색과 같고, 답변 판정 기준(10점/5점)과
+로그에 그대로 쓰입니다.
+
+- 키워드 구문이 질문에 포함되면 10점, 아니면 겹치는 단어마다 3점
+- 제목 구문이 질문에 포함되면 15점, 아니면 겹치는 단어마다 5점
+
+순위는 (규칙 점수, BM25 관련도) 순으로 정합니다. BM25(utils/kb_search.py)는
+한글 n-gram으로 조사가 붙은 말("다이버전스가")도 찾으므로, 규칙 점수가 같은
+문서 사이의 순서를 정하고 규칙으로는 못 찾는 후보를 보태 줍니다.
+
+답을 찾지 못하면(규칙 점수 10점 미만) KB 어휘에 없는 단어를 가장 가까운
+어휘로 고쳐("다이버젼스" -> "다이버전스") 한 번 더 검색합니다 (utils/fuzzy.py).
+고친 질문의 결과는 추측이므로 규칙 점수를 CORRECTED_MAX_SCORE로 낮춰
+"부분 일치"로만 보여 주고, 고친 질문은 "혹시 …?" 제안으로 따로 띄웁니다.
+
+인덱스를 만들 때 관련 항목 표(utils/kb_related.py)도 함께 갱신해 둡니다.
+"""
+import re
+import threading
+from collections import OrderedDict, defaultdict
+from typing import Any, Dict, List, Mapping, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+
+from utils.data_utils import get_data_version, load_json
+from utils.fuzzy import SymSpellIndex
+from utils.hangul import is_hangul
+from utils.kb_related import refresh_related
+from utils.kb_service import KBService
+from utils.kb_search import BM25Index, top_indices
+
+KB_FILE = "kb.json"
+TITLE_SLOT = -1
+
+KEYWORD_PHRASE_SCORE = 10
+KEYWORD_WORD_SCORE = 3
+TITLE_PHRASE_SCORE = 15
+TITLE_WORD_SCORE = 5
+
+# 학습한 점수 가중치 (tools/train_kb_weights.py가 만듦, 없으면 위 기본값)
+WEIGHTS_FILE = "kb_weights.json"
+DEFAULT_FIELD_WEIGHTS = {
+    "keyword_phrase": KEYWORD_PHRASE_SCORE,
+    "keyword_word": KEYWORD_WORD_SCORE,
+    "title_phrase": TITLE_PHRASE_SCORE,
+    "title_word": TITLE_WORD_SCORE,
+}
+
+# 1위와 함께 보여줄 결과 수 (1위 포함)
+RESULT_COUNT = 4
+# kb.json 변경 확인 주기 (초)
+KB_POLL_INTERVAL = 2.0
+
+# 검색 결과 캐시에 보관할 질문 수
+QUERY_CACHE_SIZE = 1024
+
+# 1위와 2위의 규칙 점수 차이가 이보다 작으면 답을 찾았어도 다른 결과를 함께 보여줌
+CLOSE_GAP = 10
+
+# 오타를 고쳐 찾은 결과의 최대 규칙 점수 (답을 찾은 기준 10점보다 낮게)
+CORRECTED_MAX_SCORE = KEYWORD_PHRASE_SCORE - 1
+
+_PUNCT_RE = re.compile(r'[^\w\s가-힣]')
+_SPACE_RE = re.compile(r'\s+')
+
+
+class SearchHit(NamedTuple):
+    """검색 결과 한 건"""
+    doc: Any
+    score: int          # 규칙 점수 (판정 기준)
+    relevance: float    # BM25 관련도 (순위 보조)
+
+
+class SearchResult(NamedTuple):
+    """질문 하나의 검색 결과"""
+    hits: Tuple[SearchHit, ...]   # 순위 순 (최대 k개)
+    gap: int                # 1위와 2위의 규칙 점수 차이 (2위가 없으면 1위 점수)
+    corrected: Optional[str] = None   # 오타를 고쳐 다시 검색했다면 고친 질문 (제안용)
+
+    @property
+    def best(self) -> Tuple[Optional[Any], int]:
+        """(1위 문서, 규칙 점수). 규칙 점수가 0이면 (None, 0)"""
+        if not self.hits or self.hits[0].score <= 0:
+            return None, 0
+        return self.hits[0].doc, self.hits[0].score
+
+    @property
+    def runners_up(self) -> Tuple[SearchHit, ...]:
+        return self.hits[1:]
+
+
+def confidence_gap(hits: Sequence[SearchHit]) -> int:
+    """1위와 2위의 규칙 점수 차이 (작을수록 1위를 확신하기 어려움)"""
+    if not hits:
+        return 0
+    if len(hits) == 1:
+        return hits[0].score
+    return hits[0].score - hits[1].score
+
+
+def normalize_text(text: str) -> str:
+    """소문자로 바꾸고 문장부호를 공백으로 바꾼 뒤 연속 공백을 하나로 줄입니다."""
+    text = text.lower().strip()
+    text = _PUNCT_RE.sub(' ', text)
+    return _SPACE_RE.sub(' ', text)
+
+
+class KBIndex:
+    """kb.json 한 버전에 대한 검색 인덱스"""
+
+    def __init__(self, docs: Sequence[Any], version: Any = None,
+                 related: Optional[Mapping[str, Sequence[Any]]] = None,
+                 weights: Optional[Mapping[str, Any]] = None):
+        """
+        Args:
+            docs: KB 문서 목록
+            version: 데이터 버전
+            related: {str(문서 id): 관련 문서 id 목록} (utils/kb_related.py)
+            weights: 학습한 가중치 {"fields": {...}, "keywords": {정규화한 키워드: 배율}}
+                (None이면 기본 점수)
+        """
+        self.docs = tuple(docs)
+        self.version = version
+        self._by_id = {str(doc.get('id')): doc for doc in self.docs}
+        self._related = dict(related or {})
+        weights = weights or {}
+        self.field_weights = dict(DEFAULT_FIELD_WEIGHTS)
+        self.field_weights.update(weights.get('fields') or {})
+        self._keyword_weights = dict(weights.get('keywords') or {})
+        # (문서, 슬롯) -> (구문 일치 점수, 겹친 단어당 점수). 색인할 때 한 번만 계산
+        self._points: Dict[Tuple[int, int], Tuple[int, int]] = {}
+        self._words: Dict[str, List[Tuple[int, int]]] = defaultdict(list)
+        self._phrases: Dict[str, List[Tuple[str, int, int]]] = defaultdict(list)
+        # 빈 구문은 어떤 질문에도 포함됨 (예전 `"" in query`와 같게)
+        self._always: List[Tuple[int, int]] = []
+
+        for doc_idx, doc in enumerate(self.docs):
+            for slot, keyword in enumerate(doc.get('keywords', ())):
+                self._add(normalize_text(keyword), doc_idx, slot)
+            self._add(normalize_text(doc.get('title', '')), doc_idx, TITLE_SLOT)
+        self._words = dict(self._words)
+        self._phrases = dict(self._phrases)
+        self.bm25 = BM25Index(self.docs)
+        self.speller = SymSpellIndex({word: len(postings) for word, postings in self._words.items()})
+
+    def _add(self, phrase: str, doc_idx: int, slot: int) -> None:
+        if slot == TITLE_SLOT:
+            points = (self.field_weights['title_phrase'], self.field_weights['title_word'])
+        else:
+            scale = self._keyword_weights.get(phrase, 1.0)
+            points = (self.field_weights['keyword_phrase'] * scale, self.field_weights['keyword_word'] * scale)
+        self._points[(doc_idx, slot)] = (int(round(points[0])), int(round(points[1])))
+        if phrase:
+            self._phrases[phrase[:2]].append((phrase, doc_idx, slot))
+        else:
+            self._always.append((doc_idx, slot))
+        for word in set(phrase.split()):
+            self._words[word].append((doc_idx, slot))
+
+    def _matched_phrases(self, query_norm: str) -> set:
+        matched = set(self._always)
+        phrases = self._phrases
+        for i in range(len(query_norm)):
+            for key in (query_norm[i:i + 2], query_norm[i]):
+                for phrase, doc_idx, slot in phrases.get(key, ()):
+                    if query_norm.startswith(phrase, i):
+                        matched.add((doc_idx, slot))
+                if len(key) == 1:
+                    break
+        return matched
+
+    def hits(self, query: str) -> Tuple[set, Dict[Tuple[int, int], int]]:
+        """
+        질문이 맞힌 키워드/제목을 찾습니다.
+
+        Returns:
+            ({구문이 질문에 포함된 (문서, 슬롯)}, {단어만 겹친 (문서, 슬롯): 겹친 단어 수})
+        """
+        query_norm = normalize_text(query)
+        phrase_hits = self._matched_phrases(query_norm)
+
+        word_hits: Dict[Tuple[int, int], int] = defaultdict(int)
+        for word in set(query_norm.split()):
+            for posting in self._words.get(word, ()):
+                word_hits[posting] += 1
+        for posting in phrase_hits:
+            word_hits.pop(posting, None)
+        return phrase_hits, word_hits
+
+    def scores(self, query: str) -> Dict[int, int]:
+        """
+        질문과 관련된 문서(후보)만 점수를 매깁니다.
+
+        Returns:
+            {문서 순번: 점수} (점수가 0인 문서는 없음)
+        """
+        phrase_hits, word_hits = self.hits(query)
+        points = self._points
+        scores: Dict[int, int] = defaultdict(int)
+        for posting in phrase_hits:
+            scores[posting[0]] += points[posting][0]
+        for posting, count in word_hits.items():
+            scores[posting[0]] += count * points[posting][1]
+        return {doc_idx: score for doc_idx, score in scores.items() if score > 0}
+
+    def _correct_word(self, word: str) -> str:
+        if word in self._words:
+            return word
+        # 조사가 붙은 단어는 끝 음절을 떼어 본 줄기도 찾음 ("다이버젼스가" -> "다이버젼스")
+        stems = [word]
+        if is_hangul(word):
+            stems.extend(word[:-cut] for cut in (1, 2) if len(word) - cut >= 2)
+        if any(stem in self._words for stem in stems[1:]):
+            return word
+        best = None
+        for stem in stems:
+            found = self.speller.lookup(stem)
+            if found is not None and (best is None or found[1] < best[1]):
+                best = found
+        return best[0] if best is not None else word
+
+    def correct(self, query: str) -> str:
+        """
+        KB 어휘에 없는 단어를 허용 거리 안의 가장 가까운 어휘로 바꿉니다.
+
+        Returns:
+            정규화한 질문 (고칠 단어가 없으면 정규화만 한 질문)
+        """
+        return " ".join(self._correct_word(word) for word in normalize_text(query).split())
+
+    def search(self, query: str, k: int = 5) -> List[SearchHit]:
+        """
+        (규칙 점수, BM25 관련도)가 높은 문서 k개를 찾습니다.
+
+        규칙 점수가 0이어도 BM25로 찾은 문서는 결과에 포함됩니다.
+
+        Returns:
+            SearchHit 목록 (순위 순)
+        """
+        scores = self.scores(query)
+        relevance = self.bm25.scores(query).astype(np.float64)
+        # 규칙 점수가 항상 먼저 오도록 BM25 최댓값보다 큰 단위로 더함
+        ranking = relevance.copy()
+        if scores:
+            unit = float(relevance.max()) + 1.0
+            doc_ids = np.fromiter(scores.keys(), dtype=np.int64, count=len(scores))
+            ranking[doc_ids] += np.fromiter(scores.values(), dtype=np.float64, count=len(scores)) * unit
+        return [
+            SearchHit(self.docs[i], scores.get(i, 0), float(relevance[i]))
+            for i in top_indices(ranking, k)
+        ]
+
+    def lookup(self, query: str, k: int = RESULT_COUNT) -> SearchResult:
+        """
+        상위 k개 문서와 1위/2위 점수 차이를 함께 반환합니다.
+
+        오타를 고쳐 찾은 결과는 규칙 점수가 CORRECTED_MAX_SCORE를 넘지 않습니다.
+
+        Args:
+            query: 질문
+            k: 결과 수 (1위 포함)
+        """
+        hits = tuple(self.search(query, k))
+        result = SearchResult(hits, confidence_gap(hits))
+        score = result.best[1]
+        if score >= KEYWORD_PHRASE_SCORE:
+            return result
+
+        corrected = self.correct(query)
+        if corrected == normalize_text(query).strip():
+            return result
+        corrected_hits = tuple(
+            hit._replace(score=min(hit.score, CORRECTED_MAX_SCORE))
+            for hit in self.search(corrected, k)
+        )
+        if corrected_hits and corrected_hits[0].score > score:
+            return SearchResult(corrected_hits, confidence_gap(corrected_hits), corrected)
+        return result
+
+    def related(self, doc: Any) -> List[Any]:
+        """미리 계산해 둔 관련 문서 (계산 없이 목록만 읽음)"""
+        ids = self._related.get(str(doc.get('id')), ())
+        return [self._by_id[str(i)] for i in ids if str(i) in self._by_id]
+
+    def match(self, query: str) -> Tuple[Optional[Any], int]:
+        """
+        가장 순위가 높은 문서를 찾습니다.
+
+        Returns:
+            (문서, 규칙 점수). 규칙 점수가 0이면 (None, 0)
+        """
+        return self.lookup(query, k=1).best
+
+
+class QueryCache:
+    """
+    검색 결과 LRU 캐시 (모든 세션 공유).
+
+    키는 (정규화한 질문, KB 버전, k)입니다. 점수는 정규화한 질문으로만
+    정해지므로 "RSI"와 "rsi", "손절  방법"과 "손절 방법"은 같은 결과를 씁니다.
+    """
+
+    def __init__(self, maxsize: int = QUERY_CACHE_SIZE):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[tuple, SearchResult]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: tuple) -> Optional[SearchResult]:
+        with self._lock:
+            result = self._entries.get(key)
+            if result is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return result
+
+    def put(self, key: tuple, result: SearchResult) -> None:
+        with self._lock:
+            self._entries[key] = result
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"size": len(self._entries), "hits": self.hits, "misses": self.misses}
+
+
+_query_cache = QueryCache()
+_kb_service: Optional[KBService] = None
+_kb_service_lock = threading.Lock()
+
+
+def _build_index(version: Any) -> KBIndex:
+    docs = load_json(KB_FILE, default=[], readonly=True)
+    weights = load_json(WEIGHTS_FILE, default={}, readonly=True)
+    return KBIndex(docs, version, related=refresh_related(docs), weights=weights)
+
+
+def _index_version() -> Any:
+    kb_version = get_data_version(KB_FILE)
+    if kb_version is None:
+        return None
+    # 가중치 파일은 없어도 됨 (None이면 기본 점수)
+    return kb_version, get_data_version(WEIGHTS_FILE)
+
+
+def _on_index_swap(index: KBIndex) -> None:
+    # 이전 버전의 결과는 다시 쓰이지 않음
+    _query_cache.clear()
+
+
+def get_kb_service() -> KBService:
+    """프로세스 공용 KB 서비스를 반환합니다 (처음 호출 시 인덱스를 만들고 감시 시작)."""
+    global _kb_service
+    if _kb_service is None:
+        with _kb_service_lock:
+            if _kb_service is None:
+                _kb_service = KBService(
+                    _build_index,
+                    _index_version,
+                    poll_interval=KB_POLL_INTERVAL,
+                    on_swap=_on_index_swap,
+                )
+    return _kb_service
+
+
+def get_kb_index() -> KBIndex:
+    """
+    현재 검색 인덱스를 반환합니다.
+
+    kb.json이 바뀌면 KB 서비스가 백그라운드에서 새 인덱스를 만들어 교체하므로,
+    이 함수는 파일을 확인하거나 인덱스를 만들지 않습니다.
+    """
+    return get_kb_service().index
+
+
+def search_kb(query: str, k: int = RESULT_COUNT) -> SearchResult:
+    """
+    현재 kb.json에서 질문을 검색합니다 (같은 질문은 캐시에서 바로 반환).
+
+    Args:
+        query: 질문
+        k: 결과 수 (1위 포함)
+    """
+    index = get_kb_index()
+    key = (normalize_text(query), index.version, k)
+    if index.version is not None:
+        cached = _query_cache.get(key)
+        if cached is not None:
+            return cached
+    result = index.lookup(query, k)
+    if index.version is not None:
+        _query_cache.put(key, result)
+    return result
+
+
+def query_cache_stats() -> Dict[str, int]:
+    """검색 결과 캐시 상태 ({"size", "hits", "misses"})"""
+    return _query_cache.stats()
@@ -0,0 +1,267 @@
+# -*- coding: utf-8 -*-
+"""
+BuyLow OS - KB 관련 항목 (TF-IDF 코사인 유사도)
+
+KB 항목마다 내용이 가장 비슷한 항목 RELATED_COUNT개를 미리 계산해
+kb_related.json에 저장합니다. cs_chat은 저장된 목록을 읽기만 하므로
+질문 시에는 계산이 없습니다.
+
+- 문서-단어 행렬: utils/kb_search.py와 같은 토큰과 필드 가중치로 tf를 세고,
+  tf는 1 + log(tf), idf는 log((1 + N) / (1 + df)) + 1, 행마다 L2 정규화
+  (희소 CSR 행렬, 0이 아닌 값만 저장)
+- 유사도: 행 SIMILARITY_BLOCK개씩, 자주 나오는 단어는 작은 밀집 배열의 곱으로,
+  나머지는 열별 포스팅을 더해 계산 (정규화했으므로 내적 = 코사인 유사도).
+  문서 수 x 단어 수, 문서 수 x 문서 수 행렬은 만들지 않음
+- 항목마다 내용 해시를 함께 저장하여, KB가 바뀌면 바뀐 항목과 그 영향을
+  받는 항목의 행만 다시 계산 (항목의 절반 이상이 바뀌면 전체를 다시 계산).
+  항목별 tf도 해시로 기억해 두어 바뀐 항목만 다시 토큰화
+
+증분 갱신에서는 idf가 조금 달라져도 영향받지 않은 항목의 목록은 그대로 둡니다.
+
+저장 형식:
+    {"count": 3, "entries": {"<id>": {"hash": "...", "related": [[id, 유사도], ...]}}}
+"""
+import hashlib
+import json
+import sys
+from collections import Counter
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Set, Tuple
+
+import numpy as np
+
+from utils.data_utils import load_json, save_json, thaw
+from utils.kb_search import FIELD_WEIGHTS, field_tokens, top_indices
+
+RELATED_FILE = "kb_related.json"
+RELATED_COUNT = 3
+# 이보다 덜 비슷한 항목은 관련 항목으로 보여주지 않음
+MIN_SIMILARITY = 0.1
+
+# 문서 빈도가 문서 수의 1/DENSE_DF_RATIO 이상인 열은 밀집 배열로 계산 (최대 MAX_DENSE_COLUMNS개)
+DENSE_DF_RATIO = 64
+MAX_DENSE_COLUMNS = 512
+# 유사도를 한 번에 계산하는 행 수 (메모리: 행 수 x 문서 수)
+SIMILARITY_BLOCK = 256
+
+# 문서 하나의 (토큰, tf)
+TermCounts = Tuple[Tuple[str, ...], np.ndarray]
+
+
+def entry_key(doc: Mapping) -> str:
+    return str(doc.get("id"))
+
+
+def entry_hash(doc: Mapping) -> str:
+    """유사도에 쓰는 필드의 내용 해시"""
+    content = {field: doc.get(field) for field in FIELD_WEIGHTS}
+    payload = json.dumps(content, ensure_ascii=False, sort_keys=True, default=list)
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+
+class TfidfMatrix:
+    """
+    행마다 L2 정규화한 희소 TF-IDF 문서-단어 행렬.
+
+    대부분의 문서에 나오는 단어(글자 2-gram 등)는 포스팅이 길어 유사도 계산의
+    대부분을 차지하므로, 문서 빈도가 높은 열 최대 MAX_DENSE_COLUMNS개만
+    (문서 수 x 열 수) 밀집 배열로 두고 행렬 곱으로 계산합니다. 나머지 열은
+    열별 포스팅으로 더합니다.
+    """
+
+    def __init__(self, counts: Sequence[TermCounts]):
+        """
+        Args:
+            counts: 문서별 (토큰, 필드 가중치를 곱한 tf) (term_counts 참고)
+        """
+        self.size = len(counts)
+        vocabulary: Dict[str, int] = {}
+        for tokens, _ in counts:
+            for token in tokens:
+                vocabulary.setdefault(token, len(vocabulary))
+
+        lengths = np.fromiter((len(tokens) for tokens, _ in counts), dtype=np.int64, count=self.size)
+        # CSR: 행 i의 열 번호와 값은 indices/data[indptr[i]:indptr[i + 1]]
+        self.indptr = np.zeros(self.size + 1, dtype=np.int64)
+        np.cumsum(lengths, out=self.indptr[1:])
+        nnz = int(self.indptr[-1])
+        self.indices = np.fromiter((vocabulary[t] for tokens, _ in counts for t in tokens),
+                                   dtype=np.int64, count=nnz)
+        data = np.concatenate([tf for _, tf in counts] + [np.zeros(0, dtype=np.float32)])
+
+        data = 1.0 + np.log(data)
+        df = np.bincount(self.indices, minlength=len(vocabulary))
+        data *= (np.log((1.0 + self.size) / (1.0 + df)) + 1.0).astype(np.float32)[self.indices]
+        row_ids = np.repeat(np.arange(self.size), lengths)
+        norms = np.sqrt(np.bincount(row_ids, weights=data.astype(np.float64) ** 2, minlength=self.size))
+        data /= norms.astype(np.float32)[row_ids]
+        self.data = data
+
+        # 문서 빈도가 높은 열: 밀집 배열 (문서 수 x 열 수)
+        frequent = np.flatnonzero(df * DENSE_DF_RATIO >= max(self.size, 1))
+        frequent = frequent[np.argsort(-df[frequent], kind="stable")[:MAX_DENSE_COLUMNS]]
+        dense_column = np.full(len(vocabulary), -1, dtype=np.int64)
+        dense_column[frequent] = np.arange(len(frequent))
+        in_dense = dense_column[self.indices] >= 0
+        self._dense = np.zeros((self.size, len(frequent)), dtype=np.float32)
+        self._dense[row_ids[in_dense], dense_column[self.indices[in_dense]]] = data[in_dense]
+
+        # 나머지 열: 열별 포스팅 (열 j의 행 번호와 값은 _rows/_values[_colptr[j]:_colptr[j + 1]])
+        self._sparse_entry = ~in_dense
+        order = np.flatnonzero(self._sparse_entry)
+        order = order[np.argsort(self.indices[order], kind="stable")]
+        self._rows = row_ids[order]
+        self._values = data[order]
+        self._colptr = np.zeros(len(vocabulary) + 1, dtype=np.int64)
+        np.cumsum(np.where(dense_column >= 0, 0, df), out=self._colptr[1:])
+
+    def similarities(self, rows: Sequence[int]) -> np.ndarray:
+        """
+        rows의 각 행과 모든 행의 코사인 유사도.
+
+        Args:
+            rows: 행 번호 (한 개 이상)
+
+        Returns:
+            (len(rows), 문서 수) float32 배열 (자기 자신 포함)
+        """
+        rows = np.asarray(rows, dtype=np.int64)
+        result = self._dense[rows] @ self._dense.T
+
+        # 행마다 희소 열의 포스팅 구간을 이어 붙여 한 번에 더함
+        columns, weights, owners = [], [], []
+        for i, row in enumerate(rows):
+            begin, end = self.indptr[row], self.indptr[row + 1]
+            sparse = self._sparse_entry[begin:end]
+            columns.append(self.indices[begin:end][sparse])
+            weights.append(self.data[begin:end][sparse])
+            owners.append(np.full(int(sparse.sum()), i, dtype=np.int64))
+        columns = np.concatenate(columns)
+        starts = self._colptr[columns]
+        lengths = self._colptr[columns + 1] - starts
+        positions = np.repeat(starts - np.cumsum(lengths) + lengths, lengths) + np.arange(lengths.sum())
+        products = self._values[positions] * np.repeat(np.concatenate(weights), lengths)
+        cells = np.repeat(np.concatenate(owners), lengths) * self.size + self._rows[positions]
+        result += np.bincount(cells, weights=products, minlength=len(rows) * self.size) \
+            .reshape(len(rows), self.size).astype(np.float32)
+        return result
+
+
+# 항목 내용 해시 -> tf (마지막으로 계산한 KB의 항목만 보관)
+_term_counts: Dict[str, TermCounts] = {}
+
+
+def term_counts(doc: Mapping) -> TermCounts:
+    """
+    필드 가중치를 곱한 tf.
+
+    Returns:
+        (토큰 tuple, tf float32 배열). 캐시에 오래 두므로 dict 대신 작은 형태로 반환
+    """
+    tf: Counter = Counter()
+    for field, weight in FIELD_WEIGHTS.items():
+        for token in field_tokens(doc.get(field)):
+            tf[token] += weight
+    return tuple(sys.intern(t) for t in tf), np.fromiter(tf.values(), dtype=np.float32, count=len(tf))
+
+
+def tfidf_matrix(docs: Sequence[Mapping], hashes: Optional[Sequence[str]] = None) -> TfidfMatrix:
+    """
+    KB 문서의 TF-IDF 행렬.
+
+    Args:
+        docs: KB 문서 목록
+        hashes: 문서별 entry_hash (주면 지난번과 내용이 같은 문서는 다시 토큰화하지 않음)
+    """
+    global _term_counts
+    if hashes is None:
+        return TfidfMatrix([term_counts(doc) for doc in docs])
+    cached = _term_counts
+    counts = [cached[h] if h in cached else term_counts(doc) for doc, h in zip(docs, hashes)]
+    _term_counts = dict(zip(hashes, counts))
+    return TfidfMatrix(counts)
+
+
+def _neighbours(matrix: TfidfMatrix, rows: Sequence[int], count: int) -> Dict[int, List[Tuple[int, float]]]:
+    """rows의 각 행과 가장 비슷한 행 count개 (자기 자신 제외)"""
+    result = {}
+    for begin in range(0, len(rows), SIMILARITY_BLOCK):
+        block = rows[begin:begin + SIMILARITY_BLOCK]
+        similarities = matrix.similarities(block)
+        for values, row in zip(similarities, block):
+            values[row] = 0.0
+            values[values < MIN_SIMILARITY] = 0.0
+            result[row] = [(col, float(values[col])) for col in top_indices(values, count)]
+    return result
+
+
+def update_table(docs: Sequence[Mapping], table: Optional[Mapping],
+                 count: int = RELATED_COUNT) -> Tuple[dict, bool]:
+    """
+    관련 항목 표를 KB에 맞게 갱신합니다.
+
+    Args:
+        docs: KB 문서 목록
+        table: 저장되어 있던 표 (없으면 None)
+        count: 항목마다 저장할 관련 항목 수
+
+    Returns:
+        (새 표, 바뀌었는지 여부)
+    """
+    old: Dict[str, Any] = {}
+    if isinstance(table, Mapping) and table.get("count") == count:
+        old = dict(table.get("entries") or {})
+
+    keys = [entry_key(doc) for doc in docs]
+    hashes = [entry_hash(doc) for doc in docs]
+    changed = [row for row, key in enumerate(keys)
+               if key not in old or old[key].get("hash") != hashes[row]]
+    removed = set(old) - set(keys)
+    if not changed and not removed:
+        return {"count": count, "entries": old}, False
+
+    matrix = tfidf_matrix(docs, hashes)
+    if (len(changed) + len(removed)) * 2 >= len(docs):
+        rows = list(range(len(docs)))
+    else:
+        dirty: Set[str] = {keys[row] for row in changed} | removed
+        rows_set = set(changed)
+        # 목록에 바뀐/지운 항목이 있거나, 바뀐 항목이 새로 들어올 수 있는 항목
+        entering = np.zeros(len(docs), dtype=np.float32)
+        for begin in range(0, len(changed), SIMILARITY_BLOCK):
+            np.maximum(entering, matrix.similarities(changed[begin:begin + SIMILARITY_BLOCK]).max(axis=0),
+                       out=entering)
+        for row, key in enumerate(keys):
+            if row in rows_set:
+                continue
+            related = old[key].get("related") or []
+            if any(str(other) in dirty for other, _ in related):
+                rows_set.add(row)
+                continue
+            floor = related[-1][1] if len(related) >= count else MIN_SIMILARITY
+            if entering[row] >= floor:
+                rows_set.add(row)
+        rows = sorted(rows_set)
+
+    entries = {key: old[key] for key in keys if key in old}
+    for row, neighbours in _neighbours(matrix, rows, count).items():
+        entries[keys[row]] = {
+            "hash": hashes[row],
+            "related": [[docs[col].get("id"), round(score, 4)] for col, score in neighbours],
+        }
+    return {"count": count, "entries": {key: entries[key] for key in keys}}, True
+
+
+def refresh_related(docs: Sequence[Mapping], count: int = RELATED_COUNT) -> Dict[str, Tuple[Any, ...]]:
+    """
+    저장된 관련 항목 표를 KB에 맞게 갱신하고, 바뀌었으면 저장합니다.
+
+    KB 인덱스를 만들 때(백그라운드) 호출합니다.
+
+    Returns:
+        {항목 키(str(id)): 관련 항목 id tuple}
+    """
+    table, changed = update_table(docs, thaw(load_json(RELATED_FILE, default={}, readonly=True)), count)
+    if changed:
+        save_json(RELATED_FILE, table)
+    return {key: tuple(other for other, _ in entry.get("related", ()))
+            for key, entry in table["entries"].items()}
@@ -0,0 +1,123 @@
+# -*- coding: utf-8 -*-
+"""
+BuyLow OS - BM25 검색 (CS 지식베이스)
+
+필드별 가중치를 둔 BM25F로 문서 관련도를 계산합니다.
+토큰은 utils/hangul.py의 tokenize (한글 글자 n-gram + 영문 단어)를 사용합니다.
+
+KB는 버전마다 한 번만 색인하므로, 색인할 때 토큰별 문서 점수 기여분을
+미리 계산해 두고 질문 시에는 더하기만 합니다.
+
+- 포스팅: 토큰 -> (문서 번호 uint32 배열, 점수 기여분 float32 배열)
+- 질문 점수: 문서 수 크기의 배열 하나에 포스팅을 더함 (numpy)
+- 상위 k개: argpartition으로 k개만 골라 정렬
+"""
+import math
+from collections import Counter, defaultdict
+from typing import Any, Dict, List, Mapping, Sequence, Tuple
+
+import numpy as np
+
+from utils.hangul import tokenize
+
+# 필드별 가중치 (제목/키워드가 본문보다 중요)
+FIELD_WEIGHTS = {
+    "title": 3.0,
+    "keywords": 2.5,
+    "short_answer": 1.0,
+    "detailed_answer": 0.5,
+}
+K1 = 1.2
+B = 0.75
+
+
+def field_tokens(value: Any) -> List[str]:
+    """필드 값(문자열 또는 문자열 목록)의 토큰"""
+    if isinstance(value, str):
+        return tokenize(value)
+    tokens = []
+    for item in value or ():
+        if isinstance(item, str):
+            tokens.extend(tokenize(item))
+    return tokens
+
+
+class BM25Index:
+    """문서 목록에 대한 BM25F 색인"""
+
+    def __init__(self, docs: Sequence[Mapping], field_weights: Mapping[str, float] = FIELD_WEIGHTS,
+                 k1: float = K1, b: float = B):
+        self.size = len(docs)
+        fields = list(field_weights)
+
+        counts = {field: [Counter(field_tokens(doc.get(field))) for doc in docs] for field in fields}
+        avg_lengths = {}
+        for field in fields:
+            total = sum(sum(c.values()) for c in counts[field])
+            avg_lengths[field] = (total / self.size) if self.size and total else 1.0
+
+        # 토큰 -> {문서: 필드 가중치와 길이 정규화를 적용한 tf}
+        weighted_tf: Dict[str, Dict[int, float]] = defaultdict(dict)
+        for field in fields:
+            weight, avg_length = field_weights[field], avg_lengths[field]
+            for doc_idx, counter in enumerate(counts[field]):
+                if not counter:
+                    continue
+                norm = 1 - b + b * sum(counter.values()) / avg_length
+                for token, tf in counter.items():
+                    postings = weighted_tf[token]
+                    postings[doc_idx] = postings.get(doc_idx, 0.0) + weight * tf / norm
+
+        self._postings: Dict[str, Tuple[np.ndarray, np.ndarray]] = {}
+        for token, postings in weighted_tf.items():
+            df = len(postings)
+            idf = math.log(1 + (self.size - df + 0.5) / (df + 0.5))
+            doc_ids = sorted(postings)
+            impacts = [idf * postings[d] * (k1 + 1) / (postings[d] + k1) for d in doc_ids]
+            self._postings[token] = (
+                np.array(doc_ids, dtype=np.uint32),
+                np.array(impacts, dtype=np.float32),
+            )
+
+    def scores(self, query: str) -> np.ndarray:
+        """
+        모든 문서의 BM25 점수 (겹치는 토큰이 없는 문서는 0).
+
+        Returns:
+            문서 순번을 인덱스로 하는 float32 배열
+        """
+        scores = np.zeros(self.size, dtype=np.float32)
+        for token in set(tokenize(query)):
+            postings = self._postings.get(token)
+            if postings is not None:
+                # 한 토큰의 포스팅에는 같은 문서가 한 번만 있으므로 fancy index로 더해도 됨
+                scores[postings[0]] += postings[1]
+        return scores
+
+    def top_k(self, query: str, k: int = 5) -> List[Tuple[int, float]]:
+        """
+        점수가 높은 문서 k개 (동점이면 앞 문서 우선, 점수 0은 제외).
+
+        Returns:
+            [(문서 순번, 점수), ...] 점수 내림차순
+        """
+        scores = self.scores(query)
+        return [(i, float(scores[i])) for i in top_indices(scores, k)]
+
+
+def top_indices(values: np.ndarray, k: int) -> List[int]:
+    """
+    값이 큰 순서로 k개의 인덱스 (동점이면 작은 인덱스 우선, 0 이하는 제외).
+
+    전체를 정렬하지 않고 argpartition으로 k번째 값을 찾은 뒤 그 이상만 정렬합니다.
+    """
+    if k <= 0 or not len(values):
+        return []
+    if k < len(values):
+        kth = values[np.argpartition(values, len(values) - k)[len(values) - k]]
+        selected = np.flatnonzero(values >= max(kth, 0))
+    else:
+        selected = np.arange(len(values))
+    selected = selected[values[selected] > 0]
+    order = np.lexsort((selected, -values[selected]))
+    return selected[order[:k]].tolist()
@@ -0,0 +1,92 @@
+# -*- coding: utf-8 -*-
+"""
+BuyLow OS - 검색 인덱스 자동 갱신 서비스
+
+kb.json을 고쳐도 서버를 재시작하지 않고 새 내용이 반영되도록,
+백그라운드(daemon) 스레드가 데이터 버전을 주기적으로 확인합니다.
+
+- 버전이 바뀌면 백그라운드 스레드에서 새 인덱스를 만든 뒤 참조를 한 번에 교체
+  (요청 처리 중인 세션은 만들어 둔 인덱스를 그대로 쓰고, 다음 요청부터 새 인덱스 사용)
+- 요청 경로에서는 인덱스를 만들지 않음 (처음 한 번 제외)
+- 다시 만들다 실패하면 이전 인덱스를 계속 사용
+
+파일 변경 알림(inotify)은 OS마다 달라 표준 라이브러리만으로는 쓸 수 없으므로,
+stat 한 번이면 되는 데이터 버전 비교(get_data_version)로 감시합니다.
+"""
+import atexit
+import threading
+from typing import Any, Callable, Optional
+
+
+class KBService:
+    """버전이 바뀌면 인덱스를 백그라운드에서 다시 만들어 교체합니다."""
+
+    def __init__(
+        self,
+        build: Callable[[Any], Any],
+        version: Callable[[], Any],
+        poll_interval: float = 2.0,
+        on_swap: Optional[Callable[[Any], None]] = None,
+        name: str = "buylow-kb-service",
+    ):
+        """
+        Args:
+            build: 데이터 버전을 받아 새 인덱스를 만드는 함수
+            version: 현재 데이터 버전을 반환하는 함수 (실패 시 None)
+            poll_interval: 버전 확인 주기 (초)
+            on_swap: 인덱스를 교체한 뒤 호출할 함수 (새 인덱스를 받음)
+            name: 감시 스레드 이름
+        """
+        self._build = build
+        self._version = version
+        self._poll_interval = poll_interval
+        self._on_swap = on_swap
+        self._build_lock = threading.Lock()
+        self._stop = threading.Event()
+
+        self._current_version = version()
+        self._index = build(self._current_version)
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    @property
+    def index(self) -> Any:
+        """현재 인덱스 (교체는 참조 하나를 바꾸는 것이라 잠금 없이 읽어도 됨)"""
+        return self._index
+
+    @property
+    def version(self) -> Any:
+        return self._current_version
+
+    def refresh(self) -> bool:
+        """
+        지금 바로 버전을 확인하고, 바뀌었으면 다시 만듭니다.
+
+        Returns:
+            인덱스를 교체했는지 여부
+        """
+        with self._build_lock:
+            version = self._version()
+            if version is None or version == self._current_version:
+                return False
+            try:
+                index = self._build(version)
+            except Exception as e:  # 백그라운드 스레드가 죽지 않도록
+                print(f"[kb_service] Warning: Failed to rebuild index: {e}")
+                return False
+            self._index = index
+            self._current_version = version
+        if self._on_swap is not None:
+            self._on_swap(index)
+        return True
+
+    def close(self, timeout: float = 5.0) -> None:
+        """감시 스레드를 멈춥니다."""
+        self._stop.set()
+        if self._thread.is_alive() and self._thread is not threading.current_thread():
+            self._thread.join(timeout)
+
+    def _run(self) -> None:
+        while not self._stop.wait(self._poll_interval):
+            self.refresh()
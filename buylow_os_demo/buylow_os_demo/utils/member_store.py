@@ -0,0 +1,159 @@
+# -*- coding: utf-8 -*-
+"""
+BuyLow OS - 회원별 분할 저장소
+
+member_profiles.json, unlocks.json, risk_history.json처럼 닉네임을 키로 하는
+딕셔너리를 회원 한 명당 파일 하나로 나눠 저장합니다.
+
+- 경로: <폴더>/<해시 앞 2자리>/<닉네임 해시>.json
+  (닉네임에 어떤 문자가 있어도 안전하고, 한 폴더에 파일이 몰리지 않음)
+- 파일 내용: {"member": 닉네임, "data": 회원 데이터}
+- 한 회원의 갱신은 그 회원의 파일만 원자적으로 교체합니다 (임시 파일 + os.replace).
+- 회원 파일을 쓰거나 지울 때마다 <폴더>/.stamp를 새 값으로 바꿉니다. 전체를 읽는
+  쪽은 이 값이 그대로면 회원 파일을 훑지 않고 캐시를 씁니다
+  (회원 파일을 손으로 고쳤다면 .stamp를 지우세요).
+"""
+import hashlib
+import os
+import shutil
+import threading
+import uuid
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from utils import serialization
+
+MEMBER_SUFFIX = ".json"
+STAMP_NAME = ".stamp"
+
+
+def member_hash(member: str) -> str:
+    return hashlib.sha1(member.encode("utf-8")).hexdigest()
+
+
+def bucket_path(root: Path, member: str) -> Path:
+    """회원 파일이 들어가는 하위 폴더 (같은 폴더의 회원은 같은 잠금을 사용)"""
+    return root / member_hash(member)[:2]
+
+
+def member_path(root: Path, member: str) -> Path:
+    return bucket_path(root, member) / (member_hash(member) + MEMBER_SUFFIX)
+
+
+def list_member_files(root: Path) -> List[Path]:
+    """모든 회원 파일 경로 (임시 파일 제외)"""
+    if not root.is_dir():
+        return []
+    paths = []
+    for bucket in os.scandir(root):
+        if not bucket.is_dir() or bucket.name.startswith("."):
+            continue
+        for entry in os.scandir(bucket.path):
+            if entry.name.endswith(MEMBER_SUFFIX) and not entry.name.startswith("."):
+                paths.append(Path(entry.path))
+    return paths
+
+
+def read_stamp(root: Path) -> Optional[str]:
+    """폴더의 변경 표시 (없으면 None)"""
+    try:
+        return (root / STAMP_NAME).read_text(encoding="ascii")
+    except (FileNotFoundError, NotADirectoryError):
+        return None
+
+
+def touch_stamp(root: Path) -> str:
+    """
+    폴더의 변경 표시를 새 값으로 바꿉니다.
+
+    Returns:
+        새 값
+    """
+    stamp = uuid.uuid4().hex
+    root.mkdir(parents=True, exist_ok=True)
+    tmp_path = root / f"{STAMP_NAME}.{os.getpid()}.{threading.get_ident()}.tmp"
+    tmp_path.write_text(stamp, encoding="ascii")
+    os.replace(tmp_path, root / STAMP_NAME)
+    return stamp
+
+
+def read_member(path: Path) -> Tuple[str, Any]:
+    """
+    회원 파일 하나를 읽습니다.
+
+    Returns:
+        (닉네임, 회원 데이터)
+    """
+    record = serialization.loads(path.read_bytes())
+    return record["member"], record["data"]
+
+
+def write_member(path: Path, member: str, data: Any, fmt: str = serialization.DEFAULT_FORMAT) -> None:
+    """회원 파일을 원자적으로 교체합니다 (임시 파일 + fsync + os.replace)."""
+    payload = serialization.dumps({"member": member, "data": data}, fmt)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        with open(tmp_path, "wb") as f:
+            f.write(payload)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        if tmp_path.exists():
+            tmp_path.unlink()
+        raise
+    touch_stamp(path.parent.parent)
+
+
+def delete_member(path: Path) -> None:
+    try:
+        path.unlink()
+    except FileNotFoundError:
+        return
+    touch_stamp(path.parent.parent)
+
+
+def write_all(root: Path, members: Dict[str, Any], fmt: str = serialization.DEFAULT_FORMAT) -> None:
+    """회원 파일을 모두 씁니다 (새 폴더를 만들 때 사용)."""
+    for member, data in members.items():
+        write_member(member_path(root, member), member, data, fmt)
+
+
+def migrate_dict_file(json_path: Path, root: Path, fmt: str = serialization.DEFAULT_FORMAT) -> int:
+    """
+    닉네임을 키로 하는 단일 JSON 파일을 회원별 파일로 한 번 나눕니다.
+
+    폴더가 이미 있거나 원본이 없으면 아무것도 하지 않습니다.
+    원본은 삭제하지 않고 '.bak'을 붙여 보관합니다.
+
+    Returns:
+        옮긴 회원 수
+    """
+    if root.exists() or not json_path.exists():
+        return 0
+
+    raw = json_path.read_bytes()
+    data = serialization.loads(raw) if raw.strip() else {}
+    if not isinstance(data, dict):
+        data = {}
+
+    # 임시 폴더에 다 쓴 뒤 이름을 바꿔, 중간에 실패해도 반쯤 만든 폴더가 남지 않게 함
+    root.parent.mkdir(parents=True, exist_ok=True)
+    tmp_dir = root.with_name(f".{root.name}.{os.getpid()}.tmp")
+    if tmp_dir.exists():
+        shutil.rmtree(tmp_dir)
+    tmp_dir.mkdir()
+    write_all(tmp_dir, data, fmt)
+    os.replace(tmp_dir, root)
+    os.replace(json_path, json_path.with_name(json_path.name + ".bak"))
+    return len(data)
+
+
+def iter_members(root: Path) -> Iterable[Tuple[str, Any]]:
+    for path in list_member_files(root):
+        try:
+            yield read_member(path)
+        except FileNotFoundError:
+            # 목록을 만든 뒤 삭제된 회원
+            continue
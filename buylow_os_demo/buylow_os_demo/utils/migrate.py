@@ -0,0 +1,37 @@
+# -*- coding: utf-8 -*-
+"""
+BuyLow OS - 데이터 형식 변환 도구
+
+예전 형식의 데이터 파일을 현재 저장 형식으로 한 번에 변환합니다.
+변환은 앱이 처음 접근할 때도 자동으로 일어나므로, 배포 전에
+미리 실행해 두고 싶을 때만 사용하면 됩니다.
+
+    python -m utils.migrate
+
+저장 형식을 바꿔 모든 데이터 파일을 다시 쓸 수도 있습니다. binary 형식은 쓴
+Python 버전에서만 읽히므로, Python을 올리기 전에 compact로 변환해 두세요.
+
+    python -m utils.migrate --format compact
+"""
+import argparse
+
+from utils.data_utils import convert_storage_format, migrate_event_logs, migrate_member_stores
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="BuyLow OS 데이터 형식 변환")
+    parser.add_argument("--format", choices=["pretty", "compact", "binary"], default=None,
+                        help="이 형식으로 모든 데이터 파일을 다시 씀 (JSON 파일 저장소)")
+    args = parser.parse_args()
+
+    for name, count in migrate_event_logs().items():
+        print(f"{name}: {count}건 변환")
+    for name, count in migrate_member_stores().items():
+        print(f"{name}: 회원 {count}명 분할")
+    if args.format:
+        for name, count in convert_storage_format(args.format).items():
+            print(f"{name}: {count}개 파일을 {args.format} 형식으로 저장")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+# -*- coding: utf-8 -*-
+"""
+BuyLow OS - 저장 형식 (직렬화)
+
+JSON 파일을 저장하는 형식을 고를 수 있게 합니다.
+읽을 때는 파일 내용을 보고 형식을 자동으로 판별하므로, 형식을 바꿔도
+기존 파일은 그대로 읽힙니다.
+
+- pretty : 들여쓰기 JSON (기본값, 사람이 직접 편집하기 좋음)
+- compact: 공백 없는 JSON (파일 크기와 쓰기 시간 절약)
+- binary : 표준 라이브러리 marshal 기반 바이너리 (가장 빠름, 사람이 읽을 수 없음).
+  marshal 형식은 Python 버전마다 바뀔 수 있으므로, 머리말에 쓴 Python 버전과
+  marshal 버전을 기록하고 다른 버전에서 쓴 파일은 읽지 않습니다. Python을 올리기 전에
+  `python -m utils.migrate --format compact`로 변환해 두세요.
+
+orjson이 설치되어 있으면 JSON 형식의 읽기/쓰기에 자동으로 사용합니다.
+"""
+import json
+import marshal
+import sys
+from collections.abc import Mapping
+from types import MappingProxyType
+from typing import Any
+
+try:
+    import orjson
+except ImportError:  # 선택 의존성
+    orjson = None
+
+FORMATS = ("pretty", "compact", "binary")
+DEFAULT_FORMAT = "pretty"
+
+# 바이너리 파일 머리말 (JSON은 이 바이트로 시작할 수 없음) + 쓴 Python/marshal 버전
+BINARY_PREFIX = b"\x00BLOSB"
+BINARY_MAGIC = BINARY_PREFIX + f"2:py{sys.version_info[0]}.{sys.version_info[1]}:m{marshal.version}\n".encode("ascii")
+
+
+class BinaryVersionError(ValueError):
+    """다른 Python/marshal 버전에서 쓴 바이너리 파일"""
+
+
+def _plain(obj: Any) -> Any:
+    """읽기 전용 뷰(MappingProxyType/tuple)를 일반 dict/list로 바꿉니다."""
+    if isinstance(obj, (dict, MappingProxyType)):
+        return {k: _plain(v) for k, v in obj.items()}
+    if isinstance(obj, (list, tuple)):
+        return [_plain(v) for v in obj]
+    return obj
+
+
+def _json_default(obj: Any) -> Any:
+    if isinstance(obj, Mapping):
+        return dict(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def normalize_format(fmt: str) -> str:
+    fmt = (fmt or DEFAULT_FORMAT).strip().lower()
+    if fmt not in FORMATS:
+        raise ValueError(f"Unknown storage format '{fmt}' (choose from {', '.join(FORMATS)})")
+    return fmt
+
+
+def dumps(data: Any, fmt: str = DEFAULT_FORMAT) -> bytes:
+    """
+    데이터를 지정한 형식의 바이트로 직렬화합니다.
+
+    Args:
+        data: 저장할 데이터
+        fmt: "pretty", "compact", "binary"
+    """
+    fmt = normalize_format(fmt)
+    if fmt == "binary":
+        if isinstance(data, (MappingProxyType, tuple)):
+            data = _plain(data)
+        try:
+            return BINARY_MAGIC + marshal.dumps(data)
+        except ValueError:
+            # 안쪽에 읽기 전용 뷰가 섞여 있는 경우
+            return BINARY_MAGIC + marshal.dumps(_plain(data))
+    if orjson is not None:
+        option = orjson.OPT_INDENT_2 if fmt == "pretty" else 0
+        return orjson.dumps(data, default=_json_default, option=option)
+    if fmt == "pretty":
+        text = json.dumps(data, ensure_ascii=False, indent=2, default=_json_default)
+    else:
+        text = json.dumps(data, ensure_ascii=False, separators=(",", ":"), default=_json_default)
+    return text.encode("utf-8")
+
+
+def loads(raw: bytes) -> Any:
+    """
+    바이트를 역직렬화합니다. 형식은 내용을 보고 판별합니다.
+
+    Raises:
+        ValueError: 내용이 비어 있거나 형식이 올바르지 않은 경우
+            (다른 버전에서 쓴 바이너리는 BinaryVersionError)
+    """
+    if raw.startswith(BINARY_PREFIX):
+        if not raw.startswith(BINARY_MAGIC):
+            header = raw[len(BINARY_PREFIX):raw.find(b"\n", 0, 64)].decode("ascii", "replace")
+            raise BinaryVersionError(
+                f"binary data written by another Python/marshal version ({header or 'unknown'}); "
+                "convert it with that version: python -m utils.migrate --format compact")
+        return marshal.loads(raw[len(BINARY_MAGIC):])
+    if not raw.strip():
+        raise ValueError("empty content")
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw.decode("utf-8"))
+
+
+def dumps_line(item: Any) -> bytes:
+    """JSON Lines 한 줄 (개행 포함)"""
+    if orjson is not None:
+        return orjson.dumps(item, default=_json_default, option=orjson.OPT_APPEND_NEWLINE)
+    line = json.dumps(item, ensure_ascii=False, separators=(",", ":"), default=_json_default)
+    return (line + "\n").encode("utf-8")
+
+
+def loads_line(line: bytes) -> Any:
+    """JSON Lines 한 줄을 파싱합니다."""
+    if orjson is not None:
+        return orjson.loads(line)
+    return json.loads(line)
+
+
+# 파싱 실패 시 잡아야 할 예외 (orjson.JSONDecodeError는 ValueError의 하위 클래스)
+DECODE_ERRORS = (ValueError, UnicodeDecodeError, EOFError, TypeError)
@@ -0,0 +1,568 @@
+# -*- coding: utf-8 -*-
+"""
+BuyLow OS - SQLite 저장소 백엔드
+
+data_utils의 API(load_json/save_json/append_to_json_list/get_next_id)를
+그대로 유지하면서 데이터를 SQLite(WAL 모드)에 저장합니다.
+
+- logs, tickets, homework_submissions, homework_reviews는 실제 테이블로
+  저장하고 자주 거르는 컬럼에 인덱스를 둡니다.
+- member_profiles, unlocks, risk_history(와 event_counts, submission_counts)는 members 테이블에 회원마다 한 행으로
+  저장하여, 한 회원의 갱신이 그 회원의 행만 바꾸도록 합니다.
+- 그 밖의 파일(kb.json 등)은 documents 테이블에 통째로 저장합니다.
+- 컬렉션마다 버전을 두어, 바뀌지 않은 데이터는 프로세스 캐시에서 바로 반환합니다.
+- 처음 접근하는 컬렉션은 기존 JSON 파일에서 자동으로 가져옵니다.
+
+사용법:
+    BUYLOW_STORAGE_BACKEND=sqlite streamlit run Home.py
+"""
+import json
+import sqlite3
+import threading
+from datetime import datetime, timedelta
+from pathlib import Path
+from types import MappingProxyType
+from typing import Any, Callable, Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+from utils.data_utils import (
+    StorageBackend,
+    _cache_drop,
+    _cache_extend,
+    _cache_get,
+    _cache_put,
+    _json_default,
+    _max_id,
+    freeze,
+    is_member_collection,
+    read_legacy_file,
+    thaw,
+)
+
+
+class TableSpec(NamedTuple):
+    """테이블로 저장하는 컬렉션 정의"""
+    table: str
+    # 기본 키 필드 (None이면 rowid 순서만 사용)
+    key: Optional[str]
+    # 항목에서 뽑아 컬럼으로 저장할 필드
+    columns: Tuple[Tuple[str, str], ...]
+    indexes: Tuple[Tuple[str, ...], ...]
+
+
+TABLES: Dict[str, TableSpec] = {
+    "logs.json": TableSpec(
+        "logs", None,
+        (("type", "TEXT"), ("timestamp", "TEXT")),
+        (("type", "timestamp"), ("timestamp",)),
+    ),
+    "tickets.json": TableSpec(
+        "tickets", "id",
+        (("status", "TEXT"), ("timestamp", "TEXT")),
+        (("status",),),
+    ),
+    "homework_submissions.json": TableSpec(
+        "homework_submissions", "id",
+        (("nickname", "TEXT"), ("topic", "TEXT"), ("reviewed", "INTEGER"), ("submitted_at", "TEXT")),
+        (("nickname", "topic"), ("reviewed",)),
+    ),
+    "homework_reviews.json": TableSpec(
+        "homework_reviews", None,
+        (("submission_id", "INTEGER"),),
+        (("submission_id",),),
+    ),
+}
+
+
+def _dumps(item: Any) -> str:
+    return json.dumps(item, ensure_ascii=False, separators=(",", ":"), default=_json_default)
+
+
+def _next_day(day: str) -> str:
+    return (datetime.strptime(day, "%Y-%m-%d") + timedelta(days=1)).strftime("%Y-%m-%d")
+
+
+def _column_value(value: Any) -> Any:
+    if isinstance(value, bool):
+        return int(value)
+    if isinstance(value, (dict, list, tuple, MappingProxyType)):
+        return _dumps(value)
+    return value
+
+
+class _transaction:
+    """BEGIN/COMMIT/ROLLBACK 컨텍스트 (쓰기는 BEGIN IMMEDIATE로 잠금을 먼저 잡음)"""
+
+    def __init__(self, conn: sqlite3.Connection, immediate: bool = True):
+        self.conn = conn
+        self.immediate = immediate
+
+    def __enter__(self) -> sqlite3.Connection:
+        self.conn.execute("BEGIN IMMEDIATE" if self.immediate else "BEGIN")
+        return self.conn
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is None:
+            self.conn.execute("COMMIT")
+        else:
+            self.conn.execute("ROLLBACK")
+
+
+class SQLiteBackend(StorageBackend):
+    """SQLite(WAL) 저장소"""
+
+    name = "sqlite"
+    errors = StorageBackend.errors + (sqlite3.Error,)
+
+    def __init__(self, db_path: Path):
+        self.db_path = Path(db_path)
+        self._local = threading.local()
+        self._schema_lock = threading.Lock()
+        self._schema_ready = False
+        self._ready_collections = set()
+
+    # ---------- 연결/스키마 ----------
+
+    def _conn(self) -> sqlite3.Connection:
+        """스레드별 연결을 반환합니다 (Streamlit 세션은 스레드에서 실행됨)."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(str(self.db_path), timeout=10.0, isolation_level=None)
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+            self._ensure_schema(conn)
+        return conn
+
+    def _ensure_schema(self, conn: sqlite3.Connection) -> None:
+        if self._schema_ready:
+            return
+        with self._schema_lock:
+            if self._schema_ready:
+                return
+            # WAL 전환은 한 연결에서만 (여러 스레드가 동시에 전환하면 바쁜 대기 없이
+            # "database is locked"로 실패함). 설정은 파일에 남으므로 이후 연결도 WAL로 엶
+            conn.execute("PRAGMA journal_mode=WAL")
+            statements = [
+                "CREATE TABLE IF NOT EXISTS collections ("
+                " name TEXT PRIMARY KEY,"
+                " generation INTEGER NOT NULL DEFAULT 0,"
+                " version INTEGER NOT NULL DEFAULT 0)",
+                "CREATE TABLE IF NOT EXISTS documents (name TEXT PRIMARY KEY, data TEXT NOT NULL)",
+                "CREATE TABLE IF NOT EXISTS sequences (name TEXT PRIMARY KEY, value INTEGER NOT NULL)",
+                "CREATE TABLE IF NOT EXISTS members ("
+                " collection TEXT NOT NULL,"
+                " member TEXT NOT NULL,"
+                " data TEXT NOT NULL,"
+                " PRIMARY KEY (collection, member))",
+            ]
+            for spec in TABLES.values():
+                key_col = f"{spec.key} INTEGER PRIMARY KEY, " if spec.key else ""
+                cols = "".join(f"{name} {kind}, " for name, kind in spec.columns)
+                statements.append(
+                    f"CREATE TABLE IF NOT EXISTS {spec.table} ({key_col}{cols}data TEXT NOT NULL)"
+                )
+                for index in spec.indexes:
+                    statements.append(
+                        f"CREATE INDEX IF NOT EXISTS idx_{spec.table}_{'_'.join(index)}"
+                        f" ON {spec.table} ({', '.join(index)})"
+                    )
+            with _transaction(conn):
+                for sql in statements:
+                    conn.execute(sql)
+            self._schema_ready = True
+
+    def _ensure_collection(self, conn: sqlite3.Connection, filename: str, default: Any) -> None:
+        """처음 접근하는 컬렉션은 기존 JSON 파일(없으면 기본값)에서 가져옵니다."""
+        if filename in self._ready_collections:
+            return
+        with _transaction(conn):
+            row = conn.execute("SELECT 1 FROM collections WHERE name = ?", (filename,)).fetchone()
+            if row is None:
+                data = read_legacy_file(filename)
+                if data is None:
+                    data = default
+                conn.execute("INSERT INTO collections (name) VALUES (?)", (filename,))
+                self._write_all(conn, filename, data)
+            elif is_member_collection(filename):
+                # 예전 버전에서 documents에 통째로 저장한 데이터는 회원별 행으로 옮김
+                row = conn.execute("SELECT data FROM documents WHERE name = ?", (filename,)).fetchone()
+                if row is not None:
+                    self._write_all(conn, filename, json.loads(row[0]))
+                    conn.execute("DELETE FROM documents WHERE name = ?", (filename,))
+                    self._bump(conn, filename, rewrite=True)
+        self._ready_collections.add(filename)
+
+    def close(self) -> None:
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+    # ---------- 내부 읽기/쓰기 ----------
+
+    def _insert(self, conn: sqlite3.Connection, spec: TableSpec, item: Any) -> int:
+        names = [name for name, _ in spec.columns]
+        values = [_column_value(item.get(name)) if isinstance(item, (dict, MappingProxyType)) else None
+                  for name in names]
+        if spec.key:
+            names.insert(0, spec.key)
+            values.insert(0, item.get(spec.key) if isinstance(item, (dict, MappingProxyType)) else None)
+        names.append("data")
+        values.append(_dumps(item))
+        sql = (f"INSERT OR REPLACE INTO {spec.table} ({', '.join(names)})"
+               f" VALUES ({', '.join('?' * len(names))})")
+        return conn.execute(sql, values).lastrowid
+
+    def _write_all(self, conn: sqlite3.Connection, filename: str, data: Any) -> None:
+        if is_member_collection(filename):
+            conn.execute("DELETE FROM members WHERE collection = ?", (filename,))
+            members = data if isinstance(data, (dict, MappingProxyType)) else {}
+            conn.executemany(
+                "INSERT INTO members (collection, member, data) VALUES (?, ?, ?)",
+                [(filename, member, _dumps(value)) for member, value in members.items()],
+            )
+            return
+        spec = TABLES.get(filename)
+        if spec is None:
+            conn.execute("INSERT OR REPLACE INTO documents (name, data) VALUES (?, ?)",
+                         (filename, _dumps(data)))
+            return
+        conn.execute(f"DELETE FROM {spec.table}")
+        for item in data if isinstance(data, (list, tuple)) else []:
+            self._insert(conn, spec, item)
+
+    def _bump(self, conn: sqlite3.Connection, filename: str, rewrite: bool) -> None:
+        """컬렉션 버전을 올립니다. rewrite면 세대(generation)도 올려 전체 재로드를 유도합니다."""
+        conn.execute(
+            "UPDATE collections SET version = version + 1"
+            + (", generation = generation + 1" if rewrite else "")
+            + " WHERE name = ?",
+            (filename,),
+        )
+
+    def _cache_key(self, filename: str) -> str:
+        return f"sqlite:{self.db_path}:{filename}"
+
+    # ---------- StorageBackend ----------
+
+    def load(self, filename: str, default: Any, readonly: bool) -> Any:
+        conn = self._conn()
+        self._ensure_collection(conn, filename, default)
+        spec = TABLES.get(filename)
+        cache_key = self._cache_key(filename)
+
+        with _transaction(conn, immediate=False):
+            generation, version = conn.execute(
+                "SELECT generation, version FROM collections WHERE name = ?", (filename,)
+            ).fetchone()
+            key = (generation, version)
+            entry = _cache_get(cache_key)
+            if entry is None or entry.key != key:
+                if is_member_collection(filename):
+                    data = {member: json.loads(text) for member, text in conn.execute(
+                        "SELECT member, data FROM members WHERE collection = ? ORDER BY member", (filename,)
+                    )}
+                    entry = _cache_put(cache_key, key, data)
+                elif spec is None:
+                    row = conn.execute("SELECT data FROM documents WHERE name = ?", (filename,)).fetchone()
+                    data = json.loads(row[0]) if row else default
+                    entry = _cache_put(cache_key, key, data)
+                else:
+                    # 추가만 있었던 경우: 새 행만 읽어 캐시 뒤에 붙임
+                    appended = entry is not None and entry.key[0] == generation
+                    # offset: 마지막으로 읽은 rowid (아직 읽은 행이 없으면 None).
+                    # id가 0 이하인 행도 있으므로 처음부터 읽을 때는 rowid 조건을 두지 않음
+                    offset = entry.offset if appended else None
+                    where, params = ("WHERE rowid > ?", (offset,)) if offset is not None else ("", ())
+                    data = []
+                    for rowid, text in conn.execute(
+                        f"SELECT rowid, data FROM {spec.table} {where} ORDER BY rowid", params
+                    ):
+                        data.append(json.loads(text))
+                        offset = rowid
+                    if appended:
+                        entry = _cache_extend(cache_key, entry, key, data, offset)
+                    else:
+                        entry = _cache_put(cache_key, key, data, offset)
+        return entry.readonly() if readonly else entry.mutable()
+
+    def save(self, filename: str, data: Any) -> None:
+        conn = self._conn()
+        self._ensure_collection(conn, filename, data)
+        with _transaction(conn):
+            self._apply_save(conn, filename, data)
+        _cache_drop(self._cache_key(filename))
+
+    def _apply_save(self, conn: sqlite3.Connection, filename: str, data: Any) -> None:
+        spec = TABLES.get(filename)
+        items = list(data) if isinstance(data, (list, tuple)) else []
+        if is_member_collection(filename):
+            self._save_members(conn, filename, data)
+        elif spec is None:
+            self._write_all(conn, filename, data)
+            self._bump(conn, filename, rewrite=True)
+        elif spec.key:
+            self._save_keyed(conn, filename, spec, items)
+        else:
+            self._save_ordered(conn, filename, spec, items)
+
+    def _save_keyed(self, conn: sqlite3.Connection, filename: str, spec: TableSpec, items: List[Any]) -> None:
+        """바뀐 행만 갱신하고, 사라진 행은 삭제합니다."""
+        existing = dict(conn.execute(f"SELECT {spec.key}, data FROM {spec.table}"))
+        seen = set()
+        changed = False
+        for item in items:
+            item_id = item.get(spec.key) if isinstance(item, (dict, MappingProxyType)) else None
+            seen.add(item_id)
+            if item_id is None or existing.get(item_id) != _dumps(item):
+                self._insert(conn, spec, item)
+                changed = True
+        removed = [item_id for item_id in existing if item_id not in seen]
+        if removed:
+            conn.executemany(f"DELETE FROM {spec.table} WHERE {spec.key} = ?", [(i,) for i in removed])
+            changed = True
+        if changed:
+            self._bump(conn, filename, rewrite=True)
+
+    def _save_members(self, conn: sqlite3.Connection, filename: str, data: Any) -> None:
+        """바뀐 회원의 행만 갱신하고, 없어진 회원의 행은 삭제합니다."""
+        existing = dict(conn.execute("SELECT member, data FROM members WHERE collection = ?", (filename,)))
+        members = data if isinstance(data, (dict, MappingProxyType)) else {}
+        changed = [(filename, member, _dumps(value)) for member, value in members.items()
+                   if existing.get(member) != _dumps(value)]
+        removed = [(filename, member) for member in existing if member not in members]
+        if changed:
+            conn.executemany("INSERT OR REPLACE INTO members (collection, member, data) VALUES (?, ?, ?)", changed)
+        if removed:
+            conn.executemany("DELETE FROM members WHERE collection = ? AND member = ?", removed)
+        if changed or removed:
+            self._bump(conn, filename, rewrite=True)
+
+    def load_member(self, filename: str, member: str, default: Any, readonly: bool) -> Any:
+        if not is_member_collection(filename):
+            return super().load_member(filename, member, default, readonly)
+        conn = self._conn()
+        self._ensure_collection(conn, filename, {})
+        row = conn.execute(
+            "SELECT data FROM members WHERE collection = ? AND member = ?", (filename, member)
+        ).fetchone()
+        value = json.loads(row[0]) if row else thaw(default)
+        return freeze(value) if readonly else value
+
+    def save_member(self, filename: str, member: str, data: Any) -> None:
+        if not is_member_collection(filename):
+            super().save_member(filename, member, data)
+            return
+        conn = self._conn()
+        self._ensure_collection(conn, filename, {})
+        with _transaction(conn):
+            self._put_member(conn, filename, member, data)
+        _cache_drop(self._cache_key(filename))
+
+    def update_member(self, filename: str, member: str, update: Callable[[Any], Any], default: Any) -> Any:
+        if not is_member_collection(filename):
+            return super().update_member(filename, member, update, default)
+        conn = self._conn()
+        self._ensure_collection(conn, filename, {})
+        # BEGIN IMMEDIATE로 쓰기 잠금을 먼저 잡으므로 읽은 뒤 다른 세션이 끼어들 수 없음
+        with _transaction(conn):
+            value = self._apply_update_member(conn, filename, member, update, default)
+        _cache_drop(self._cache_key(filename))
+        return value
+
+    def _put_member(self, conn: sqlite3.Connection, filename: str, member: str, data: Any) -> None:
+        conn.execute("INSERT OR REPLACE INTO members (collection, member, data) VALUES (?, ?, ?)",
+                     (filename, member, _dumps(data)))
+        self._bump(conn, filename, rewrite=True)
+
+    def _apply_update_member(self, conn: sqlite3.Connection, filename: str, member: str,
+                             update: Callable[[Any], Any], default: Any) -> Any:
+        row = conn.execute(
+            "SELECT data FROM members WHERE collection = ? AND member = ?", (filename, member)
+        ).fetchone()
+        value = json.loads(row[0]) if row else thaw(default)
+        result = update(value)
+        value = value if result is None else result
+        self._put_member(conn, filename, member, value)
+        return value
+
+    def _save_ordered(self, conn: sqlite3.Connection, filename: str, spec: TableSpec, items: List[Any]) -> None:
+        """기존 행 뒤에 덧붙이기만 한 경우 새 행만 추가하고, 아니면 전체를 다시 씁니다."""
+        existing = [text for (text,) in conn.execute(f"SELECT data FROM {spec.table} ORDER BY rowid")]
+        encoded = [_dumps(item) for item in items]
+        if encoded[:len(existing)] == existing:
+            if len(encoded) > len(existing):
+                for item in items[len(existing):]:
+                    self._insert(conn, spec, item)
+                self._bump(conn, filename, rewrite=False)
+        else:
+            self._write_all(conn, filename, items)
+            self._bump(conn, filename, rewrite=True)
+
+    def append(self, filename: str, item: dict) -> None:
+        self.append_many(filename, [item])
+
+    def append_many(self, filename: str, items: List[dict]) -> None:
+        conn = self._conn()
+        self._ensure_collection(conn, filename, [])
+
+        with _transaction(conn):
+            self._apply_append(conn, filename, items)
+
+    def _apply_append(self, conn: sqlite3.Connection, filename: str, items: List[dict]) -> None:
+        spec = TABLES.get(filename)
+        if spec is None:
+            # 문서형 파일은 한 트랜잭션 안에서 읽고-추가하고-저장
+            row = conn.execute("SELECT data FROM documents WHERE name = ?", (filename,)).fetchone()
+            data = json.loads(row[0]) if row else []
+            if not isinstance(data, list):
+                data = []
+            data.extend(items)
+            self._write_all(conn, filename, data)
+            self._bump(conn, filename, rewrite=True)
+            return
+
+        rewrite = False
+        for item in items:
+            rewrite = self._breaks_order(conn, spec, item) or rewrite
+            self._insert(conn, spec, item)
+        self._bump(conn, filename, rewrite=rewrite)
+
+    def commit(self, ops: List[tuple]) -> None:
+        """작업 단위의 모든 변경을 하나의 SQLite 트랜잭션으로 적용합니다."""
+        conn = self._conn()
+        for kind, filename, *args in ops:
+            if kind == "save":
+                default = args[0]
+            else:
+                default = {} if is_member_collection(filename) else []
+            self._ensure_collection(conn, filename, default)
+
+        with _transaction(conn):
+            for kind, filename, *args in ops:
+                if kind == "save":
+                    self._apply_save(conn, filename, args[0])
+                elif kind == "append_many":
+                    self._apply_append(conn, filename, args[0])
+                elif kind == "save_member" and is_member_collection(filename):
+                    self._put_member(conn, filename, *args)
+                elif kind == "update_member" and is_member_collection(filename):
+                    self._apply_update_member(conn, filename, *args)
+                else:
+                    raise TypeError(f"{kind} is not supported for {filename}")
+        for filename in {op[1] for op in ops}:
+            _cache_drop(self._cache_key(filename))
+
+    def _breaks_order(self, conn: sqlite3.Connection, spec: TableSpec, item: Any) -> bool:
+        """
+        기존 id를 덮어쓰거나 마지막 id보다 작은 id로 추가하는지 확인합니다.
+        이 경우 캐시의 '새 행만 읽기'가 맞지 않으므로 전체 재로드가 필요합니다.
+        """
+        if not spec.key or not isinstance(item, (dict, MappingProxyType)):
+            return False
+        item_id = item.get(spec.key)
+        if item_id is None:
+            return False
+        row = conn.execute(f"SELECT MAX({spec.key}) FROM {spec.table}").fetchone()
+        return row[0] is not None and item_id <= row[0]
+
+    def reserve_ids(self, filename: str, count: int) -> range:
+        conn = self._conn()
+        self._ensure_collection(conn, filename, [])
+        with _transaction(conn):
+            row = conn.execute("SELECT value FROM sequences WHERE name = ?", (filename,)).fetchone()
+            last = row[0] if row else self._max_id(conn, filename)
+            conn.execute(
+                "INSERT OR REPLACE INTO sequences (name, value) VALUES (?, ?)", (filename, last + count)
+            )
+        return range(last + 1, last + count + 1)
+
+    def _max_id(self, conn: sqlite3.Connection, filename: str) -> int:
+        """시퀀스 시작값 (컬렉션당 한 번만 계산)"""
+        spec = TABLES.get(filename)
+        if spec is not None and spec.key == "id":
+            return conn.execute(f"SELECT COALESCE(MAX(id), 0) FROM {spec.table}").fetchone()[0]
+        if spec is not None:
+            # id가 키가 아닌 테이블도 항목에 id가 있으면 이어서 발급
+            return _max_id([json.loads(text) for (text,) in conn.execute(f"SELECT data FROM {spec.table}")])
+        row = conn.execute("SELECT data FROM documents WHERE name = ?", (filename,)).fetchone()
+        return _max_id(json.loads(row[0])) if row else 0
+
+    def max_id(self, filename: str) -> int:
+        conn = self._conn()
+        self._ensure_collection(conn, filename, [])
+        return self._max_id(conn, filename)
+
+    def iter_items(self, filename: str) -> Iterator[Any]:
+        spec = TABLES.get(filename)
+        if spec is None:
+            yield from super().iter_items(filename)
+            return
+        conn = self._conn()
+        self._ensure_collection(conn, filename, [])
+        for (text,) in conn.execute(f"SELECT data FROM {spec.table} ORDER BY rowid"):
+            yield json.loads(text)
+
+    def load_window(self, filename: str, since: str, until: Optional[str],
+                    event_type: Optional[str]) -> tuple:
+        spec = TABLES.get(filename)
+        columns = {name for name, _ in spec.columns} if spec else set()
+        if "timestamp" not in columns or (event_type is not None and "type" not in columns):
+            return super().load_window(filename, since, until, event_type)
+        conn = self._conn()
+        self._ensure_collection(conn, filename, [])
+
+        # 'YYYY-MM-DD HH:MM:SS' 문자열 비교로 (type, timestamp) 인덱스 범위 조회
+        where, params = ["timestamp >= ?"], [since]
+        if until is not None:
+            where.append("timestamp < ?")
+            params.append(_next_day(until))
+        if event_type is not None:
+            where.append("type = ?")
+            params.append(event_type)
+        sql = f"SELECT data FROM {spec.table} WHERE {' AND '.join(where)} ORDER BY rowid"
+        return tuple(freeze(json.loads(text)) for (text,) in conn.execute(sql, params))
+
+    def find(self, filename: str, filters: Dict[str, Any]) -> list:
+        spec = TABLES.get(filename)
+        if spec is None:
+            return super().find(filename, filters)
+        conn = self._conn()
+        self._ensure_collection(conn, filename, [])
+
+        indexed = {name for name, _ in spec.columns}
+        if spec.key:
+            indexed.add(spec.key)
+        where, params, rest = [], [], {}
+        for name, value in filters.items():
+            if name in indexed:
+                if value is None:
+                    where.append(f"{name} IS NULL")
+                else:
+                    where.append(f"{name} = ?")
+                    params.append(_column_value(value))
+            else:
+                rest[name] = value
+
+        sql = f"SELECT data FROM {spec.table}"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += " ORDER BY rowid"
+        results = []
+        for (text,) in conn.execute(sql, params):
+            item = json.loads(text)
+            if all(item.get(k) == v for k, v in rest.items()):
+                results.append(freeze(item))
+        return results
+
+    def version(self, filename: str) -> Any:
+        conn = self._conn()
+        self._ensure_collection(conn, filename, {} if is_member_collection(filename) else [])
+        row = conn.execute(
+            "SELECT generation, version FROM collections WHERE name = ?", (filename,)
+        ).fetchone()
+        return tuple(row) if row else None
+
+    def invalidate(self, filename: str) -> None:
+        _cache_drop(self._cache_key(filename))
+
@@ -0,0 +1,241 @@
+# -*- coding: utf-8 -*-
+"""
+BuyLow OS - 비슷한 티켓 묶기 (MinHash LSH)
+
+"레버리지 몇 배?", "레버리지 몇배까지 돼요" 같은 같은 질문의 변형을
+하나의 클러스터로 묶어, 운영자가 티켓 50건 대신 클러스터 하나를 처리하게 합니다.
+
+- 질문을 토큰 집합으로 바꾼 뒤 MinHash 서명 계산
+  (질문 어미처럼 어디에나 나오는 말은 빼고, 한글은 글자 2-gram)
+- 서명을 BANDS개 구간으로 나눠 구간별 버킷에 넣음 (LSH)
+- 버킷에는 클러스터의 대표 티켓(첫 티켓)만 넣음
+- 새 티켓은 같은 버킷의 대표 중 추정 유사도가 가장 높은 클러스터에 붙고,
+  기준 미만이면 자기 id로 새 클러스터를 만들어 대표가 됨
+  (대표와만 비교하므로 A~B~C처럼 조금씩 다른 질문이 줄줄이 묶이지 않음)
+
+새 티켓의 cluster_id는 티켓에 함께 저장됩니다. cluster_id가 없는 예전 티켓은
+색인을 만들 때 id 순서대로 같은 방식으로 묶습니다 (파일은 고치지 않음).
+"""
+import re
+import threading
+import zlib
+from collections import defaultdict
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+from utils.data_utils import get_data_version, load_json
+from utils.hangul import char_ngrams, is_hangul
+
+TICKETS_FILE = "tickets.json"
+
+NUM_PERM = 64
+BANDS = 32
+ROWS = NUM_PERM // BANDS
+# 추정 자카드 유사도가 이 이상이면 같은 클러스터
+SIMILARITY_THRESHOLD = 0.3
+
+# 어떤 질문에나 붙는 말 (같은 질문인지 판단하는 데 도움이 안 됨)
+STOPWORDS = frozenset([
+    "어떻게", "어떡해요", "하나요", "되나요", "돼요", "되요", "있나요", "없나요", "뭔가요", "뭐에요", "뭐예요",
+    "뭐", "왜", "좀", "혹시", "알려주세요", "알려줘", "주세요", "궁금해요", "궁금합니다", "싶어요", "해요", "요",
+])
+# 질문 끝에 붙는 어미 (긴 것부터 확인)
+ENDINGS = ("하나요", "되나요", "인가요", "있나요", "나요", "가요", "세요", "해요", "돼요", "에요", "예요", "요")
+_WORD_RE = re.compile(r'[가-힣]+|[^\W_가-힣]+')
+
+_PRIME = (1 << 31) - 1
+_rng = np.random.RandomState(20260131)
+_A = _rng.randint(1, _PRIME, size=NUM_PERM).astype(np.uint64)
+_B = _rng.randint(0, _PRIME, size=NUM_PERM).astype(np.uint64)
+
+
+def shingles(text: str) -> set:
+    """유사도 비교용 토큰 집합"""
+    tokens = set()
+    for word in _WORD_RE.findall(text.lower()):
+        if word in STOPWORDS:
+            continue
+        if is_hangul(word):
+            for ending in ENDINGS:
+                if word.endswith(ending) and len(word) > len(ending):
+                    word = word[:-len(ending)]
+                    break
+            tokens.update(char_ngrams(word, (2,)))
+        else:
+            tokens.add(word)
+    return tokens
+
+
+def signature(text: str) -> Optional[np.ndarray]:
+    """
+    질문의 MinHash 서명 (토큰이 없으면 None).
+
+    토큰 해시는 crc32라 프로세스가 달라도 같은 값이 나옵니다.
+    """
+    tokens = shingles(text)
+    if not tokens:
+        return None
+    hashes = np.fromiter((zlib.crc32(t.encode("utf-8")) for t in tokens), dtype=np.uint64, count=len(tokens))
+    # (토큰 수, NUM_PERM) 해시 행렬의 열별 최솟값
+    return ((np.outer(hashes, _A) + _B) % _PRIME).min(axis=0)
+
+
+def _band_keys(sig: np.ndarray) -> List[Tuple[int, bytes]]:
+    return [(band, sig[band * ROWS:(band + 1) * ROWS].tobytes()) for band in range(BANDS)]
+
+
+class TicketClusterIndex:
+    """티켓 질문에 대한 증분 MinHash LSH 색인"""
+
+    def __init__(self):
+        self.version: Any = None
+        # 대표 티켓(클러스터 id)의 서명
+        self._signatures: Dict[Any, np.ndarray] = {}
+        # 티켓 id -> 클러스터 id
+        self._clusters: Dict[Any, Any] = {}
+        self._buckets: Dict[Tuple[int, bytes], List[Any]] = defaultdict(list)
+
+    def __len__(self) -> int:
+        return len(self._clusters)
+
+    def cluster_of(self, ticket_id: Any) -> Any:
+        return self._clusters.get(ticket_id, ticket_id)
+
+    def nearest(self, text: str) -> Tuple[Optional[Any], float]:
+        """
+        가장 비슷한 클러스터를 찾습니다.
+
+        Returns:
+            (클러스터 id, 대표 티켓과의 추정 유사도). 같은 버킷에 아무것도 없으면 (None, 0.0)
+        """
+        sig = signature(text)
+        if sig is None:
+            return None, 0.0
+        return self._nearest(sig)
+
+    def _nearest(self, sig: np.ndarray) -> Tuple[Optional[Any], float]:
+        candidates = set()
+        for key in _band_keys(sig):
+            candidates.update(self._buckets.get(key, ()))
+        best_id, best_sim = None, 0.0
+        for cluster_id in candidates:
+            sim = float(np.mean(self._signatures[cluster_id] == sig))
+            if sim > best_sim or (sim == best_sim and best_id is not None and str(cluster_id) < str(best_id)):
+                best_id, best_sim = cluster_id, sim
+        return best_id, best_sim
+
+    def classify(self, ticket_id: Any, text: str) -> Any:
+        """
+        티켓이 들어갈 클러스터 id를 정합니다 (색인은 바꾸지 않음).
+
+        Returns:
+            비슷한 클러스터가 있으면 그 id, 없으면 ticket_id (새 클러스터)
+        """
+        if ticket_id in self._clusters:
+            return self._clusters[ticket_id]
+        return self._classify(ticket_id, signature(text))
+
+    def _classify(self, ticket_id: Any, sig: Optional[np.ndarray]) -> Any:
+        if sig is not None:
+            nearest_id, sim = self._nearest(sig)
+            if nearest_id is not None and sim >= SIMILARITY_THRESHOLD:
+                return nearest_id
+        return ticket_id
+
+    def add(self, ticket_id: Any, text: str, cluster_id: Any = None) -> Any:
+        """
+        티켓을 색인에 넣고 클러스터 id를 반환합니다.
+
+        Args:
+            ticket_id: 티켓 id
+            text: 티켓 질문
+            cluster_id: 이미 정해진 클러스터 (None이면 비슷한 티켓으로 결정)
+        """
+        if ticket_id in self._clusters:
+            return self._clusters[ticket_id]
+        sig = signature(text)
+        if cluster_id is None:
+            cluster_id = self._classify(ticket_id, sig)
+        self._clusters[ticket_id] = cluster_id
+        if sig is not None and cluster_id == ticket_id:
+            self._signatures[ticket_id] = sig
+            for key in _band_keys(sig):
+                self._buckets[key].append(ticket_id)
+        return cluster_id
+
+    def add_all(self, tickets: Iterable[Any]) -> None:
+        """아직 색인에 없는 티켓을 id 순서대로 넣습니다."""
+        new = [t for t in tickets if t.get("id") is not None and t.get("id") not in self._clusters]
+        for ticket in sorted(new, key=lambda t: t.get("id")):
+            self.add(ticket.get("id"), str(ticket.get("query", "")), ticket.get("cluster_id"))
+
+
+class TicketCluster(NamedTuple):
+    """화면에 보여줄 클러스터 하나"""
+    cluster_id: Any
+    tickets: List[Any]   # 최근 티켓 먼저
+    open_count: int
+
+    @property
+    def query(self) -> str:
+        """대표 질문 (가장 먼저 들어온 티켓)"""
+        return str(self.tickets[-1].get("query", ""))
+
+    @property
+    def latest(self) -> str:
+        return str(self.tickets[0].get("timestamp", ""))
+
+
+_index = TicketClusterIndex()
+_index_lock = threading.Lock()
+
+
+def get_cluster_index() -> TicketClusterIndex:
+    """tickets.json까지 따라잡은 프로세스 공용 색인"""
+    version = get_data_version(TICKETS_FILE)
+    with _index_lock:
+        if version is None or version != _index.version:
+            _index.add_all(load_json(TICKETS_FILE, default=[], readonly=True))
+            _index.version = version
+    return _index
+
+
+def assign_cluster(ticket_id: Any, query: str) -> Any:
+    """
+    새 티켓의 클러스터를 정합니다 (티켓 저장 전에 호출).
+
+    색인에는 넣지 않습니다. 저장에 성공하면 tickets.json이 바뀌므로 다음
+    get_cluster_index()가 저장된 cluster_id 그대로 색인에 넣고, 저장에
+    실패한 티켓은 색인에 남지 않습니다.
+
+    Returns:
+        티켓에 저장할 cluster_id
+    """
+    index = get_cluster_index()
+    with _index_lock:
+        return index.classify(ticket_id, query)
+
+
+def group_tickets(tickets: Iterable[Any]) -> List[TicketCluster]:
+    """
+    티켓을 클러스터별로 묶습니다.
+
+    Returns:
+        미처리 티켓이 많은 클러스터, 최근 클러스터 순
+    """
+    index = get_cluster_index()
+    groups: Dict[Any, List[Any]] = defaultdict(list)
+    for ticket in tickets:
+        cluster_id = ticket.get("cluster_id")
+        if cluster_id is None:
+            cluster_id = index.cluster_of(ticket.get("id"))
+        groups[cluster_id].append(ticket)
+
+    clusters = []
+    for cluster_id, members in groups.items():
+        members.sort(key=lambda t: (str(t.get("timestamp", "")), t.get("id") or 0), reverse=True)
+        open_count = sum(1 for t in members if t.get("status") == "open")
+        clusters.append(TicketCluster(cluster_id, members, open_count))
+    clusters.sort(key=lambda c: (c.open_count, len(c.tickets), c.latest), reverse=True)
+    return clusters
@@ -0,0 +1,185 @@
+# -*- coding: utf-8 -*-
+"""
+BuyLow OS - 인기 검색어 (시간 감쇠 Space-Saving)
+
+CS 질문에 나온 KB 키워드를 고정된 개수(CAPACITY)의 카운터로 세어,
+트래픽이 아무리 많아도 같은 메모리와 시간으로 상위 키워드를 읽습니다.
+
+- Space-Saving: 카운터가 꽉 차면 가장 작은 카운터를 새 키워드에 넘겨줌
+  (넘겨받은 값만큼 과대평가될 수 있으나, 상위 키워드는 빠지지 않음)
+- 시간 감쇠: HALF_LIFE초마다 무게가 절반이 됨. 기준 시각에서 앞으로 갈수록
+  큰 무게를 더하는 방식(forward decay)이라, 기록할 때 모든 카운터를 줄일 필요가 없음
+- 이벤트 공급: logs.json에 cs_query가 기록될 때마다 받음 (data_utils.add_append_listener).
+  프로세스가 처음 쓸 때 최근 WARMUP_DAYS일 로그로 한 번 채움
+
+다른 프로세스가 기록한 질문은 그 프로세스가 다시 시작하기 전까지 반영되지 않습니다.
+"""
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from utils.data_utils import add_append_listener, load_log_window
+from utils.kb_index import TITLE_SLOT, get_kb_index, normalize_text
+
+CAPACITY = 64
+# 무게가 절반이 되는 시간 (초)
+HALF_LIFE = 3 * 24 * 3600
+WARMUP_DAYS = 7
+TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+# 무게 지수가 이보다 커지면 기준 시각을 옮겨 다시 계산 (float 범위 유지)
+_MAX_EXPONENT = 64
+
+
+class SpaceSaving:
+    """시간 감쇠 Space-Saving 상위 k 추적기"""
+
+    def __init__(self, capacity: int = CAPACITY, half_life: float = HALF_LIFE):
+        self.capacity = capacity
+        self.half_life = half_life
+        self._origin: Optional[float] = None
+        # 키워드 -> 기준 시각 무게로 잰 값
+        self._counts: Dict[str, float] = {}
+
+    def __len__(self) -> int:
+        return len(self._counts)
+
+    def __contains__(self, term: str) -> bool:
+        return term in self._counts
+
+    def _weight(self, now: float) -> float:
+        if self._origin is None:
+            self._origin = now
+        exponent = (now - self._origin) / self.half_life
+        if exponent > _MAX_EXPONENT:
+            factor = 2.0 ** -exponent
+            self._counts = {term: value * factor for term, value in self._counts.items()}
+            self._origin = now
+            exponent = 0.0
+        return 2.0 ** exponent
+
+    def add(self, term: str, count: float = 1.0, now: Optional[float] = None) -> None:
+        """
+        키워드를 셉니다.
+
+        Args:
+            term: 키워드
+            count: 더할 횟수
+            now: 발생 시각 (epoch 초, None이면 현재)
+        """
+        value = count * self._weight(time.time() if now is None else now)
+        counts = self._counts
+        if term in counts:
+            counts[term] += value
+        elif len(counts) < self.capacity:
+            counts[term] = value
+        else:
+            smallest = min(counts, key=counts.__getitem__)
+            counts[term] = counts.pop(smallest) + value
+
+    def top(self, n: int, now: Optional[float] = None) -> List[Tuple[str, float]]:
+        """
+        현재 시각 기준 감쇠된 횟수가 큰 키워드 n개.
+
+        Returns:
+            [(키워드, 감쇠된 횟수)]
+        """
+        if not self._counts or n <= 0:
+            return []
+        scale = 1.0 / self._weight(time.time() if now is None else now)
+        ranked = sorted(self._counts.items(), key=lambda item: (-item[1], item[0]))[:n]
+        return [(term, value * scale) for term, value in ranked]
+
+
+def _event_time(event: Any) -> Optional[float]:
+    try:
+        return datetime.strptime(str(event.get("timestamp", "")), TIMESTAMP_FORMAT).timestamp()
+    except ValueError:
+        return None
+
+
+def query_terms(query: str) -> List[str]:
+    """
+    질문에 구문 그대로 들어 있는 KB 키워드 (KB에 적힌 표기).
+
+    다른 키워드에 포함되는 키워드는 뺍니다 ("손절가 설정" -> "손절가", "손절" 제외).
+    """
+    index = get_kb_index()
+    found: Dict[str, str] = {}
+    phrase_hits, _ = index.hits(query)
+    for doc_idx, slot in phrase_hits:
+        if slot == TITLE_SLOT:
+            continue
+        keyword = str(index.docs[doc_idx].get("keywords", ())[slot])
+        norm = normalize_text(keyword).strip()
+        if norm:
+            found.setdefault(norm, keyword)
+    return [found[norm] for norm in found
+            if not any(norm != other and norm in other for other in found)]
+
+
+class TrendingTerms:
+    """cs_query 이벤트로 채우는 프로세스 공용 인기 키워드"""
+
+    def __init__(self, capacity: int = CAPACITY, half_life: float = HALF_LIFE):
+        self._tracker = SpaceSaving(capacity, half_life)
+        self._display: Dict[str, str] = {}
+        self._lock = threading.Lock()
+
+    def add_events(self, events: Iterable[Any]) -> None:
+        for event in events:
+            if event.get("type") != "cs_query" or not event.get("query"):
+                continue
+            now = _event_time(event)
+            for term in query_terms(str(event["query"])):
+                key = normalize_text(term).strip()
+                with self._lock:
+                    self._display.setdefault(key, term)
+                    self._tracker.add(key, now=now)
+
+    def top(self, n: int) -> List[Tuple[str, float]]:
+        """감쇠된 횟수가 큰 키워드 n개 [(키워드, 횟수)]"""
+        with self._lock:
+            ranked = self._tracker.top(n)
+            # 추적기에서 밀려난 키워드의 표기는 버림 (메모리 일정)
+            if len(self._display) > 2 * self._tracker.capacity:
+                self._display = {key: term for key, term in self._display.items() if key in self._tracker}
+            return [(self._display.get(key, key), count) for key, count in ranked]
+
+
+_trending: Optional[TrendingTerms] = None
+_trending_lock = threading.Lock()
+
+
+def get_trending() -> TrendingTerms:
+    """프로세스 공용 인기 키워드 (처음 호출 시 최근 로그로 채우고 기록 알림 등록)"""
+    global _trending
+    if _trending is None:
+        with _trending_lock:
+            if _trending is None:
+                trending = TrendingTerms()
+                since = (datetime.now() - timedelta(days=WARMUP_DAYS)).strftime("%Y-%m-%d")
+                trending.add_events(load_log_window("logs.json", since, event_type="cs_query"))
+                add_append_listener("logs.json", trending.add_events)
+                _trending = trending
+    return _trending
+
+
+def trending_terms(n: int, defaults: Iterable[str] = ()) -> List[str]:
+    """
+    인기 키워드 n개 (부족하면 defaults로 채움).
+
+    Args:
+        n: 개수
+        defaults: 데이터가 적을 때 채울 키워드
+    """
+    terms = [term for term, count in get_trending().top(n) if count >= 0.5]
+    seen = {normalize_text(term).strip() for term in terms}
+    for term in defaults:
+        if len(terms) >= n:
+            break
+        if normalize_text(term).strip() not in seen:
+            terms.append(term)
+            seen.add(normalize_text(term).strip())
+    return terms